@@ -1,6 +1,8 @@
 # app.py
 
 import streamlit as st
+from src.data import regions
+from src.utils import cache
 from src.pages import (
     comparacao_metodos, avaliacao_topsis, analise_envoltoria,
     subindicadores, analise_paises,
@@ -34,9 +36,21 @@ def main():
         "Methods Comparison": comparacao_metodos.render
     }
 
+    # Picks up changes to the local data file while the app is running
+    cache.get_data_watcher()
+
+    # Region the pages analyse (src/data/regions.py); the data decide which are offered
+    options = cache.available_regions(cache.get_panel())
+    default = options.index(regions.DEFAULT_REGION) if regions.DEFAULT_REGION in options else 0
+    st.sidebar.selectbox("Region", options, index=default, key="region")
+
     # Navigation menu
     page = st.sidebar.radio("Go to", list(pages.keys()))
 
+    # Background DEA jobs are only watched while their page is open
+    if page != "Data Envelopment Analysis (DEA)":
+        analise_envoltoria.release_job()
+
     try:
         # Render the selected page
         pages[page]()
@@ -44,5 +58,13 @@ def main():
         st.error(f"An error occurred while loading the page '{page}'.")
         st.exception(e)
 
+    # Share of result requests answered without computing (including prefetched results)
+    stats = cache.get_result_cache().stats()
+    if stats["hits"] + stats["prefetch_hits"] + stats["misses"]:
+        st.sidebar.caption(
+            f"Result cache hit rate: {stats['hit_rate']:.0%} "
+            f"({stats['prefetch_hits']} served by prefetching)"
+        )
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,258 @@
+# src/analysis/resampling.py
+
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+from src.analysis.stat_analysis import validate_columns
+
+METHODS = ('pearson', 'spearman')
+ALTERNATIVES = ('two-sided', 'greater', 'less')
+
+# Número máximo de reamostragens avaliadas por bloco (limita a memória de (bloco x n))
+BATCH_SIZE = 20000
+
+def permutation_indices(n: int, n_resamples: int, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Gera de uma só vez `n_resamples` permutações de 0..n-1.
+
+    Args:
+        n (int): Tamanho da amostra.
+        n_resamples (int): Número de permutações.
+        seed (int, opcional): Semente do gerador.
+
+    Returns:
+        np.ndarray: Índices com formato (n_resamples, n).
+    """
+    rng = np.random.default_rng(seed)
+    return rng.permuted(np.broadcast_to(np.arange(n), (n_resamples, n)), axis=1)
+
+def bootstrap_indices(n: int, n_resamples: int, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Gera de uma só vez `n_resamples` reamostragens com reposição de 0..n-1.
+
+    Returns:
+        np.ndarray: Índices com formato (n_resamples, n).
+    """
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, n, size=(n_resamples, n))
+
+def batched_correlation(x: np.ndarray, y: np.ndarray, method: str = 'pearson') -> np.ndarray:
+    """
+    Correlação linha a linha entre matrizes (reamostragens x observações).
+
+    Args:
+        x (np.ndarray): Matriz (B, n) ou vetor (n,).
+        y (np.ndarray): Matriz (B, n) ou vetor (n,), compatível por broadcasting.
+        method (str): 'pearson' ou 'spearman' (ranks médios em caso de empate).
+
+    Returns:
+        np.ndarray: Correlações com formato (B,).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Método inválido: '{method}'. Use {METHODS}.")
+    x = np.atleast_2d(np.asarray(x, dtype=float))
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    if method == 'spearman':
+        x = rankdata(x, axis=1)
+        y = rankdata(y, axis=1)
+    x = x - x.mean(axis=1, keepdims=True)
+    y = y - y.mean(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.einsum('ij,ij->i', *np.broadcast_arrays(x, y)) / np.sqrt(
+            np.einsum('ij,ij->i', x, x) * np.einsum('ij,ij->i', y, y)
+        )
+    return np.clip(r, -1.0, 1.0)
+
+def _clean_pair(x, y) -> tuple:
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.shape != y.shape or x.ndim != 1:
+        raise ValueError("x e y devem ser vetores do mesmo tamanho.")
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if valid.sum() < 3:
+        raise ValueError("São necessárias pelo menos três observações completas.")
+    return x[valid], y[valid]
+
+def _p_value(null: np.ndarray, observed: np.ndarray, alternative: str) -> np.ndarray:
+    """P-valor de Monte Carlo (com a correção +1 de Phipson & Smyth) ao longo do eixo 0."""
+    if alternative not in ALTERNATIVES:
+        raise ValueError(f"Alternativa inválida: '{alternative}'. Use {ALTERNATIVES}.")
+    # Tolerância para empates numéricos com o valor observado
+    eps = 1e-12 * np.maximum(1.0, np.abs(observed))
+    if alternative == 'greater':
+        extreme = null >= observed - eps
+    elif alternative == 'less':
+        extreme = null <= observed + eps
+    else:
+        extreme = np.abs(null) >= np.abs(observed) - eps
+    return (extreme.sum(axis=0) + 1) / (null.shape[0] + 1)
+
+def permutation_test(
+    x: Union[np.ndarray, pd.Series],
+    y: Union[np.ndarray, pd.Series],
+    method: str = 'pearson',
+    n_resamples: int = 10000,
+    alternative: str = 'two-sided',
+    seed: Optional[int] = None
+) -> Dict[str, Union[float, np.ndarray]]:
+    """
+    Teste de permutação para a correlação entre dois vetores.
+
+    Todas as permutações de y são geradas de uma vez e as correlações são calculadas
+    em lote; para Spearman os ranks são calculados uma única vez, pois permutar os
+    dados apenas permuta os ranks.
+
+    Args:
+        x, y: Vetores com as observações (pares com NaN são descartados).
+        method (str): 'pearson' ou 'spearman'.
+        n_resamples (int): Número de permutações (default 10000).
+        alternative (str): 'two-sided', 'greater' ou 'less'.
+        seed (int, opcional): Semente do gerador.
+
+    Returns:
+        Dict: 'statistic' (correlação observada), 'p_value' e 'null_distribution' (B,).
+    """
+    x, y = _clean_pair(x, y)
+    if method == 'spearman':
+        x, y = rankdata(x), rankdata(y)
+    observed = batched_correlation(x, y)[0]
+
+    null = np.empty(n_resamples)
+    for start in range(0, n_resamples, BATCH_SIZE):
+        stop = min(n_resamples, start + BATCH_SIZE)
+        idx = permutation_indices(len(y), stop - start, None if seed is None else seed + start)
+        null[start:stop] = batched_correlation(x, y[idx])
+
+    return {
+        'statistic': float(observed),
+        'p_value': float(_p_value(null, observed, alternative)),
+        'null_distribution': null
+    }
+
+def bootstrap_ci(
+    x: Union[np.ndarray, pd.Series],
+    y: Union[np.ndarray, pd.Series],
+    method: str = 'pearson',
+    n_resamples: int = 10000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None
+) -> Dict[str, Union[float, np.ndarray]]:
+    """
+    Intervalo de confiança bootstrap (percentil) para a correlação entre dois vetores.
+
+    Os pares (x, y) são reamostrados com reposição em lote, a partir de uma matriz de
+    índices (B, n).
+
+    Args:
+        x, y: Vetores com as observações (pares com NaN são descartados).
+        method (str): 'pearson' ou 'spearman'.
+        n_resamples (int): Número de reamostragens (default 10000).
+        confidence (float): Nível de confiança (default 0.95).
+        seed (int, opcional): Semente do gerador.
+
+    Returns:
+        Dict: 'statistic', 'ci_low', 'ci_high', 'std_error' e 'bootstrap_distribution' (B,).
+    """
+    x, y = _clean_pair(x, y)
+    observed = batched_correlation(x, y, method)[0]
+
+    dist = np.empty(n_resamples)
+    for start in range(0, n_resamples, BATCH_SIZE):
+        stop = min(n_resamples, start + BATCH_SIZE)
+        idx = bootstrap_indices(len(x), stop - start, None if seed is None else seed + start)
+        dist[start:stop] = batched_correlation(x[idx], y[idx], method)
+
+    # Reamostragens degeneradas (todos os valores iguais) não definem correlação
+    finite = dist[np.isfinite(dist)]
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(finite, [tail, 1 - tail])
+    return {
+        'statistic': float(observed),
+        'ci_low': float(low),
+        'ci_high': float(high),
+        'std_error': float(finite.std(ddof=1)),
+        'bootstrap_distribution': dist
+    }
+
+def kendall_w(ranks: np.ndarray) -> np.ndarray:
+    """
+    Coeficiente de concordância W de Kendall, vetorizado sobre os eixos iniciais.
+
+    Args:
+        ranks (np.ndarray): Ranks com formato (..., avaliadores, itens), sem NaN.
+
+    Returns:
+        np.ndarray: W em [0, 1] com formato (...), sem correção para empates.
+    """
+    ranks = np.asarray(ranks, dtype=float)
+    m, n = ranks.shape[-2:]
+    totals = ranks.sum(axis=-2)
+    s = ((totals - totals.mean(axis=-1, keepdims=True)) ** 2).sum(axis=-1)
+    return 12 * s / (m ** 2 * (n ** 3 - n))
+
+def rank_agreement(
+    df: pd.DataFrame,
+    rank_cols: List[str],
+    n_resamples: int = 10000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None
+) -> Dict[str, Union[pd.DataFrame, Dict]]:
+    """
+    Inferência por reamostragem para a concordância entre rankings.
+
+    Para cada par de colunas calcula a correlação de Spearman com p-valor de permutação
+    e intervalo bootstrap; para o conjunto, o W de Kendall com p-valor de permutação
+    (permutando independentemente os ranks de cada método, todos de uma vez).
+
+    Args:
+        df (pd.DataFrame): DataFrame com uma linha por item e as colunas de ranks.
+        rank_cols (List[str]): Colunas com os ranks (ex.: "WB Rank", "DEA Rank", "TOPSIS Rank").
+        n_resamples (int): Número de reamostragens (default 10000).
+        confidence (float): Nível de confiança dos intervalos (default 0.95).
+        seed (int, opcional): Semente do gerador.
+
+    Returns:
+        Dict: 'pairs' (DataFrame com "Pair", "Spearman", "p-value", "CI Low", "CI High")
+        e 'kendall_w' (dict com 'statistic', 'p_value' e 'null_distribution').
+    """
+    validate_columns(df, rank_cols)
+    if len(rank_cols) < 2:
+        raise ValueError("São necessárias pelo menos duas colunas de ranks.")
+    ranks = df[rank_cols].dropna().to_numpy(dtype=float)
+
+    rows = []
+    for i in range(len(rank_cols)):
+        for j in range(i + 1, len(rank_cols)):
+            perm = permutation_test(ranks[:, i], ranks[:, j], 'spearman', n_resamples, seed=seed)
+            boot = bootstrap_ci(ranks[:, i], ranks[:, j], 'spearman', n_resamples, confidence, seed=seed)
+            rows.append({
+                'Pair': f"{rank_cols[i]} × {rank_cols[j]}",
+                'Spearman': perm['statistic'],
+                'p-value': perm['p_value'],
+                'CI Low': boot['ci_low'],
+                'CI High': boot['ci_high']
+            })
+
+    # W de Kendall: o primeiro método fica fixo e os demais são permutados por linha
+    rank_matrix = rankdata(ranks, axis=0).T
+    observed = kendall_w(rank_matrix)
+    m, n = rank_matrix.shape
+    rng = np.random.default_rng(seed)
+    null = np.empty(n_resamples)
+    for start in range(0, n_resamples, BATCH_SIZE):
+        stop = min(n_resamples, start + BATCH_SIZE)
+        batch = np.broadcast_to(rank_matrix, (stop - start, m, n))
+        permuted = np.concatenate([batch[:, :1], rng.permuted(batch[:, 1:], axis=2)], axis=1)
+        null[start:stop] = kendall_w(permuted)
+
+    return {
+        'pairs': pd.DataFrame(rows),
+        'kendall_w': {
+            'statistic': float(observed),
+            'p_value': float(_p_value(null, observed, 'greater')),
+            'null_distribution': null
+        }
+    }
@@ -0,0 +1,157 @@
+# src/analysis/similarity.py
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from src.data.panel import LPIPanel
+from src.utils.helpers import SUBINDICATORS
+
+# Métrica -> (espaço dos vetores, parâmetro p de Minkowski)
+METRICS = {
+    "euclidean": ("raw", 2),
+    "manhattan": ("raw", 1),
+    "chebyshev": ("raw", np.inf),
+    "standardized": ("zscore", 2),
+    "cosine": ("unit", 2)
+}
+
+
+class PeerIndex:
+    """
+    Índice de similaridade entre perfis de sub-indicadores de todos os pares (país, ano).
+
+    Os vetores completos do painel são indexados em árvores KD (`scipy.spatial.cKDTree`)
+    construídas sob demanda, uma por espaço de vetores e por conjunto de anos, e
+    reaproveitadas em todas as consultas. O índice fica associado à versão do painel
+    (`version`) e deve ser reconstruído quando os dados mudam.
+
+    Métricas: 'euclidean', 'manhattan' e 'chebyshev' sobre os valores originais;
+    'standardized' (euclidiana sobre z-scores de cada sub-indicador) e 'cosine'
+    (euclidiana sobre vetores unitários, que ordena os vizinhos como a distância cosseno;
+    a distância retornada é 1 - cos).
+
+    Args:
+        panel (LPIPanel): Painel com os dados.
+        indicators (List[str]): Sub-indicadores que formam o perfil (default SUBINDICATORS).
+    """
+
+    def __init__(self, panel: LPIPanel, indicators: List[str] = SUBINDICATORS):
+        self.indicators = list(indicators)
+        self.version = panel.version
+
+        cols = [panel._indicator_pos(ind) for ind in self.indicators]
+        cube = panel.values[:, :, cols]
+        complete = ~np.isnan(cube).any(axis=2)
+        c_idx, y_idx = np.nonzero(complete)
+
+        self.countries = panel.countries[c_idx]
+        self.years = panel.years[y_idx]
+        self.vectors = np.ascontiguousarray(cube[c_idx, y_idx])
+        self._position = {(c, int(y)): i for i, (c, y) in enumerate(zip(self.countries, self.years))}
+        self._country_codes = pd.factorize(self.countries)[0]
+        self._max_per_country = int(np.bincount(self._country_codes).max()) if len(self.countries) else 0
+
+        self._spaces = {}
+        self._trees = {}
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def _space(self, name: str) -> np.ndarray:
+        if name not in self._spaces:
+            if name == "raw":
+                self._spaces[name] = self.vectors
+            elif name == "zscore":
+                std = self.vectors.std(axis=0)
+                self._spaces[name] = (self.vectors - self.vectors.mean(axis=0)) / np.where(std > 0, std, 1.0)
+            else:
+                norm = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+                self._spaces[name] = self.vectors / np.where(norm > 0, norm, 1.0)
+        return self._spaces[name]
+
+    def _tree(self, space: str, year: Optional[int]) -> Tuple[cKDTree, np.ndarray]:
+        """Árvore do espaço e os índices globais dos seus pontos (todos os anos se year=None)."""
+        key = (space, year)
+        if key not in self._trees:
+            members = np.arange(len(self)) if year is None else np.flatnonzero(self.years == year)
+            self._trees[key] = (cKDTree(self._space(space)[members]), members)
+        return self._trees[key]
+
+    def query_indices(
+        self,
+        country: str,
+        year: int,
+        k: int = 5,
+        metric: str = "euclidean",
+        same_year: bool = False,
+        exclude_country: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Consulta de baixo nível: k vizinhos mais próximos de (país, ano).
+
+        Args:
+            country (str): País de referência.
+            year (int): Ano do perfil de referência.
+            k (int): Número de pares (default 5).
+            metric (str): Métrica de distância (ver METRICS).
+            same_year (bool): Se True, busca apenas entre perfis do mesmo ano.
+            exclude_country (bool): Se True, ignora os perfis do próprio país em outros anos.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distâncias e posições (em `countries`/`years`/
+            `vectors`) dos vizinhos, em ordem crescente de distância.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Métrica inválida: '{metric}'. Use {list(METRICS)}.")
+        try:
+            target = self._position[(country, int(year))]
+        except KeyError:
+            raise ValueError(f"Perfil completo de '{country}' em {year} não encontrado no índice.")
+
+        space, p = METRICS[metric]
+        tree, members = self._tree(space, int(year) if same_year else None)
+        # Folga para descartar o próprio ponto e, se for o caso, os outros anos do país
+        extra = self._max_per_country if exclude_country and not same_year else 1
+        n = min(k + extra, len(members))
+        dist, pos = tree.query(self._space(space)[target], k=n, p=p)
+        dist, idx = np.atleast_1d(dist), members[np.atleast_1d(pos)]
+
+        if exclude_country:
+            keep = self._country_codes[idx] != self._country_codes[target]
+        else:
+            keep = idx != target
+        dist, idx = dist[keep][:k], idx[keep][:k]
+        if metric == "cosine":
+            # |u - v|² = 2 - 2 cos(u, v) para vetores unitários
+            dist = dist ** 2 / 2
+        return dist, idx
+
+    def peers(
+        self,
+        country: str,
+        year: int,
+        k: int = 5,
+        metric: str = "euclidean",
+        same_year: bool = False,
+        exclude_country: bool = True
+    ) -> pd.DataFrame:
+        """
+        Os k perfis mais parecidos com o de (país, ano), em formato de tabela.
+
+        Mesmos parâmetros de `query_indices`.
+
+        Returns:
+            pd.DataFrame: Colunas "Rank", "Country", "Year", "Distance" e os sub-indicadores.
+        """
+        dist, idx = self.query_indices(country, year, k, metric, same_year, exclude_country)
+        result = pd.DataFrame({
+            "Rank": np.arange(1, len(idx) + 1),
+            "Country": self.countries[idx],
+            "Year": self.years[idx],
+            "Distance": dist
+        })
+        result[self.indicators] = self.vectors[idx]
+        return result
@@ -2,12 +2,15 @@
 
 import os
 import logging
-from typing import List
+from typing import Dict, Iterable, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy.stats import pearsonr
+from scipy.stats import norm, pearsonr, rankdata, t as t_dist
+
+from src.analysis.stats_engine import FrameStats, GroupedStats
 
 # Configuração básica do logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -80,6 +83,33 @@ def mean_by_country(df: pd.DataFrame, indicators: List[str], sort_by: str = 'LPI
     grouped = df.groupby('Country')[indicators].mean()
     return grouped.sort_values(by=sort_by, ascending=False)
 
+def grouped_descriptive_stats(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    indicators: List[str],
+    group_cols: List[str] = ('Year', 'Country')
+) -> Union[FrameStats, GroupedStats]:
+    """
+    Estatísticas globais e por cada agrupamento, com uma interface única.
+
+    Substitui chamadas separadas a `descriptive_stats_global`, `descriptive_stats_by_year`
+    e `mean_by_country`. Um DataFrame é resumido pelo pandas, com valores exatos. Um
+    iterável de blocos (ex.: `pd.read_csv(..., chunksize=...)`) é resumido em uma única
+    passada, sem manter os dados: contagem, média, desvio-padrão, mínimo e máximo são
+    exatos e os quartis são aproximados (erro relativo de 0,5%).
+
+    Args:
+        data (pd.DataFrame | Iterable[pd.DataFrame]): Dados completos ou em blocos.
+        indicators (List[str]): Lista de indicadores.
+        group_cols (List[str]): Colunas de agrupamento.
+
+    Returns:
+        FrameStats | GroupedStats: Use `.describe()`, `.describe('Year')` ou `.means('Country')`.
+    """
+    if isinstance(data, pd.DataFrame):
+        validate_columns(data, list(group_cols) + indicators)
+        return FrameStats(data, indicators, group_cols=group_cols)
+    return GroupedStats.from_chunks(data, indicators, group_cols=group_cols)
+
 def correlation_matrix(df: pd.DataFrame, indicators: List[str]) -> pd.DataFrame:
     """
     Calcula matriz de correlação entre indicadores.
@@ -94,6 +124,126 @@ def correlation_matrix(df: pd.DataFrame, indicators: List[str]) -> pd.DataFrame:
     validate_columns(df, indicators)
     return df[indicators].corr()
 
+def adjust_pvalues(p_values: np.ndarray, method: Optional[str] = 'holm') -> np.ndarray:
+    """
+    Corrige p-valores para comparações múltiplas.
+
+    Args:
+        p_values (np.ndarray): P-valores (NaN são ignorados).
+        method (str, opcional): 'bonferroni', 'holm', 'fdr_bh' (Benjamini-Hochberg) ou None.
+
+    Returns:
+        np.ndarray: P-valores ajustados, no mesmo formato.
+    """
+    p = np.asarray(p_values, dtype=float)
+    if method is None:
+        return p.copy()
+
+    adjusted = np.full(p.shape, np.nan)
+    valid = ~np.isnan(p)
+    pv = p[valid]
+    m = pv.size
+    if m == 0:
+        return adjusted
+
+    order = np.argsort(pv)
+    ranked = pv[order]
+    if method == 'bonferroni':
+        out = np.minimum(pv * m, 1.0)
+    elif method == 'holm':
+        steps = np.maximum.accumulate(ranked * (m - np.arange(m)))
+        out = np.empty(m)
+        out[order] = np.minimum(steps, 1.0)
+    elif method == 'fdr_bh':
+        steps = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+        out = np.empty(m)
+        out[order] = np.minimum(steps, 1.0)
+    else:
+        raise ValueError("Método de correção inválido. Use 'bonferroni', 'holm', 'fdr_bh' ou None.")
+
+    adjusted[valid] = out
+    return adjusted
+
+def correlation_significance(
+    df: pd.DataFrame,
+    indicators: List[str],
+    confidence: float = 0.95,
+    correction: Optional[str] = 'holm'
+) -> Dict[str, pd.DataFrame]:
+    """
+    Matrizes completas de correlação de Pearson e Spearman com p-valores e intervalos de confiança.
+
+    Todos os pares de indicadores são calculados de uma vez, de forma vetorizada, usando
+    para cada par apenas as linhas em que ambos estão presentes (pairwise-complete).
+    Os p-valores usam o teste t com n-2 graus de liberdade (como `scipy.stats.pearsonr`
+    e `spearmanr`), os intervalos usam a transformação z de Fisher (com a variância de
+    Fieller, 1,06/(n-3), para Spearman) e a correção para comparações múltiplas é
+    aplicada separadamente a cada método sobre os pares distintos.
+
+    Args:
+        df (pd.DataFrame): DataFrame com dados.
+        indicators (List[str]): Lista de indicadores.
+        confidence (float): Nível de confiança dos intervalos (default 0.95).
+        correction (str, opcional): 'bonferroni', 'holm' (default), 'fdr_bh' ou None.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Matrizes indicador x indicador com as chaves 'n' e, para
+        cada método ('pearson', 'spearman'), '<método>_r', '<método>_p', '<método>_p_adj',
+        '<método>_ci_low' e '<método>_ci_high'.
+    """
+    validate_columns(df, indicators)
+    if len(indicators) < 2:
+        raise ValueError("São necessários pelo menos dois indicadores.")
+
+    values = df[indicators].to_numpy(dtype=float)
+    k = len(indicators)
+    rows, cols = np.triu_indices(k, 1)
+
+    # Pares (par x observação), com NaN onde qualquer um dos dois indicadores falta
+    x = values[:, rows].T
+    y = values[:, cols].T
+    missing = np.isnan(x) | np.isnan(y)
+    x = np.where(missing, np.nan, x)
+    y = np.where(missing, np.nan, y)
+    n = (~missing).sum(axis=1).astype(float)
+
+    z_crit = norm.ppf(0.5 + confidence / 2)
+    results = {'n': _pairs_to_matrix(n, rows, cols, k, np.nan, indicators)}
+    rank_kwargs = {'axis': 1, 'nan_policy': 'omit'}
+    for method, (a, b), se_factor in (
+        ('pearson', (x, y), 1.0),
+        ('spearman', (rankdata(x, **rank_kwargs), rankdata(y, **rank_kwargs)), 1.06)
+    ):
+        r = _rowwise_pearson(a, b)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dof = n - 2
+            t_stat = r * np.sqrt(dof / np.clip(1 - r ** 2, 0, None))
+            p = np.where(np.abs(r) >= 1, 0.0, 2 * t_dist.sf(np.abs(t_stat), dof))
+            p = np.where(dof > 0, p, np.nan)
+            z = np.arctanh(np.clip(r, -1 + 1e-15, 1 - 1e-15))
+            se = np.sqrt(se_factor / (n - 3))
+            se = np.where(n > 3, se, np.nan)
+        results[f'{method}_r'] = _pairs_to_matrix(r, rows, cols, k, 1.0, indicators)
+        results[f'{method}_p'] = _pairs_to_matrix(p, rows, cols, k, 0.0, indicators)
+        results[f'{method}_p_adj'] = _pairs_to_matrix(adjust_pvalues(p, correction), rows, cols, k, 0.0, indicators)
+        results[f'{method}_ci_low'] = _pairs_to_matrix(np.tanh(z - z_crit * se), rows, cols, k, 1.0, indicators)
+        results[f'{method}_ci_high'] = _pairs_to_matrix(np.tanh(z + z_crit * se), rows, cols, k, 1.0, indicators)
+    return results
+
+def _rowwise_pearson(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Correlação de Pearson linha a linha, ignorando NaN."""
+    a = a - np.nanmean(a, axis=1, keepdims=True)
+    b = b - np.nanmean(b, axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.nansum(a * b, axis=1) / np.sqrt(np.nansum(a ** 2, axis=1) * np.nansum(b ** 2, axis=1))
+    return np.clip(r, -1.0, 1.0)
+
+def _pairs_to_matrix(values, rows, cols, k, diagonal, indicators) -> pd.DataFrame:
+    matrix = np.full((k, k), diagonal, dtype=float)
+    matrix[rows, cols] = values
+    matrix[cols, rows] = values
+    return pd.DataFrame(matrix, index=indicators, columns=indicators)
+
 def pearson_correlation_test(df: pd.DataFrame, x_indicator: str, y_indicator: str) -> None:
     """
     Realiza teste de correlação de Pearson entre dois indicadores, com impressão do resultado.
@@ -131,18 +281,18 @@ def main():
 
     df = world_bank.load_lpi_data()
 
-    logging.info("Calculando estatísticas globais...")
-    stats_global = descriptive_stats_global(df, indicators)
+    logging.info("Calculando estatísticas globais, por ano e por país...")
+    stats = grouped_descriptive_stats(df, indicators)
+
+    stats_global = stats.describe()
     logging.info("\n%s", stats_global)
     export_dataframe_to_csv(stats_global, os.path.join(RESULTS_DIR, "stats_global.csv"))
 
-    logging.info("Calculando estatísticas por ano...")
-    stats_year = descriptive_stats_by_year(df, indicators)
+    stats_year = stats.describe('Year')
     logging.info("\n%s", stats_year)
     export_dataframe_to_csv(stats_year, os.path.join(RESULTS_DIR, "stats_by_year.csv"))
 
-    logging.info("Calculando média por país...")
-    mean_country = mean_by_country(df, indicators)
+    mean_country = stats.means('Country').sort_values(by='LPI Aggregate', ascending=False)
     logging.info("\n%s", mean_country)
     export_dataframe_to_csv(mean_country, os.path.join(RESULTS_DIR, "mean_by_country.csv"))
 
@@ -0,0 +1,380 @@
+# src/analysis/stats_engine.py
+
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Layout dos códigos do sketch de quantis (int64):
+#   [ id do grupo | índice do indicador (8 bits) | bucket (20 bits) ]
+_BUCKET_BITS = 20
+_INDICATOR_BITS = 8
+_ZERO_BUCKET = 1 << (_BUCKET_BITS - 1)
+_MIN_ABS_VALUE = 1e-9
+
+DESCRIBE_STATS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+class FrameStats:
+    """
+    Estatísticas descritivas exatas de um DataFrame em memória, com a interface de `GroupedStats`.
+
+    Cada agregação é calculada pelo pandas na primeira consulta e guardada; com os dados
+    inteiros disponíveis, os quartis são exatos e não há custo de sketch.
+
+    Args:
+        df (pd.DataFrame): Dados.
+        indicators (List[str]): Colunas numéricas a resumir.
+        group_cols (List[str]): Colunas de agrupamento (além da agregação global).
+    """
+
+    def __init__(self, df: pd.DataFrame, indicators: List[str], group_cols: List[str] = ("Year", "Country")):
+        self.indicators = list(indicators)
+        self.group_cols = list(group_cols)
+        self._df = df
+        self._describe = {}
+        self._means = {}
+
+    def describe(self, by: Optional[str] = None) -> pd.DataFrame:
+        """Mesmo formato de `GroupedStats.describe`, com quartis exatos."""
+        if by not in self._describe:
+            data = self._df[self.indicators] if self._check_grouping(by) is None else self._grouped(by)
+            self._describe[by] = data.describe()
+        return self._describe[by]
+
+    def means(self, by: str) -> pd.DataFrame:
+        """Médias por grupo (grupos x indicadores)."""
+        if by not in self._means:
+            self._check_grouping(by)
+            self._means[by] = self._grouped(by).mean()
+        return self._means[by]
+
+    def _grouped(self, by: str):
+        return self._df.groupby(by)[self.indicators]
+
+    def _check_grouping(self, by):
+        if by is not None and by not in self.group_cols:
+            raise ValueError(f"Agrupamento '{by}' não foi acumulado. Disponíveis: {self.group_cols}")
+        return by
+
+
+class GroupedStats:
+    """
+    Estatísticas descritivas para várias agregações calculadas em uma única passada.
+
+    Para cada agregação (global e cada coluna de agrupamento) mantém acumuladores
+    mescláveis por grupo e indicador: contagem, média e soma dos quadrados dos desvios
+    (Welford/Chan), mínimo, máximo e um sketch de quantis com erro relativo limitado
+    (buckets logarítmicos, como no DDSketch). Os dados podem chegar em blocos
+    (`update`) e instâncias independentes podem ser combinadas (`merge`).
+
+    Args:
+        indicators (List[str]): Colunas numéricas a resumir.
+        group_cols (List[str]): Colunas de agrupamento (além da agregação global).
+        relative_accuracy (float): Erro relativo máximo dos quantis aproximados.
+    """
+
+    def __init__(
+        self,
+        indicators: List[str],
+        group_cols: List[str] = ("Year", "Country"),
+        relative_accuracy: float = 0.005
+    ):
+        if len(indicators) >= 1 << _INDICATOR_BITS:
+            raise ValueError(f"No máximo {(1 << _INDICATOR_BITS) - 1} indicadores são suportados.")
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy deve estar entre 0 e 1.")
+
+        self.indicators = list(indicators)
+        self.group_cols = list(group_cols)
+        self.relative_accuracy = relative_accuracy
+        self._log_gamma = np.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self._min_key = int(np.ceil(np.log(_MIN_ABS_VALUE) / self._log_gamma))
+
+        m = len(self.indicators)
+        self._groupings = [None] + self.group_cols
+        self._labels = {g: [] for g in self._groupings}
+        self._label_ids = {g: {} for g in self._groupings}
+        self._count = {g: np.zeros((0, m)) for g in self._groupings}
+        self._mean = {g: np.zeros((0, m)) for g in self._groupings}
+        self._m2 = {g: np.zeros((0, m)) for g in self._groupings}
+        self._min = {g: np.zeros((0, m)) for g in self._groupings}
+        self._max = {g: np.zeros((0, m)) for g in self._groupings}
+        self._codes = {g: np.zeros(0, dtype=np.int64) for g in self._groupings}
+        self._code_counts = {g: np.zeros(0, dtype=np.int64) for g in self._groupings}
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], indicators: List[str], **kwargs) -> "GroupedStats":
+        """Consome um iterável de DataFrames (ex.: `pd.read_csv(..., chunksize=...)`)."""
+        stats = cls(indicators, **kwargs)
+        for chunk in chunks:
+            stats.update(chunk)
+        return stats
+
+    # --- Atualização -----------------------------------------------------------------
+
+    def update(self, df: pd.DataFrame) -> "GroupedStats":
+        """Incorpora um bloco de dados a todas as agregações."""
+        missing = [col for col in self.indicators + self.group_cols if col not in df.columns]
+        if missing:
+            raise ValueError(f"Colunas ausentes no DataFrame: {missing}")
+        if df.empty:
+            return self
+
+        values = df[self.indicators].to_numpy(dtype=float)
+        m = values.shape[1]
+        valid = ~np.isnan(values)
+        if valid.all():
+            rows = None
+            columns = np.tile(np.arange(m), values.shape[0])
+            x = values.ravel()
+        else:
+            rows, columns = np.nonzero(valid)
+            x = values[rows, columns]
+        buckets = self._bucket(x)
+
+        for grouping in self._groupings:
+            group_ids = self._group_ids(grouping, df)
+            if rows is None:
+                flat = (group_ids[:, None] * m + np.arange(m)).ravel()
+            else:
+                flat = group_ids[rows] * m + columns
+            # Linhas sem rótulo de grupo (NaN) ficam fora da agregação
+            keep = flat >= 0
+            if keep.all():
+                self._update_moments(grouping, flat, x)
+                self._update_sketch(grouping, flat, buckets)
+            else:
+                self._update_moments(grouping, flat[keep], x[keep])
+                self._update_sketch(grouping, flat[keep], buckets[keep])
+        return self
+
+    def merge(self, other: "GroupedStats") -> "GroupedStats":
+        """Combina os acumuladores de outra instância (mesmos indicadores e agrupamentos)."""
+        if other.indicators != self.indicators or other.group_cols != self.group_cols:
+            raise ValueError("Só é possível combinar estatísticas com os mesmos indicadores e agrupamentos.")
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Só é possível combinar sketches com a mesma precisão relativa.")
+
+        for grouping in self._groupings:
+            labels = other._labels[grouping]
+            ids = self._register(grouping, labels)
+            self._combine(
+                grouping, ids, other._count[grouping], other._mean[grouping], other._m2[grouping],
+                other._min[grouping], other._max[grouping]
+            )
+            remapped = self._remap_codes(other._codes[grouping], ids)
+            self._add_codes(grouping, remapped, other._code_counts[grouping])
+        return self
+
+    # --- Consulta --------------------------------------------------------------------
+
+    def describe(self, by: Optional[str] = None) -> pd.DataFrame:
+        """
+        Estatísticas no formato do pandas.
+
+        Args:
+            by (str, opcional): Coluna de agrupamento; None para a agregação global.
+
+        Returns:
+            pd.DataFrame: Com by=None, o formato de `df[indicators].describe()`; com uma
+            coluna de agrupamento, o formato de `df.groupby(by)[indicators].describe()`.
+        """
+        grouping = self._check_grouping(by)
+        count = self._count[grouping]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self._m2[grouping] / (count - 1))
+        std = np.where(count > 1, std, np.nan)
+        empty = count == 0
+
+        blocks = {
+            "count": count,
+            "mean": np.where(empty, np.nan, self._mean[grouping]),
+            "std": std,
+            "min": np.where(empty, np.nan, self._min[grouping]),
+            "25%": self._quantile(grouping, 0.25),
+            "50%": self._quantile(grouping, 0.50),
+            "75%": self._quantile(grouping, 0.75),
+            "max": np.where(empty, np.nan, self._max[grouping]),
+        }
+
+        if grouping is None:
+            return pd.DataFrame(
+                np.vstack([blocks[stat][0] for stat in DESCRIBE_STATS]),
+                index=DESCRIBE_STATS, columns=self.indicators
+            )
+
+        order = np.argsort(np.array(self._labels[grouping], dtype=object), kind="stable")
+        columns = pd.MultiIndex.from_product([self.indicators, DESCRIBE_STATS])
+        data = np.stack([blocks[stat] for stat in DESCRIBE_STATS], axis=2)
+        index = pd.Index(np.array(self._labels[grouping], dtype=object)[order], name=by)
+        return pd.DataFrame(data[order].reshape(len(order), -1), index=index, columns=columns)
+
+    def means(self, by: str) -> pd.DataFrame:
+        """Médias por grupo (grupos x indicadores)."""
+        grouping = self._check_grouping(by)
+        mean = np.where(self._count[grouping] == 0, np.nan, self._mean[grouping])
+        df = pd.DataFrame(mean, index=pd.Index(self._labels[grouping], name=by), columns=self.indicators)
+        return df.sort_index()
+
+    # --- Internos --------------------------------------------------------------------
+
+    def _check_grouping(self, by):
+        if by is not None and by not in self.group_cols:
+            raise ValueError(f"Agrupamento '{by}' não foi acumulado. Disponíveis: {self.group_cols}")
+        return by
+
+    def _register(self, grouping, labels) -> np.ndarray:
+        """Ids globais para os rótulos, registrando rótulos novos e expandindo os acumuladores."""
+        table = self._label_ids[grouping]
+        ids = np.empty(len(labels), dtype=np.int64)
+        for i, label in enumerate(labels):
+            if label not in table:
+                table[label] = len(self._labels[grouping])
+                self._labels[grouping].append(label)
+            ids[i] = table[label]
+
+        grow = len(self._labels[grouping]) - self._count[grouping].shape[0]
+        if grow > 0:
+            m = len(self.indicators)
+            for acc, fill in ((self._count, 0.0), (self._mean, 0.0), (self._m2, 0.0),
+                              (self._min, np.inf), (self._max, -np.inf)):
+                acc[grouping] = np.vstack([acc[grouping], np.full((grow, m), fill)])
+        return ids
+
+    def _group_ids(self, grouping, df: pd.DataFrame) -> np.ndarray:
+        if grouping is None:
+            self._register(None, ["All"])
+            return np.zeros(len(df), dtype=np.int64)
+        codes, uniques = pd.factorize(df[grouping])
+        if len(uniques) == 0:
+            # Bloco sem nenhum rótulo: todas as linhas ficam fora da agregação
+            return np.full(len(df), -len(self.indicators), dtype=np.int64)
+        ids = self._register(grouping, list(uniques))
+        return np.where(codes >= 0, ids[codes], -len(self.indicators))
+
+    def _update_moments(self, grouping, flat: np.ndarray, x: np.ndarray) -> None:
+        """Momentos do bloco por (grupo, indicador), combinados aos acumulados."""
+        shape = self._count[grouping].shape
+        size = shape[0] * shape[1]
+
+        count = np.bincount(flat, minlength=size).astype(float)
+        total = np.bincount(flat, weights=x, minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, 0.0)
+        m2 = np.bincount(flat, weights=(x - mean[flat]) ** 2, minlength=size)
+        low = np.full(size, np.inf)
+        high = np.full(size, -np.inf)
+        np.minimum.at(low, flat, x)
+        np.maximum.at(high, flat, x)
+
+        self._combine(
+            grouping, np.arange(shape[0]), count.reshape(shape), mean.reshape(shape),
+            m2.reshape(shape), low.reshape(shape), high.reshape(shape)
+        )
+
+    def _combine(self, grouping, ids, count_b, mean_b, m2_b, min_b, max_b) -> None:
+        """Fórmula de Chan para combinar médias e somas de quadrados de duas partições."""
+        count_a = self._count[grouping][ids]
+        mean_a = self._mean[grouping][ids]
+        total = count_a + count_b
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean_b - mean_a
+            ratio = np.where(total > 0, count_b / total, 0.0)
+        self._mean[grouping][ids] = mean_a + delta * ratio
+        self._m2[grouping][ids] = self._m2[grouping][ids] + m2_b + delta ** 2 * count_a * ratio
+        self._count[grouping][ids] = total
+        self._min[grouping][ids] = np.minimum(self._min[grouping][ids], min_b)
+        self._max[grouping][ids] = np.maximum(self._max[grouping][ids], max_b)
+
+    def _bucket(self, values: np.ndarray) -> np.ndarray:
+        """Bucket logarítmico monótono de cada valor (erro relativo limitado)."""
+        magnitude = np.abs(values)
+        keys = np.ceil(np.log(np.maximum(magnitude, _MIN_ABS_VALUE)) / self._log_gamma)
+        offset = (keys - self._min_key).astype(np.int64) + 1
+        if offset.size and offset.max() >= _ZERO_BUCKET:
+            raise ValueError("Valores fora do intervalo suportado pelo sketch de quantis.")
+        offset = np.where(magnitude > _MIN_ABS_VALUE, offset, 0)
+        return _ZERO_BUCKET + np.sign(values).astype(np.int64) * offset
+
+    def _bucket_value(self, buckets: np.ndarray) -> np.ndarray:
+        """Valor representativo (ponto médio relativo) de cada bucket."""
+        offset = np.abs(buckets - _ZERO_BUCKET)
+        keys = offset - 1 + self._min_key
+        gamma = np.exp(self._log_gamma)
+        magnitude = 2 * np.exp(keys * self._log_gamma) / (gamma + 1)
+        return np.sign(buckets - _ZERO_BUCKET) * np.where(offset == 0, 0.0, magnitude)
+
+    def _update_sketch(self, grouping, flat: np.ndarray, buckets: np.ndarray) -> None:
+        """Contagens do bloco por (grupo, indicador, bucket), somadas ao sketch."""
+        if flat.size == 0:
+            return
+        m = len(self.indicators)
+        low, high = int(buckets.min()), int(buckets.max())
+        width = high - low + 1
+        size = self._count[grouping].shape[0] * m * width
+
+        if size <= 4 * flat.size:
+            # Poucos buckets distintos: contagem densa, sem ordenação
+            dense = np.bincount(flat * width + (buckets - low), minlength=size)
+            idx = np.flatnonzero(dense)
+            counts = dense[idx]
+            cell, bucket = np.divmod(idx, width)
+            bucket = bucket + low
+        else:
+            cell_bucket, counts = np.unique(flat * width + (buckets - low), return_counts=True)
+            cell, bucket = np.divmod(cell_bucket, width)
+            bucket = bucket + low
+        group_ids, indicator_idx = np.divmod(cell, m)
+        self._add_codes(grouping, self._pack(group_ids, indicator_idx, bucket), counts)
+
+    @staticmethod
+    def _pack(group_ids, indicator_idx, buckets) -> np.ndarray:
+        return (
+            (group_ids.astype(np.int64) << (_INDICATOR_BITS + _BUCKET_BITS))
+            | (indicator_idx.astype(np.int64) << _BUCKET_BITS)
+            | buckets
+        )
+
+    def _remap_codes(self, codes: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        low = codes & ((1 << (_INDICATOR_BITS + _BUCKET_BITS)) - 1)
+        return (ids[codes >> (_INDICATOR_BITS + _BUCKET_BITS)] << (_INDICATOR_BITS + _BUCKET_BITS)) | low
+
+    def _add_codes(self, grouping, codes: np.ndarray, counts: np.ndarray) -> None:
+        merged = np.concatenate([self._codes[grouping], codes])
+        weights = np.concatenate([self._code_counts[grouping], counts])
+        unique, inverse = np.unique(merged, return_inverse=True)
+        self._codes[grouping] = unique
+        self._code_counts[grouping] = np.bincount(inverse, weights=weights).astype(np.int64)
+
+    def _quantile(self, grouping, q: float) -> np.ndarray:
+        """Quantil aproximado (grupos x indicadores) a partir do sketch."""
+        codes = self._codes[grouping]
+        counts = self._code_counts[grouping]
+        shape = self._count[grouping].shape
+        result = np.full(shape, np.nan)
+        if codes.size == 0:
+            return result
+
+        segments = codes >> _BUCKET_BITS
+        starts = np.flatnonzero(np.r_[True, segments[1:] != segments[:-1]])
+        cumulative = np.cumsum(counts)
+        base = np.r_[0, cumulative][starts]
+        totals = np.add.reduceat(counts, starts)
+
+        # Interpolação linear entre as estatísticas de ordem vizinhas de q·(n-1), como no pandas
+        position = q * (totals - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, totals - 1)
+        fraction = position - lower
+        value_lower = self._bucket_value(codes[np.searchsorted(cumulative, base + lower + 1)] & ((1 << _BUCKET_BITS) - 1))
+        value_upper = self._bucket_value(codes[np.searchsorted(cumulative, base + upper + 1)] & ((1 << _BUCKET_BITS) - 1))
+        values = value_lower + fraction * (value_upper - value_lower)
+
+        seg = segments[starts]
+        group_idx = seg >> _INDICATOR_BITS
+        indicator_idx = seg & ((1 << _INDICATOR_BITS) - 1)
+        low = self._min[grouping][group_idx, indicator_idx]
+        high = self._max[grouping][group_idx, indicator_idx]
+        result[group_idx, indicator_idx] = np.clip(values, low, high)
+        return result
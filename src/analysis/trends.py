@@ -0,0 +1,135 @@
+# src/analysis/trends.py
+
+import warnings
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.panel import LPIPanel
+
+TREND_METHODS = ('ols', 'huber')
+
+# Constante de ajuste do estimador de Huber (95% de eficiência sob normalidade)
+HUBER_T = 1.345
+
+def fit_trends(
+    data: Union[LPIPanel, pd.DataFrame],
+    indicators: Optional[List[str]] = None,
+    method: str = 'ols',
+    forecast_year: Optional[int] = None,
+    min_obs: int = 3,
+    max_iter: int = 50,
+    tol: float = 1e-8
+) -> pd.DataFrame:
+    """
+    Ajusta tendências lineares por país e indicador para todo o painel de uma vez.
+
+    Cada série (país, indicador) tem o mesmo desenho [1, ano]; os anos ausentes entram
+    com peso zero. As equações normais de todas as séries são montadas como um lote
+    (séries x 2 x 2) e resolvidas numa única chamada a `np.linalg.solve`. O método
+    'huber' repete essa solução em lote com pesos de Huber (IRLS), com escala pelo MAD
+    dos resíduos de cada série.
+
+    Args:
+        data (LPIPanel | pd.DataFrame): Painel ou dados em formato longo.
+        indicators (List[str], opcional): Indicadores; por padrão, todos os do painel.
+        method (str): 'ols' (mínimos quadrados) ou 'huber' (robusto).
+        forecast_year (int, opcional): Ano da previsão; por padrão, a próxima edição
+            (último ano + intervalo mediano entre edições).
+        min_obs (int): Mínimo de anos observados para ajustar a série (default 3).
+        max_iter (int): Máximo de iterações do IRLS (default 50).
+        tol (float): Tolerância de convergência dos coeficientes do IRLS.
+
+    Returns:
+        pd.DataFrame: Uma linha por (país, indicador) com "Country", "Indicator",
+        "Observations", "Slope" (por ano), "Slope SE", "Forecast Year", "Forecast",
+        "Forecast SE" (erro de previsão de uma nova observação) e "Last Value".
+        Séries com menos de `min_obs` anos têm NaN nas estimativas.
+    """
+    if method not in TREND_METHODS:
+        raise ValueError(f"Método inválido: '{method}'. Use {TREND_METHODS}.")
+    if min_obs < 3:
+        raise ValueError("min_obs deve ser pelo menos 3 (são necessários graus de liberdade para o erro).")
+
+    panel = data if isinstance(data, LPIPanel) else LPIPanel.from_frame(data, indicators)
+    indicators = list(panel.indicators) if indicators is None else list(indicators)
+    cols = [panel._indicator_pos(ind) for ind in indicators]
+
+    years = panel.years.astype(float)
+    if forecast_year is None:
+        step = np.median(np.diff(years)) if len(years) > 1 else 1.0
+        forecast_year = int(years[-1] + step)
+
+    # Séries empilhadas: (país x indicador, ano)
+    y = np.moveaxis(panel.values[:, :, cols], 2, 1).reshape(-1, len(years))
+    observed = ~np.isnan(y)
+    y = np.where(observed, y, 0.0)
+    n = observed.sum(axis=1)
+    fitted = n >= min_obs
+
+    # Anos centrados para um sistema bem condicionado
+    center = years.mean()
+    X = np.column_stack([np.ones_like(years), years - center])
+
+    weights = observed.astype(float)
+    beta = _batched_wls(X, y, weights, fitted)
+    if method == 'huber':
+        for _ in range(max_iter):
+            resid = (y - beta @ X.T) * observed
+            scale = _mad_scale(resid, observed)
+            u = np.abs(resid) / np.where(scale > 0, scale, 1.0)[:, None]
+            robust = np.where(u <= HUBER_T, 1.0, HUBER_T / np.maximum(u, HUBER_T))
+            weights = observed * np.where(scale[:, None] > 0, robust, 1.0)
+            beta_new = _batched_wls(X, y, weights, fitted)
+            converged = np.nanmax(np.abs(beta_new - beta), initial=0.0) < tol
+            beta = beta_new
+            if converged:
+                break
+
+    # Covariância dos coeficientes: sigma² (X' W X)^-1
+    resid = (y - beta @ X.T) * observed
+    dof = np.maximum(n - 2, 1)
+    sigma2 = (weights * resid ** 2).sum(axis=1) / dof
+    xtwx = np.einsum('sy,yi,yj->sij', weights, X, X)
+    xtwx[~fitted] = np.eye(2)
+    cov = sigma2[:, None, None] * np.linalg.inv(xtwx)
+
+    x0 = np.array([1.0, forecast_year - center])
+    forecast = beta @ x0
+    forecast_se = np.sqrt(np.einsum('i,sij,j->s', x0, cov, x0) + sigma2)
+
+    last_pos = len(years) - 1 - np.argmax(observed[:, ::-1], axis=1)
+    last_value = np.where(n > 0, y[np.arange(len(y)), last_pos], np.nan)
+
+    result = pd.DataFrame({
+        'Country': np.repeat(panel.countries, len(indicators)),
+        'Indicator': np.tile(indicators, len(panel.countries)),
+        'Observations': n,
+        'Slope': beta[:, 1],
+        'Slope SE': np.sqrt(cov[:, 1, 1]),
+        'Forecast Year': forecast_year,
+        'Forecast': forecast,
+        'Forecast SE': forecast_se,
+        'Last Value': last_value
+    })
+    result.loc[~fitted, ['Slope', 'Slope SE', 'Forecast', 'Forecast SE']] = np.nan
+    return result
+
+def _batched_wls(X: np.ndarray, y: np.ndarray, weights: np.ndarray, fitted: np.ndarray) -> np.ndarray:
+    """Mínimos quadrados ponderados para todas as séries numa única solução em lote."""
+    xtwx = np.einsum('sy,yi,yj->sij', weights, X, X)
+    xtwy = np.einsum('sy,yi,sy->si', weights, X, y)
+    # Séries sem dados suficientes recebem um sistema trivial e são descartadas depois
+    xtwx[~fitted] = np.eye(X.shape[1])
+    xtwy[~fitted] = 0.0
+    return np.linalg.solve(xtwx, xtwy[..., None])[..., 0]
+
+def _mad_scale(resid: np.ndarray, observed: np.ndarray) -> np.ndarray:
+    """Escala robusta (MAD normalizado) dos resíduos de cada série, ignorando anos ausentes."""
+    abs_resid = np.where(observed, np.abs(resid), np.nan)
+    with warnings.catch_warnings():
+        # Séries sem anos observados geram "All-NaN slice"
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        mad = np.nanmedian(abs_resid, axis=1)
+    return np.nan_to_num(mad / 0.6745)
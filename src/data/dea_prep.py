@@ -14,7 +14,7 @@ DEA_INPUTS = [
 
 DEA_OUTPUT = ["LPI Aggregate"]
 
-def prepare_dea_data(year: int, source: str = "local") -> pd.DataFrame:
+def prepare_dea_data(year: int, source: str = "local", region: str = None) -> pd.DataFrame:
     """
     Prepara os dados do LPI para análise DEA para um ano específico.
 
@@ -24,6 +24,7 @@ def prepare_dea_data(year: int, source: str = "local") -> pd.DataFrame:
     Args:
         year (int): Ano para o qual os dados serão preparados.
         source (str, opcional): Fonte dos dados, 'local' ou 'remote'. Default é 'local'.
+        region (str, opcional): Agrupamento de `src.data.regions` ao qual restringir os países.
 
     Returns:
         pd.DataFrame: DataFrame contendo as colunas 'Country', inputs e output, sem dados faltantes.
@@ -32,7 +33,7 @@ def prepare_dea_data(year: int, source: str = "local") -> pd.DataFrame:
         ValueError: Se colunas necessárias estiverem ausentes no DataFrame.
         ValueError: Se não houver dados para o ano especificado.
     """
-    df = world_bank.load_lpi_data(source=source)
+    df = world_bank.load_lpi_data(source=source, region=region)
     
     if year not in df["Year"].unique():
         raise ValueError(f"Ano {year} não encontrado nos dados disponíveis.")
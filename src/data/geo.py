@@ -0,0 +1,241 @@
+# src/data/geo.py
+
+import json
+import logging
+import os
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import numpy as np
+
+from src.data import regions
+
+logger = logging.getLogger(__name__)
+
+# Geometria de origem: Natural Earth 1:110m (domínio público), com o código ISO-3 em
+# properties.iso_a3. Os níveis simplificados são gerados por `build_levels` em
+# static/geo, de onde o Streamlit os serve como arquivos estáticos.
+SOURCE_PATH = os.path.join("data", "geo", "ne_110m_countries.geojson")
+LEVELS_DIR = os.path.join("static", "geo")
+STATIC_URL = "app/static/geo"
+
+# Nível -> tolerância de Douglas-Peucker (graus) e casas decimais das coordenadas
+LEVELS = {
+    "high": (0.0, 3),
+    "medium": (0.05, 2),
+    "low": (0.2, 2)
+}
+
+FEATURE_ID_KEY = "properties.iso_a3"
+
+# Nomes usados nos dados do LPI (e aliases) -> código ISO-3, do registro de regiões
+COUNTRY_ISO3 = {name: economy.iso3 for name, economy in regions.get_registry().by_name.items()}
+
+# Margem, em graus, em torno da extensão dos países de uma região
+VIEW_MARGIN = 4.0
+
+
+def country_to_iso3(countries: Iterable[str]) -> list:
+    """Converte nomes de países em códigos ISO-3 (None para nomes desconhecidos)."""
+    return [COUNTRY_ISO3.get(c, _source_names().get(c)) for c in countries]
+
+
+def region_view(iso3: Iterable[str]) -> dict:
+    """
+    Enquadramento do mapa (longitudes, latitudes e centro) que cobre os países dados.
+
+    Usa a extensão do maior polígono de cada país, para que territórios ultramarinos
+    (ex.: Guiana Francesa) não ampliem a vista; países sem geometria são ignorados.
+
+    Args:
+        iso3 (Iterable[str]): Códigos ISO-3 dos países.
+
+    Returns:
+        dict: "lon_range", "lat_range" e "center" ({"lat", "lon"}); a vista do mundo
+        inteiro se nenhum país tiver geometria.
+    """
+    bounds = np.array([b for b in map(_bounds().get, iso3) if b is not None]).reshape(-1, 4)
+    if not len(bounds):
+        lon, lat = (-180.0, 180.0), (-60.0, 85.0)
+    else:
+        lon = (float(max(bounds[:, 0].min() - VIEW_MARGIN, -180.0)), float(min(bounds[:, 2].max() + VIEW_MARGIN, 180.0)))
+        lat = (float(max(bounds[:, 1].min() - VIEW_MARGIN, -60.0)), float(min(bounds[:, 3].max() + VIEW_MARGIN, 85.0)))
+    return {
+        "lon_range": lon,
+        "lat_range": lat,
+        "center": {"lat": (lat[0] + lat[1]) / 2, "lon": (lon[0] + lon[1]) / 2}
+    }
+
+
+def _douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Máscara dos vértices mantidos pela simplificação de Douglas-Peucker (sem recursão)."""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        inner = points[start + 1:end] - points[start]
+        length = np.hypot(*segment)
+        if length == 0:
+            dist = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            dist = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = start + 1 + i
+            keep[mid] = True
+            stack.extend([(start, mid), (mid, end)])
+    return keep
+
+
+def simplify_ring(ring, tolerance: float, decimals: int) -> Optional[list]:
+    """
+    Simplifica e quantiza um anel fechado; retorna None se ele degenerar.
+
+    O anel é dividido no vértice mais distante do primeiro, para que os dois trechos
+    tenham extremos distintos, e vértices repetidos após o arredondamento são removidos.
+    """
+    points = np.asarray(ring, dtype=float)
+    if tolerance > 0 and len(points) > 4:
+        far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+        keep = np.concatenate([
+            _douglas_peucker(points[:far + 1], tolerance)[:-1],
+            _douglas_peucker(points[far:], tolerance)
+        ])
+        points = points[keep]
+    points = np.round(points, decimals)
+    repeated = np.concatenate([[False], (np.diff(points, axis=0) == 0).all(axis=1)])
+    points = points[~repeated]
+    if len(points) < 4:
+        return None
+    return points.tolist()
+
+
+def simplify_feature(feature: dict, tolerance: float, decimals: int) -> dict:
+    """Simplifica um MultiPolygon, descartando partes degeneradas mas mantendo sempre a maior."""
+    polygons = feature["geometry"]["coordinates"]
+    simplified = []
+    for polygon in polygons:
+        exterior = simplify_ring(polygon[0], tolerance, decimals)
+        if exterior is None:
+            continue
+        holes = [h for h in (simplify_ring(r, tolerance, decimals) for r in polygon[1:]) if h is not None]
+        simplified.append([exterior] + holes)
+    if not simplified:
+        largest = max(polygons, key=lambda p: len(p[0]))
+        simplified = [[np.round(np.asarray(largest[0]), decimals).tolist()]]
+    return {
+        "type": "Feature",
+        "id": feature["id"],
+        "properties": {"iso_a3": feature["properties"]["iso_a3"], "name": feature["properties"]["name"]},
+        "geometry": {"type": "MultiPolygon", "coordinates": simplified}
+    }
+
+
+def build_levels(source: str = SOURCE_PATH, out_dir: str = LEVELS_DIR, levels: dict = LEVELS) -> dict:
+    """
+    Gera um GeoJSON por nível de simplificação a partir da geometria de origem.
+
+    Args:
+        source (str): GeoJSON de origem.
+        out_dir (str): Diretório de saída (servido pelo Streamlit em app/static).
+        levels (dict): Nível -> (tolerância em graus, casas decimais).
+
+    Returns:
+        dict: Nível -> tamanho do arquivo gerado, em bytes.
+    """
+    with open(source, encoding="utf-8") as f:
+        collection = json.load(f)
+    os.makedirs(out_dir, exist_ok=True)
+
+    sizes = {}
+    for level, (tolerance, decimals) in levels.items():
+        features = [simplify_feature(feat, tolerance, decimals) for feat in collection["features"]]
+        path = os.path.join(out_dir, f"countries_{level}.geojson")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"type": "FeatureCollection", "features": features}, f, separators=(",", ":"))
+        sizes[level] = os.path.getsize(path)
+        logger.info(f"Nível '{level}' gravado em {path} ({sizes[level] / 1024:.1f} KB)")
+    return sizes
+
+
+def pick_level(lon_range: tuple, width_px: int) -> str:
+    """
+    Escolhe o nível mais simplificado cuja tolerância não passa de um pixel na tela.
+
+    Args:
+        lon_range (tuple): Longitudes (mín., máx.) visíveis no mapa.
+        width_px (int): Largura do mapa em pixels.
+
+    Returns:
+        str: Nome do nível.
+    """
+    degrees_per_px = (lon_range[1] - lon_range[0]) / max(width_px, 1)
+    candidates = [lvl for lvl, (tol, _) in LEVELS.items() if tol <= degrees_per_px]
+    return max(candidates, key=lambda lvl: LEVELS[lvl][0]) if candidates else "high"
+
+
+@lru_cache(maxsize=None)
+def _load_level(level: str) -> dict:
+    path = os.path.join(LEVELS_DIR, f"countries_{level}.geojson")
+    if not os.path.exists(path):
+        build_levels()
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=1)
+def _source_names() -> dict:
+    with open(SOURCE_PATH, encoding="utf-8") as f:
+        return {feat["properties"]["name"]: feat["id"] for feat in json.load(f)["features"]}
+
+
+@lru_cache(maxsize=1)
+def _bounds() -> dict:
+    """ISO-3 -> (lon mín., lat mín., lon máx., lat máx.) do maior polígono de cada país."""
+    bounds = {}
+    for feature in _load_level("low")["features"]:
+        rings = [np.asarray(polygon[0]) for polygon in feature["geometry"]["coordinates"]]
+        extents = [np.concatenate([r.min(axis=0), r.max(axis=0)]) for r in rings]
+        bounds[feature["id"]] = tuple(max(extents, key=lambda e: (e[2] - e[0]) * (e[3] - e[1])))
+    return bounds
+
+
+@lru_cache(maxsize=32)
+def load_geojson(level: str = "medium", iso3: Optional[tuple] = None) -> dict:
+    """
+    GeoJSON de um nível, opcionalmente restrito a um conjunto de códigos ISO-3.
+
+    O resultado é compartilhado entre chamadas e não deve ser modificado.
+
+    Args:
+        level (str): 'high', 'medium' ou 'low'.
+        iso3 (tuple, opcional): Códigos ISO-3 da região; por padrão, todos os países.
+
+    Returns:
+        dict: FeatureCollection.
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Nível inválido: '{level}'. Use {list(LEVELS)}.")
+    collection = _load_level(level)
+    if iso3 is None:
+        return collection
+    wanted = set(iso3)
+    return {"type": "FeatureCollection", "features": [f for f in collection["features"] if f["id"] in wanted]}
+
+
+def geojson_url(level: str) -> str:
+    """URL relativa do nível servido como arquivo estático (requer server.enableStaticServing)."""
+    return f"{STATIC_URL}/countries_{level}.geojson"
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    build_levels()
+
+
+if __name__ == "__main__":
+    main()
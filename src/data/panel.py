@@ -0,0 +1,271 @@
+# src/data/panel.py
+
+from typing import NamedTuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data import regions, world_bank
+
+
+class PanelSlice(NamedTuple):
+    """
+    Fatia (países x indicadores) de um ano do painel.
+
+    values é uma view do cubo sempre que nenhuma linha precisa ser descartada.
+    """
+    countries: np.ndarray
+    values: np.ndarray
+    indicators: list[str]
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame indexado pelo país, sem copiar os valores."""
+        df = pd.DataFrame(self.values, index=pd.Index(self.countries, name="Country"),
+                          columns=self.indicators, copy=False)
+        return df
+
+
+class LPIPanel:
+    """
+    Cubo denso (país x ano x indicador) com máscara de validade e índices inteiros.
+
+    Construído uma única vez a partir de `world_bank.load_lpi_data`, oferece fatias por
+    ano, país ou indicador em O(1) como views NumPy, sem máscaras booleanas sobre o
+    DataFrame em formato longo.
+
+    Atributos:
+        values (np.ndarray): Cubo float64 contíguo, NaN onde não há dado.
+        valid (np.ndarray): Máscara booleana de validade, mesmo formato de values.
+        countries (np.ndarray): Nomes dos países (eixo 0), em ordem alfabética.
+        years (np.ndarray): Anos (eixo 1), em ordem crescente.
+        indicators (list[str]): Indicadores (eixo 2).
+        version (str): Versão publicada no armazenamento compartilhado, se houver.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        countries: np.ndarray,
+        years: np.ndarray,
+        indicators: list[str],
+        valid: np.ndarray = None
+    ):
+        self.values = np.ascontiguousarray(values, dtype=float)
+        self.valid = ~np.isnan(self.values) if valid is None else np.asarray(valid, dtype=bool)
+        self.countries = np.asarray(countries, dtype=object)
+        self.years = np.asarray(years, dtype=int)
+        self.indicators = list(indicators)
+
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+        self.year_index = {int(y): i for i, y in enumerate(self.years)}
+        self.indicator_index = {ind: i for i, ind in enumerate(self.indicators)}
+        self.version = None
+        self._frame = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, indicators: list[str] = None) -> "LPIPanel":
+        """
+        Constrói o painel a partir do DataFrame em formato longo (Country, Year, indicadores).
+
+        Args:
+            df (pd.DataFrame): Dados do LPI.
+            indicators (list[str], opcional): Indicadores a incluir; por padrão, todas as
+                colunas numéricas exceto "Year".
+
+        Returns:
+            LPIPanel: Painel com os dados.
+        """
+        if indicators is None:
+            indicators = [col for col in df.select_dtypes("number").columns if col != "Year"]
+        missing = [col for col in ["Country", "Year"] + list(indicators) if col not in df.columns]
+        if missing:
+            raise ValueError(f"Colunas ausentes no DataFrame: {missing}")
+
+        df = df.dropna(subset=["Country", "Year"])
+        country_codes, countries = pd.factorize(df["Country"], sort=True)
+        year_codes, years = pd.factorize(df["Year"].astype(int), sort=True)
+
+        values = np.full((len(countries), len(years), len(indicators)), np.nan)
+        values[country_codes, year_codes] = df[indicators].to_numpy(dtype=float)
+        return cls(values, np.asarray(countries), np.asarray(years), indicators)
+
+    @classmethod
+    def load(cls, source: str = "local", snapshot: str = None, region: str = None) -> "LPIPanel":
+        """
+        Carrega os dados com `world_bank.load_lpi_data` (opcionalmente um snapshot,
+        restrito a um agrupamento de `src.data.regions`) e constrói o painel.
+        """
+        return cls.from_frame(world_bank.load_lpi_data(source=source, snapshot=snapshot, region=region))
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        return self.values.shape
+
+    def year(self, year: int) -> np.ndarray:
+        """View (país x indicador) de um ano."""
+        return self.values[:, self._year_pos(year), :]
+
+    def country(self, country: str) -> np.ndarray:
+        """View (ano x indicador) de um país."""
+        return self.values[self._country_pos(country)]
+
+    def indicator(self, indicator: str) -> np.ndarray:
+        """View (país x ano) de um indicador."""
+        return self.values[:, :, self._indicator_pos(indicator)]
+
+    def available_years(self, indicators: list[str] = None) -> list[int]:
+        """Anos com pelo menos um país com todos os indicadores informados."""
+        cols = self._columns(indicators)
+        complete = self.valid[:, :, cols].all(axis=2).any(axis=0)
+        return [int(y) for y in self.years[complete]]
+
+    def slice_year(self, year: int, indicators: list[str] = None, complete: bool = True) -> PanelSlice:
+        """
+        Fatia (países x indicadores) de um ano.
+
+        Args:
+            year (int): Ano desejado.
+            indicators (list[str], opcional): Indicadores; por padrão, todos.
+            complete (bool): Se True, mantém apenas países com todos os indicadores válidos.
+
+        Returns:
+            PanelSlice: Países e valores. Os valores são uma view quando os indicadores
+            formam um intervalo contíguo e nenhuma linha é descartada.
+        """
+        y = self._year_pos(year)
+        cols = self._columns(indicators)
+        names = self.indicators[cols] if isinstance(cols, slice) else [self.indicators[c] for c in cols]
+        if isinstance(cols, np.ndarray):
+            values = self.values[:, y, :][:, cols]
+            valid = self.valid[:, y, :][:, cols]
+        else:
+            values = self.values[:, y, cols]
+            valid = self.valid[:, y, cols]
+
+        rows = valid.all(axis=1) if complete else valid.any(axis=1)
+        if rows.all():
+            return PanelSlice(self.countries, values, names)
+        return PanelSlice(self.countries[rows], values[rows], names)
+
+    def frame(self, year: int = None, countries: list[str] = None) -> pd.DataFrame:
+        """
+        DataFrame em formato longo (Country, Year, indicadores), como `load_lpi_data`.
+
+        O DataFrame completo é montado uma única vez e reaproveitado; não deve ser
+        modificado no lugar.
+        """
+        if year is None and countries is None:
+            if self._frame is None:
+                self._frame = self._build_frame(slice(None), slice(None))
+            return self._frame
+
+        rows = slice(None) if countries is None else [self._country_pos(c) for c in countries]
+        cols = slice(None) if year is None else [self._year_pos(year)]
+        return self._build_frame(rows, cols)
+
+    def _build_frame(self, rows, cols) -> pd.DataFrame:
+        values = self.values[rows][:, cols]
+        present = self.valid[rows][:, cols].any(axis=2)
+        c_idx, y_idx = np.nonzero(present)
+        df = pd.DataFrame({
+            "Country": self.countries[rows][c_idx],
+            "Year": self.years[cols][y_idx]
+        })
+        df[self.indicators] = values[c_idx, y_idx]
+        return df
+
+    def _columns(self, indicators: Union[list[str], None]):
+        if indicators is None:
+            return slice(None)
+        pos = np.array([self._indicator_pos(ind) for ind in indicators])
+        if pos.size and np.all(np.diff(pos) == 1):
+            return slice(int(pos[0]), int(pos[-1]) + 1)
+        return pos
+
+    def subset(self, countries: list[str]) -> "LPIPanel":
+        """Painel só com os países dados (na ordem do painel); países ausentes são ignorados."""
+        rows = np.array(sorted(self.country_index[c] for c in set(countries) if c in self.country_index), dtype=int)
+        return LPIPanel(self.values[rows], self.countries[rows], self.years, self.indicators, self.valid[rows])
+
+    def for_region(self, region: str) -> "LPIPanel":
+        """
+        Painel restrito aos membros de um agrupamento de `src.data.regions`.
+
+        Se todos os países do painel pertencem ao agrupamento, devolve o próprio painel;
+        senão, um subconjunto cuja versão é "<versão>@<região>", para que resultados em
+        cache de regiões diferentes não se misturem.
+        """
+        members = regions.get_registry().contains(region, self.countries)
+        if all(members):
+            return self
+        panel = self.subset(self.countries[np.asarray(members, dtype=bool)])
+        panel.version = f"{self.version}@{region}" if self.version else None
+        return panel
+
+    def diff(self, other: "LPIPanel") -> pd.DataFrame:
+        """Células que mudam deste painel para `other`; ver `diff_panels`."""
+        return diff_panels(self, other)
+
+    def _year_pos(self, year: int) -> int:
+        try:
+            return self.year_index[int(year)]
+        except KeyError:
+            raise ValueError(f"Ano {year} não encontrado no painel.")
+
+    def _country_pos(self, country: str) -> int:
+        try:
+            return self.country_index[country]
+        except KeyError:
+            raise ValueError(f"País '{country}' não encontrado no painel.")
+
+    def _indicator_pos(self, indicator: str) -> int:
+        try:
+            return self.indicator_index[indicator]
+        except KeyError:
+            raise ValueError(f"Indicador '{indicator}' não encontrado no painel.")
+
+
+def diff_panels(old: LPIPanel, new: LPIPanel) -> pd.DataFrame:
+    """
+    Lista as células (país, ano, indicador) que diferem entre duas versões do painel.
+
+    Os dois cubos são alinhados na união de países, anos e indicadores e comparados de
+    uma só vez; NaN é considerado igual a NaN, e células que passam a existir ou deixam
+    de existir (países, anos ou indicadores novos ou removidos) aparecem como alteradas.
+
+    Args:
+        old (LPIPanel): Versão anterior.
+        new (LPIPanel): Versão nova.
+
+    Returns:
+        pd.DataFrame: Colunas "Country", "Year", "Indicator", "Old" e "New", uma linha
+        por célula alterada, ordenadas por país, ano e indicador.
+    """
+    countries = np.array(sorted(set(old.countries) | set(new.countries)), dtype=object)
+    years = np.union1d(old.years, new.years)
+    indicators = list(old.indicators) + [ind for ind in new.indicators if ind not in old.indicator_index]
+
+    a = _align(old, countries, years, indicators)
+    b = _align(new, countries, years, indicators)
+    changed = (a != b) & ~(np.isnan(a) & np.isnan(b))
+    c_idx, y_idx, i_idx = np.nonzero(changed)
+
+    return pd.DataFrame({
+        "Country": countries[c_idx],
+        "Year": years[y_idx],
+        "Indicator": np.asarray(indicators, dtype=object)[i_idx],
+        "Old": a[c_idx, y_idx, i_idx],
+        "New": b[c_idx, y_idx, i_idx]
+    })
+
+
+def _align(panel: LPIPanel, countries: np.ndarray, years: np.ndarray, indicators: list[str]) -> np.ndarray:
+    """Cubo do painel reposicionado nos eixos dados, com NaN onde ele não tem dados."""
+    cube = np.full((len(countries), len(years), len(indicators)), np.nan)
+    posicao = {c: i for i, c in enumerate(countries)}
+    c_pos = np.array([posicao[c] for c in panel.countries], dtype=int)
+    y_pos = np.searchsorted(years, panel.years)
+    i_pos = np.array([indicators.index(ind) for ind in panel.indicators], dtype=int)
+    values = np.where(panel.valid, panel.values, np.nan)
+    cube[np.ix_(c_pos, y_pos, i_pos)] = values
+    return cube
@@ -0,0 +1,199 @@
+# src/data/regions.py
+
+"""
+Registro das economias cobertas pelo LPI e dos agrupamentos usados pelo sistema.
+
+O arquivo data/regions.csv lista as ~170 economias que já apareceram nas edições do
+LPI, com códigos ISO-2 e ISO-3, o nome usado pelo Banco Mundial, a região e o grupo de
+renda do Banco Mundial (classificação FY2024) e a participação na UE e na OCDE. Os
+índices código <-> nome e os membros de cada agrupamento são montados uma única vez.
+
+Agrupamentos predefinidos: "World", "EU", "OECD", os quatro grupos de renda e as sete
+regiões do Banco Mundial. Outros podem ser registrados com `register`.
+"""
+
+import csv
+import os
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional
+
+import pandas as pd
+
+REGISTRY_PATH = os.path.join("data", "regions.csv")
+
+WORLD = "World"
+DEFAULT_REGION = "EU"
+
+REGION_NAMES = {
+    "EAS": "East Asia & Pacific",
+    "ECS": "Europe & Central Asia",
+    "LCN": "Latin America & Caribbean",
+    "MEA": "Middle East & North Africa",
+    "NAC": "North America",
+    "SAS": "South Asia",
+    "SSF": "Sub-Saharan Africa"
+}
+
+INCOME_GROUPS = {
+    "HIC": "High income",
+    "UMC": "Upper middle income",
+    "LMC": "Lower middle income",
+    "LIC": "Low income"
+}
+
+# Nomes alternativos encontrados em outras fontes -> ISO-3
+ALIASES = {
+    "Bahamas": "BHS", "Bosnia and Herz.": "BIH", "Brunei": "BRN", "Central African Rep.": "CAF",
+    "Congo": "COG", "Côte d'Ivoire": "CIV", "Czech Republic": "CZE", "Dem. Rep. Congo": "COD",
+    "Dominican Rep.": "DOM", "Egypt": "EGY", "Eq. Guinea": "GNQ", "Gambia": "GMB", "Hong Kong": "HKG",
+    "Iran": "IRN", "Ivory Coast": "CIV", "Korea": "KOR", "Kyrgyzstan": "KGZ", "Laos": "LAO",
+    "Macedonia": "MKD", "Russia": "RUS", "S. Sudan": "SSD", "Slovakia": "SVK", "Solomon Is.": "SLB",
+    "South Korea": "KOR", "Swaziland": "SWZ", "Syria": "SYR", "Taiwan": "TWN", "Turkey": "TUR",
+    "United States of America": "USA", "Venezuela": "VEN", "Vietnam": "VNM", "Yemen": "YEM",
+    "eSwatini": "SWZ"
+}
+
+
+# Nomes dos agrupamentos em textos corridos ("... in <nome>"); os demais usam o próprio nome
+DISPLAY_NAMES = {
+    WORLD: "the world",
+    "EU": "the European Union",
+    "OECD": "the OECD"
+}
+
+
+class Economy(NamedTuple):
+    iso2: str
+    iso3: str
+    name: str
+    region: str
+    income: str
+    eu: bool
+    oecd: bool
+
+
+class RegionRegistry:
+    """
+    Economias e agrupamentos, com índices por ISO-2, ISO-3 e nome (incluindo aliases).
+
+    Args:
+        economies (Iterable[Economy]): Economias do registro.
+    """
+
+    def __init__(self, economies: Iterable[Economy]):
+        self.economies = tuple(sorted(economies, key=lambda e: e.name))
+        self.by_iso2 = {e.iso2: e for e in self.economies}
+        self.by_iso3 = {e.iso3: e for e in self.economies}
+        self.by_name = {e.name: e for e in self.economies}
+        self.by_name.update({alias: self.by_iso3[iso3] for alias, iso3 in ALIASES.items() if iso3 in self.by_iso3})
+
+        self.groups = {WORLD: tuple(e.iso3 for e in self.economies)}
+        self.groups["EU"] = tuple(e.iso3 for e in self.economies if e.eu)
+        self.groups["OECD"] = tuple(e.iso3 for e in self.economies if e.oecd)
+        for code, label in INCOME_GROUPS.items():
+            self.groups[label] = tuple(e.iso3 for e in self.economies if e.income == code)
+        for code, label in REGION_NAMES.items():
+            self.groups[label] = tuple(e.iso3 for e in self.economies if e.region == code)
+
+    @classmethod
+    def from_csv(cls, path: str = REGISTRY_PATH) -> "RegionRegistry":
+        """Lê o registro de um CSV com as colunas de data/regions.csv."""
+        with open(path, encoding="utf-8", newline="") as f:
+            return cls(
+                Economy(row["ISO2"], row["ISO3"], row["Country"], row["Region"], row["Income Group"],
+                        row["EU"] == "1", row["OECD"] == "1")
+                for row in csv.DictReader(f)
+            )
+
+    def register(self, name: str, members: Iterable[str]) -> tuple:
+        """
+        Registra um agrupamento personalizado.
+
+        Args:
+            name (str): Nome do agrupamento.
+            members (Iterable[str]): Países por nome, ISO-2 ou ISO-3.
+
+        Returns:
+            tuple: Códigos ISO-3 dos membros.
+        """
+        iso3 = []
+        for member in members:
+            economy = self.lookup(member)
+            if economy is None:
+                raise ValueError(f"Economia desconhecida: '{member}'.")
+            iso3.append(economy.iso3)
+        self.groups[name] = tuple(dict.fromkeys(iso3))
+        return self.groups[name]
+
+    def lookup(self, country: str) -> Optional[Economy]:
+        """Economia por nome, alias, ISO-2 ou ISO-3 (None se desconhecida)."""
+        return self.by_name.get(country) or self.by_iso3.get(country) or self.by_iso2.get(country)
+
+    def members(self, region: str = None) -> list[Economy]:
+        """Economias de um agrupamento (todas se `region` for None), em ordem alfabética."""
+        if region is None:
+            region = WORLD
+        try:
+            return [self.by_iso3[code] for code in self.groups[region]]
+        except KeyError:
+            raise ValueError(f"Região desconhecida: '{region}'. Use {list(self.groups)}.")
+
+    def countries(self, region: str = None) -> list[str]:
+        """Nomes (Banco Mundial) dos membros de um agrupamento."""
+        return [e.name for e in self.members(region)]
+
+    def iso2_codes(self, region: str = None) -> list[str]:
+        return [e.iso2 for e in self.members(region)]
+
+    def iso3_codes(self, region: str = None) -> list[str]:
+        return [e.iso3 for e in self.members(region)]
+
+    def to_iso3(self, countries: Iterable[str]) -> list:
+        """Códigos ISO-3 de nomes de países (None para desconhecidos)."""
+        return [e.iso3 if e is not None else None for e in map(self.lookup, countries)]
+
+    def contains(self, region: str, countries: Iterable[str]) -> list[bool]:
+        """Para cada país (nome ou código), se ele pertence ao agrupamento."""
+        members = set(self.groups[region]) if region is not None else set(self.groups[WORLD])
+        return [code in members for code in self.to_iso3(countries)]
+
+    def filter_frame(self, df: pd.DataFrame, region: str = None) -> pd.DataFrame:
+        """Linhas de `df` cujos países ("Country") pertencem ao agrupamento (todas se None)."""
+        if region is None:
+            return df
+        return df[self.contains(region, df["Country"])]
+
+
+@lru_cache(maxsize=1)
+def get_registry() -> RegionRegistry:
+    """Registro padrão, lido de data/regions.csv uma única vez."""
+    return RegionRegistry.from_csv()
+
+
+def display_name(region: str) -> str:
+    """Nome do agrupamento para textos da interface (ex.: "the European Union" para "EU")."""
+    if region in DISPLAY_NAMES:
+        return DISPLAY_NAMES[region]
+    if region in INCOME_GROUPS.values():
+        return f"{region} economies"
+    return region
+
+
+def region_names() -> list[str]:
+    return list(get_registry().groups)
+
+
+def countries(region: str = None) -> list[str]:
+    return get_registry().countries(region)
+
+
+def iso2_codes(region: str = None) -> list[str]:
+    return get_registry().iso2_codes(region)
+
+
+def to_iso3(names: Iterable[str]) -> list:
+    return get_registry().to_iso3(names)
+
+
+def register(name: str, members: Iterable[str]) -> tuple:
+    return get_registry().register(name, members)
@@ -0,0 +1,198 @@
+# src/data/shared_store.py
+
+import getpass
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from src.data.panel import LPIPanel
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+READERS_DIR = ".readers"
+
+
+def default_root() -> str:
+    """
+    Diretório padrão do armazenamento compartilhado.
+
+    Usa a variável de ambiente LPI_SHARED_STORE, se definida; senão um diretório por
+    usuário em /dev/shm (memória compartilhada em Linux) ou, na falta dele, no diretório
+    temporário do sistema.
+    """
+    if os.environ.get("LPI_SHARED_STORE"):
+        return os.environ["LPI_SHARED_STORE"]
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    return os.path.join(base, f"eu-lpi-panel-{user}")
+
+
+def panel_version(panel: LPIPanel) -> str:
+    """Identificador de versão do painel, derivado do seu conteúdo."""
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(panel.values).tobytes())
+    digest.update(np.ascontiguousarray(panel.valid).tobytes())
+    digest.update(json.dumps(_metadata(panel), sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _metadata(panel: LPIPanel) -> dict:
+    return {
+        "countries": [str(c) for c in panel.countries],
+        "years": [int(y) for y in panel.years],
+        "indicators": list(panel.indicators)
+    }
+
+
+def publish(panel: LPIPanel, root: str = None) -> str:
+    """
+    Publica o painel como arquivos mapeáveis em memória e o torna a versão atual.
+
+    Cada versão é gravada em um diretório temporário e renomeada para `root/<versão>`;
+    em seguida o ponteiro `CURRENT` é substituído com `os.replace`, de modo que os
+    leitores veem sempre uma versão completa (troca atômica).
+
+    Args:
+        panel (LPIPanel): Painel a publicar.
+        root (str, opcional): Diretório do armazenamento (default: `default_root()`).
+
+    Returns:
+        str: Versão publicada.
+    """
+    root = root or default_root()
+    os.makedirs(root, exist_ok=True)
+    version = panel_version(panel)
+    target = os.path.join(root, version)
+
+    if not os.path.isdir(target):
+        staging = tempfile.mkdtemp(prefix=f".{version}-", dir=root)
+        np.save(os.path.join(staging, "values.npy"), np.ascontiguousarray(panel.values))
+        np.save(os.path.join(staging, "valid.npy"), np.ascontiguousarray(panel.valid))
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(_metadata(panel), f)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Outro processo publicou a mesma versão primeiro
+            shutil.rmtree(staging, ignore_errors=True)
+
+    pointer = os.path.join(root, f".{CURRENT_FILE}.{os.getpid()}")
+    with open(pointer, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(root, CURRENT_FILE))
+    logger.info(f"Painel publicado no armazenamento compartilhado: {target}")
+    return version
+
+
+def current_version(root: str = None) -> str:
+    """Versão atual publicada, ou None se nada foi publicado ainda."""
+    try:
+        with open(os.path.join(root or default_root(), CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def attach(version: str = None, root: str = None) -> LPIPanel:
+    """
+    Anexa-se a uma versão publicada, somente leitura e sem cópia.
+
+    Os arrays do painel são views de arquivos mapeados em memória (np.memmap), então
+    todos os processos compartilham as mesmas páginas físicas.
+
+    Args:
+        version (str, opcional): Versão desejada (default: a versão atual).
+        root (str, opcional): Diretório do armazenamento.
+
+    Returns:
+        LPIPanel: Painel cujos arrays são somente leitura.
+    """
+    root = root or default_root()
+    version = version or current_version(root)
+    if version is None:
+        raise FileNotFoundError(f"Nenhum painel publicado em {root}.")
+
+    path = os.path.join(root, version)
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    values = np.load(os.path.join(path, "values.npy"), mmap_mode="r")
+    valid = np.load(os.path.join(path, "valid.npy"), mmap_mode="r")
+
+    panel = LPIPanel(values, np.array(meta["countries"], dtype=object), meta["years"], meta["indicators"], valid)
+    panel.version = version
+    return panel
+
+
+def mark_reader(version: str, root: str = None) -> None:
+    """
+    Registra que este processo ainda depende de `version` (ver `prune`).
+
+    Cada processo tem um único registro, substituído a cada chamada.
+    """
+    directory = os.path.join(root or default_root(), READERS_DIR)
+    os.makedirs(directory, exist_ok=True)
+    tmp = os.path.join(directory, f".{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(directory, str(os.getpid())))
+
+
+def _reader_versions(root: str) -> set[str]:
+    """Versões registradas por processos vivos; registros de processos encerrados são removidos."""
+    directory = os.path.join(root, READERS_DIR)
+    if not os.path.isdir(directory):
+        return set()
+    versions = set()
+    for entry in os.listdir(directory):
+        if entry.startswith(".") or not entry.isdigit():
+            continue
+        path = os.path.join(directory, entry)
+        try:
+            os.kill(int(entry), 0)
+        except ProcessLookupError:
+            os.remove(path)
+            continue
+        except PermissionError:
+            pass
+        try:
+            with open(path, encoding="utf-8") as f:
+                versions.add(f.read().strip())
+        except FileNotFoundError:
+            continue
+    return versions
+
+
+def prune(root: str = None, keep: int = 2) -> list[str]:
+    """
+    Remove versões antigas, mantendo a atual e as `keep - 1` mais recentes.
+
+    Só diretórios com `meta.json` (gravados por `publish`) contam como versões; outros
+    diretórios do armazenamento nunca são removidos. Versões registradas com
+    `mark_reader` por processos vivos também são mantidas, para que cada processo ainda
+    possa compará-las com a versão nova.
+
+    Processos que ainda mapeiam uma versão removida continuam a lê-la normalmente
+    (em POSIX o arquivo só é liberado quando o último mapeamento é fechado).
+
+    Returns:
+        list[str]: Versões removidas.
+    """
+    root = root or default_root()
+    current = current_version(root)
+    versions = [
+        entry for entry in os.listdir(root)
+        if not entry.startswith(".") and os.path.isfile(os.path.join(root, entry, "meta.json"))
+    ]
+    versions.sort(key=lambda v: os.path.getmtime(os.path.join(root, v)), reverse=True)
+
+    kept = {current} | _reader_versions(root) | set([v for v in versions if v != current][:max(keep - 1, 0)])
+    removed = [v for v in versions if v not in kept]
+    for version in removed:
+        shutil.rmtree(os.path.join(root, version), ignore_errors=True)
+    return removed
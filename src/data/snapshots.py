@@ -0,0 +1,209 @@
+# src/data/snapshots.py
+
+"""
+Snapshots versionados dos dados do LPI.
+
+Cada painel ingerido é gravado como um snapshot imutável e endereçado pelo conteúdo:
+o ID é a versão do painel (`shared_store.panel_version`), de modo que o mesmo conteúdo
+gera sempre o mesmo ID, que coincide com a versão publicada no armazenamento
+compartilhado. O snapshot é colunar (um .npy por coluna do formato longo) e traz um
+meta.json com origem, data de ingestão, snapshot anterior da mesma origem e dimensões.
+
+Uso:
+    python -m src.data.snapshots list
+    python -m src.data.snapshots save [local|remote]
+    python -m src.data.snapshots diff <id antigo> <id novo>
+"""
+
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.data import shared_store
+from src.data.panel import LPIPanel, diff_panels
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+
+
+def default_root() -> str:
+    """Diretório dos snapshots: LPI_SNAPSHOTS, se definida, ou data/snapshots."""
+    return os.environ.get("LPI_SNAPSHOTS") or os.path.join("data", "snapshots")
+
+
+def save_snapshot(df: pd.DataFrame, source: str = "local", root: str = None, note: str = None) -> str:
+    """
+    Grava os dados como snapshot, se esse conteúdo ainda não foi gravado.
+
+    Args:
+        df (pd.DataFrame): Dados em formato longo (Country, Year, indicadores).
+        source (str): Origem dos dados ('local', 'remote', ...).
+        root (str, opcional): Diretório dos snapshots (default: `default_root()`).
+        note (str, opcional): Observação livre guardada nos metadados.
+
+    Returns:
+        str: ID do snapshot (novo ou já existente com o mesmo conteúdo).
+    """
+    root = root or default_root()
+    panel = LPIPanel.from_frame(df)
+    snapshot_id = shared_store.panel_version(panel)
+    target = os.path.join(root, snapshot_id)
+    if os.path.isdir(target):
+        return snapshot_id
+
+    os.makedirs(root, exist_ok=True)
+    parent = latest(root, source)
+    frame = panel.frame()
+    staging = tempfile.mkdtemp(prefix=f".{snapshot_id}-", dir=root)
+    np.save(os.path.join(staging, "Country.npy"), frame["Country"].to_numpy(dtype=str))
+    np.save(os.path.join(staging, "Year.npy"), frame["Year"].to_numpy(dtype=np.int16))
+    for i, indicator in enumerate(panel.indicators):
+        np.save(os.path.join(staging, f"{i}.npy"), frame[indicator].to_numpy(dtype=float))
+
+    meta = {
+        "id": snapshot_id,
+        "source": source,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="microseconds"),
+        "parent": parent,
+        "rows": len(frame),
+        "indicators": panel.indicators,
+        "countries": len(panel.countries),
+        "years": [int(y) for y in panel.years],
+        "note": note
+    }
+    with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    try:
+        os.rename(staging, target)
+    except OSError:
+        # Mesmo conteúdo gravado por outro processo
+        shutil.rmtree(staging, ignore_errors=True)
+    logger.info(f"Snapshot {snapshot_id} gravado ({source}, {len(frame)} linhas).")
+    return snapshot_id
+
+
+def record(panel: LPIPanel, source: str, root: str = None) -> str:
+    """
+    Grava o painel como snapshot sem interromper quem o carregou.
+
+    Returns:
+        str: ID do snapshot, ou None se não foi possível gravá-lo (ex.: disco somente leitura).
+    """
+    try:
+        return save_snapshot(panel.frame(), source=source, root=root)
+    except OSError as e:
+        logger.warning(f"Não foi possível gravar o snapshot dos dados ({source}): {e}")
+        return None
+
+
+def list_snapshots(root: str = None, source: str = None) -> pd.DataFrame:
+    """Metadados dos snapshots, do mais antigo ao mais recente (opcionalmente de uma origem)."""
+    root = root or default_root()
+    metas = []
+    if os.path.isdir(root):
+        for entry in os.listdir(root):
+            path = os.path.join(root, entry, META_FILE)
+            if entry.startswith(".") or not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as f:
+                metas.append(json.load(f))
+    columns = ["id", "source", "created_at", "parent", "rows", "countries", "years", "note"]
+    df = pd.DataFrame(metas, columns=columns)
+    if source is not None:
+        df = df[df["source"] == source]
+    return df.sort_values("created_at").reset_index(drop=True)
+
+
+def latest(root: str = None, source: str = None) -> str:
+    """ID do snapshot mais recente (de uma origem), ou None."""
+    df = list_snapshots(root, source)
+    return None if df.empty else df["id"].iloc[-1]
+
+
+def resolve(snapshot_id: str, root: str = None) -> str:
+    """Converte 'latest' ou um prefixo único no ID completo do snapshot."""
+    root = root or default_root()
+    if snapshot_id == "latest":
+        found = latest(root)
+        if found is None:
+            raise FileNotFoundError(f"Nenhum snapshot em {root}.")
+        return found
+    ids = list_snapshots(root)["id"]
+    matches = [i for i in ids if i.startswith(snapshot_id)]
+    if len(matches) != 1:
+        raise ValueError(f"Snapshot '{snapshot_id}' {'ambíguo' if matches else 'não encontrado'} em {root}.")
+    return matches[0]
+
+
+def metadata(snapshot_id: str, root: str = None) -> dict:
+    root = root or default_root()
+    with open(os.path.join(root, resolve(snapshot_id, root), META_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_snapshot(snapshot_id: str, root: str = None) -> pd.DataFrame:
+    """
+    Lê um snapshot no formato longo de `world_bank.load_lpi_data` (Country, Year, indicadores).
+
+    Args:
+        snapshot_id (str): ID, prefixo único ou 'latest'.
+        root (str, opcional): Diretório dos snapshots.
+    """
+    root = root or default_root()
+    meta = metadata(snapshot_id, root)
+    path = os.path.join(root, meta["id"])
+    df = pd.DataFrame({
+        "Country": np.load(os.path.join(path, "Country.npy")).astype(object),
+        "Year": np.load(os.path.join(path, "Year.npy")).astype(int)
+    })
+    for i, indicator in enumerate(meta["indicators"]):
+        df[indicator] = np.load(os.path.join(path, f"{i}.npy"))
+    return df
+
+
+def load_panel(snapshot_id: str, root: str = None) -> LPIPanel:
+    """Painel de um snapshot, com `version` igual ao ID."""
+    panel = LPIPanel.from_frame(load_snapshot(snapshot_id, root))
+    panel.version = shared_store.panel_version(panel)
+    return panel
+
+
+def diff(old_id: str, new_id: str, root: str = None) -> pd.DataFrame:
+    """
+    Células alteradas entre dois snapshots (ver `panel.diff_panels`).
+
+    Returns:
+        pd.DataFrame: Colunas "Country", "Year", "Indicator", "Old" e "New".
+    """
+    return diff_panels(load_panel(old_id, root), load_panel(new_id, root))
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = sys.argv[1:] or ["list"]
+    if args[0] == "list":
+        print(list_snapshots().to_string(index=False))
+    elif args[0] == "save":
+        from src.data import world_bank
+        source = args[1] if len(args) > 1 else "local"
+        print(save_snapshot(world_bank.load_lpi_data(source=source), source=source))
+    elif args[0] == "diff" and len(args) == 3:
+        changes = diff(args[1], args[2])
+        print(changes.to_string(index=False))
+        print(f"{len(changes)} células alteradas; anos afetados: {sorted(changes['Year'].unique().tolist())}")
+    else:
+        print(__doc__)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
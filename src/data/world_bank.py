@@ -1,36 +1,114 @@
 # src/data/world_bank.py
 
+import logging
 import pandas as pd
+import numpy as np
 import os
 
-def load_lpi_data(source: str = "local") -> pd.DataFrame:
+from src.data import regions
+
+logger = logging.getLogger(__name__)
+
+LOCAL_PATH = os.path.join("data", "World_Bank_LPI.csv")
+
+def load_lpi_data(source: str = "local", compact: bool = False, snapshot: str = None, region: str = None) -> pd.DataFrame:
     """
     Carrega os dados do LPI a partir de um arquivo local ou de uma fonte remota.
 
+    Cada carga remota é gravada como snapshot (ver `src.data.snapshots`), e uma versão
+    já gravada pode ser fixada pelo seu ID.
+
     Parameters:
         source (str): 'local' para carregar do CSV local, 'remote' para usar processamento externo.
+        compact (bool): Se True, retorna a representação compacta (ver `compact_frame`).
+        snapshot (str, opcional): ID (ou prefixo único, ou 'latest') de um snapshot a
+            carregar no lugar da fonte.
+        region (str, opcional): Agrupamento de `src.data.regions` (ex.: 'EU', 'OECD',
+            'World') ao qual restringir os países. Na fonte remota define as economias
+            baixadas (default: `regions.DEFAULT_REGION`); nas demais filtra as linhas.
 
     Returns:
         pd.DataFrame: DataFrame contendo os dados do LPI.
     """
+    if snapshot is not None:
+        from src.data import snapshots
+        df = regions.get_registry().filter_frame(snapshots.load_snapshot(snapshot), region)
+        return compact_frame(df) if compact else df
+
     source = source.lower()
     
     if source == "local":
-        path = os.path.join("data", "World_Bank_LPI.csv")
+        path = LOCAL_PATH
         try:
             df = pd.read_csv(path)
             if "Year" in df.columns:
                 df["Year"] = pd.to_numeric(df["Year"], errors='coerce')
-            return df
+            df = regions.get_registry().filter_frame(df, region).reset_index(drop=True)
+            return compact_frame(df) if compact else df
         except FileNotFoundError:
             raise FileNotFoundError(f"Arquivo CSV não encontrado em {path}. Verifique se ele existe.")
     
     elif source == "remote":
         try:
             from src.utils.helpers import load_remote_lpi_data
-            return load_remote_lpi_data()
+            df = load_remote_lpi_data(region or regions.DEFAULT_REGION)
         except Exception as e:
             raise RuntimeError(f"Erro ao carregar dados remotos: {e}")
+        try:
+            from src.data import snapshots
+            snapshots.save_snapshot(df, source="remote", note=f"region={region or regions.DEFAULT_REGION}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Não foi possível gravar o snapshot dos dados remotos: {e}")
+        return compact_frame(df) if compact else df
     
     else:
         raise ValueError("Fonte inválida. Use 'local' ou 'remote'.")
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte o DataFrame do LPI para uma representação compacta em memória.
+
+    "Country" passa a categórico, "Year" a int16 (Int16 anulável se houver anos
+    ausentes) e os indicadores a float32.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame retornado por `load_lpi_data`.
+
+    Returns:
+        pd.DataFrame: Novo DataFrame com os tipos compactos.
+    """
+    compact = df.copy()
+    if "Country" in compact.columns:
+        compact["Country"] = compact["Country"].astype("category")
+    if "Year" in compact.columns:
+        year = pd.to_numeric(compact["Year"], errors="coerce")
+        compact["Year"] = year.astype("Int16") if year.isna().any() else year.astype(np.int16)
+    for col in compact.columns:
+        if col not in ("Country", "Year") and pd.api.types.is_float_dtype(compact[col]):
+            compact[col] = compact[col].astype(np.float32)
+    return compact
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compara o uso de memória por coluna antes e depois de `compact_frame`.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame do LPI (representação original).
+
+    Returns:
+        pd.DataFrame: Linhas por coluna (mais "Index" e "Total") com os tipos e bytes
+        antes/depois e a redução percentual.
+    """
+    compact = compact_frame(df)
+    before = df.memory_usage(deep=True)
+    after = compact.memory_usage(deep=True)
+
+    report = pd.DataFrame({
+        "dtype_before": df.dtypes.astype(str).reindex(before.index, fill_value=""),
+        "bytes_before": before,
+        "dtype_after": compact.dtypes.astype(str).reindex(after.index, fill_value=""),
+        "bytes_after": after
+    })
+    report.loc["Total"] = ["", before.sum(), "", after.sum()]
+    report["reduction_%"] = 100 * (1 - report["bytes_after"] / report["bytes_before"])
+    return report
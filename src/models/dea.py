@@ -7,10 +7,12 @@ from sklearn.preprocessing import MinMaxScaler
 import logging
 from typing import Union
 
+from src.data.panel import PanelSlice
+
 logger = logging.getLogger(__name__)
 
 def bod_model(
-    data: pd.DataFrame, 
+    data: Union[pd.DataFrame, PanelSlice], 
     normalize_data: bool = False,
     normalize_weights: bool = False,
     alpha: float = 0.0, 
@@ -23,8 +25,9 @@ def bod_model(
 
     Parâmetros:
     -----------
-    data : pd.DataFrame
-        DataFrame com os outputs (subindicadores) de cada DMU (país).
+    data : pd.DataFrame ou PanelSlice
+        DataFrame com os outputs (subindicadores) de cada DMU (país), ou fatia de um
+        ano do `LPIPanel` (países x subindicadores).
     normalize_data : bool, opcional
         Se True, aplica a normalização MinMaxScaler aos dados (default=False).
     normalize_weights : bool, opcional
@@ -45,6 +48,52 @@ def bod_model(
         - Se `return_weights=False`: pd.Series com os scores de eficiência.
         - Se `return_weights=True`: Tupla (pd.Series com scores, pd.DataFrame com pesos).
     """
+    if isinstance(data, PanelSlice):
+        data = data.to_frame()
+
+    scores = []
+    all_weights = []
+
+    # --- Otimização para cada DMU ---
+    for _, score, weights in bod_model_iter(
+        data, normalize_data, normalize_weights, alpha, beta, linprog_method
+    ):
+        scores.append(score)
+        all_weights.append(weights)
+    
+    # --- Formatação do Resultado Final ---
+    final_scores = pd.Series(scores, index=data.index, name="BoD_Score")
+    final_weights = pd.DataFrame(all_weights, index=data.index, columns=data.columns)
+
+    if return_weights:
+        return final_scores, final_weights
+    else:
+        return final_scores
+
+
+def bod_model_iter(
+    data: Union[pd.DataFrame, PanelSlice],
+    normalize_data: bool = False,
+    normalize_weights: bool = False,
+    alpha: float = 0.0,
+    beta: float = None,
+    linprog_method: str = "highs"
+):
+    """
+    Versão incremental de `bod_model`: resolve um DMU por vez e produz os resultados à medida.
+
+    As entradas são validadas antes do primeiro resultado, de modo que erros de
+    parâmetros surgem na primeira iteração. Mesmos parâmetros de `bod_model`.
+
+    Produz:
+    -------
+    tuple[str, float, np.ndarray]
+        (DMU, score, pesos) na ordem das linhas de `data`; score e pesos são NaN se a
+        otimização falhar.
+    """
+    if isinstance(data, PanelSlice):
+        data = data.to_frame()
+
     # --- Validação de Entradas ---
     if data.isnull().values.any():
         raise ValueError("O DataFrame contém valores ausentes.")
@@ -54,19 +103,32 @@ def bod_model(
         logger.warning("O índice do DataFrame não parece conter nomes de países como strings.")
 
     # --- Pré-processamento dos Dados (Condicional) ---
+    outputs = _prepare_outputs(data, normalize_data)
+    n, m = outputs.shape
+
+    # --- Validação dos Pesos e Restrições da Programação Linear ---
+    alpha, beta = _validate_weight_bounds(m, alpha, beta, normalize_weights)
+    bounds, A_eq, b_eq = _weight_constraints(m, alpha, beta, normalize_weights)
+
+    for j in range(n):
+        score, weights, message = _solve_dmu(outputs[j], outputs, bounds, A_eq, b_eq, linprog_method)
+        if message is not None:
+            logger.warning(f"A otimização falhou para {data.index[j]}: {message}")
+        yield data.index[j], score, weights
+
+
+def _prepare_outputs(data: pd.DataFrame, normalize_data: bool) -> np.ndarray:
+    """Retorna a matriz de outputs, normalizada por MinMaxScaler se solicitado."""
     if normalize_data:
         if np.any(data.nunique() <= 1):
             logger.warning("Uma ou mais colunas possuem valores constantes; a normalização pode ser afetada.")
         scaler = MinMaxScaler()
-        outputs = scaler.fit_transform(data)
-    else:
-        outputs = data.values
+        return scaler.fit_transform(data)
+    return data.values
 
-    n, m = outputs.shape
-    scores = []
-    all_weights = []
-    
-    # --- Validação dos Pesos ---
+
+def _validate_weight_bounds(m: int, alpha: float, beta: float, normalize_weights: bool) -> tuple[float, float]:
+    """Valida os limites dos pesos e retorna (alpha, beta) efetivos."""
     if normalize_weights:
         if beta is None or beta > 1.0:
             beta = 1.0
@@ -79,35 +141,34 @@ def bod_model(
     else:
         if beta is not None and alpha >= beta:
             raise ValueError("O limite inferior (alpha) deve ser menor que o superior (beta).")
+    return alpha, beta
+
 
-    # --- Definição das Restrições da Programação Linear ---
+def _weight_constraints(m: int, alpha: float, beta: float, normalize_weights: bool):
+    """Monta os limites dos pesos e a restrição de igualdade (soma = 1) opcional."""
     bounds = [(alpha, beta) for _ in range(m)]
-    A_ub = outputs
-    b_ub = np.ones(n)
     A_eq, b_eq = (np.ones((1, m)), np.array([1])) if normalize_weights else (None, None)
+    return bounds, A_eq, b_eq
 
-    # --- Otimização para cada DMU ---
-    for j in range(n):
-        c = -outputs[j]
-
-        res = linprog(c=c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method=linprog_method)
 
-        if res.success:
-            score = -res.fun
-            weights = res.x
-        else:
-            logger.warning(f"A otimização falhou para {data.index[j]}: {res.message}")
-            score = np.nan
-            weights = np.full(m, np.nan)
-
-        scores.append(score)
-        all_weights.append(weights)
-    
-    # --- Formatação do Resultado Final ---
-    final_scores = pd.Series(scores, index=data.index, name="BoD_Score")
-    final_weights = pd.DataFrame(all_weights, index=data.index, columns=data.columns)
+def _solve_dmu(
+    target: np.ndarray,
+    A_ub: np.ndarray,
+    bounds: list,
+    A_eq,
+    b_eq,
+    linprog_method: str = "highs"
+) -> tuple[float, np.ndarray, Union[str, None]]:
+    """
+    Resolve o PL do BoD para um único DMU.
 
-    if return_weights:
-        return final_scores, final_weights
-    else:
-        return final_scores
+    Maximiza target · w sujeito a A_ub · w <= 1. Retorna (score, pesos, mensagem),
+    onde a mensagem é None em caso de sucesso e score/pesos são NaN em caso de falha.
+    """
+    res = linprog(
+        c=-target, A_ub=A_ub, b_ub=np.ones(A_ub.shape[0]),
+        A_eq=A_eq, b_eq=b_eq, bounds=bounds, method=linprog_method
+    )
+    if res.success:
+        return -res.fun, res.x, None
+    return np.nan, np.full(target.shape[0], np.nan), res.message
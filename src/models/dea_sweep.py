@@ -0,0 +1,283 @@
+# src/models/dea_sweep.py
+
+import hashlib
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.models import dea
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALPHAS = (0.0, 0.02, 0.04, 0.06, 0.08, 0.1, 0.125, 0.15)
+DEFAULT_BETAS = (0.2, 0.25, 0.35, 0.5, 0.75, 1.0, None)
+CUBE_PATH = os.path.join("results", "dea_sweep_cube.npz")
+
+# Combinações (normalize_weights, normalize_data) avaliadas, na ordem do eixo do cubo
+FLAG_COMBOS = ((False, False), (False, True), (True, False), (True, True))
+
+
+class SweepCube:
+    """
+    Cubo (ano x configuração x país) com os scores BoD para uma grade de restrições de pesos.
+
+    As configurações formam uma grade regular (flags x alpha x beta) em ordem C, de modo
+    que `scores.reshape(Y, F, A, B, C)` é uma view. beta=None é representado por np.inf
+    e ocupa a última posição do eixo beta. Combinações inviáveis ficam como NaN.
+    """
+
+    def __init__(
+        self,
+        years: np.ndarray,
+        countries: np.ndarray,
+        alphas: np.ndarray,
+        betas: np.ndarray,
+        scores: np.ndarray,
+        data_hash: str = ""
+    ):
+        self.years = np.asarray(years, dtype=np.int32)
+        self.countries = np.asarray(countries, dtype=str)
+        self.alphas = np.asarray(alphas, dtype=float)
+        self.betas = np.asarray(betas, dtype=float)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self.data_hash = data_hash
+        self._year_pos = {int(y): i for i, y in enumerate(self.years)}
+
+    @property
+    def configs(self) -> pd.DataFrame:
+        """Tabela das configurações na ordem do eixo 'config' do cubo."""
+        rows = [
+            {"normalize_weights": nw, "normalize_data": nd, "alpha": a, "beta": None if np.isinf(b) else b}
+            for (nw, nd), a, b in itertools.product(FLAG_COMBOS, self.alphas, self.betas)
+        ]
+        return pd.DataFrame(rows)
+
+    def grid(self) -> np.ndarray:
+        """View (ano, flags, alpha, beta, país) do cubo."""
+        return self.scores.reshape(
+            len(self.years), len(FLAG_COMBOS), len(self.alphas), len(self.betas), len(self.countries)
+        )
+
+    def lookup(
+        self,
+        year: int,
+        alpha: float = 0.0,
+        beta: float = None,
+        normalize_weights: bool = False,
+        normalize_data: bool = False,
+        method: str = "linear"
+    ) -> pd.Series:
+        """
+        Retorna os scores BoD de um ano para uma configuração de restrições de pesos.
+
+        Parâmetros:
+        -----------
+        year : int
+            Ano da edição do LPI.
+        alpha, beta : float
+            Limites dos pesos. beta=None corresponde ao modelo sem limite superior.
+        normalize_weights, normalize_data : bool
+            Flags de `dea.bod_model`.
+        method : str, opcional
+            'linear' para interpolação bilinear em (alpha, beta) ou 'nearest' para o
+            ponto da grade mais próximo (default='linear'). Onde algum vértice da
+            interpolação for inviável (NaN), usa-se o ponto mais próximo.
+
+        Retorna:
+        --------
+        pd.Series
+            Scores indexados pelo país (apenas países com dados no ano).
+        """
+        if int(year) not in self._year_pos:
+            raise ValueError(f"Ano {year} não encontrado no cubo.")
+        if method not in ("linear", "nearest"):
+            raise ValueError("Método inválido. Use 'linear' ou 'nearest'.")
+
+        plane = self.grid()[self._year_pos[int(year)], FLAG_COMBOS.index((normalize_weights, normalize_data))]
+
+        a0, a1, ta = _bracket(self.alphas, alpha)
+        if beta is None:
+            b0 = b1 = len(self.betas) - 1
+            tb = 0.0
+        else:
+            finite = np.flatnonzero(np.isfinite(self.betas))
+            f0, f1, tb = _bracket(self.betas[finite], beta)
+            b0, b1 = finite[f0], finite[f1]
+
+        nearest = plane[a1 if ta >= 0.5 else a0, b1 if tb >= 0.5 else b0]
+        if method == "nearest":
+            values = nearest
+        else:
+            values = (
+                (1 - ta) * (1 - tb) * plane[a0, b0] + ta * (1 - tb) * plane[a1, b0]
+                + (1 - ta) * tb * plane[a0, b1] + ta * tb * plane[a1, b1]
+            )
+            values = np.where(np.isnan(values), nearest, values)
+
+        available = self.available(year)
+        return pd.Series(values[available], index=self.countries[available], name="BoD_Score")
+
+    def available(self, year: int) -> np.ndarray:
+        """Máscara dos países com dados no ano (alguma configuração com score)."""
+        return ~np.all(np.isnan(self.scores[self._year_pos[int(year)]]), axis=0)
+
+    def save(self, path: str = CUBE_PATH) -> None:
+        """Persiste o cubo em disco (formato .npz comprimido)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            years=self.years,
+            countries=self.countries,
+            alphas=self.alphas,
+            betas=self.betas,
+            scores=self.scores,
+            data_hash=np.array(self.data_hash)
+        )
+        logger.info(f"Cubo de sensibilidade salvo em: {path}")
+
+    @classmethod
+    def load(cls, path: str = CUBE_PATH) -> "SweepCube":
+        """Carrega um cubo salvo com `save`."""
+        with np.load(path) as npz:
+            return cls(
+                npz["years"], npz["countries"], npz["alphas"], npz["betas"],
+                npz["scores"], str(npz["data_hash"])
+            )
+
+
+def _bracket(grid: np.ndarray, value: float) -> tuple[int, int, float]:
+    """Índices vizinhos na grade e peso de interpolação (valor saturado nos extremos)."""
+    value = float(np.clip(value, grid[0], grid[-1]))
+    i1 = int(np.searchsorted(grid, value))
+    if i1 == 0:
+        return 0, 0, 0.0
+    i0 = i1 - 1
+    return i0, i1, (value - grid[i0]) / (grid[i1] - grid[i0])
+
+
+def data_fingerprint(df: pd.DataFrame, outputs: list[str]) -> str:
+    """Hash do conteúdo usado no cubo, para detectar dados desatualizados."""
+    cols = ["Country", "Year"] + outputs
+    hashed = pd.util.hash_pandas_object(df[cols], index=False).values
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+
+def _sweep_year(args: tuple) -> np.ndarray:
+    """Avalia todas as configurações para um ano; retorna (config x país)."""
+    data, alphas, betas, linprog_method = args
+    n_configs = len(FLAG_COMBOS) * len(alphas) * len(betas)
+    scores = np.full((n_configs, data.shape[0]), np.nan)
+
+    for k, ((nw, nd), a, b) in enumerate(itertools.product(FLAG_COMBOS, alphas, betas)):
+        try:
+            scores[k] = dea.bod_model(
+                data,
+                normalize_data=nd,
+                normalize_weights=nw,
+                alpha=a,
+                beta=None if b is None else b,
+                linprog_method=linprog_method
+            ).values
+        except ValueError:
+            # Restrições de pesos incompatíveis: a configuração fica como NaN
+            continue
+    return scores
+
+
+def build_sweep_cube(
+    df: pd.DataFrame,
+    outputs: list[str],
+    alphas: tuple = DEFAULT_ALPHAS,
+    betas: tuple = DEFAULT_BETAS,
+    linprog_method: str = "highs",
+    max_workers: int = None
+) -> SweepCube:
+    """
+    Avalia o modelo BoD para uma grade de restrições de pesos em todos os anos.
+
+    Cada ano é processado em paralelo (ProcessPoolExecutor) para todas as combinações
+    de flags (normalize_weights, normalize_data), alphas e betas.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        Dados do LPI em formato longo, com "Country", "Year" e os outputs.
+    outputs : list[str]
+        Subindicadores usados como outputs do BoD.
+    alphas, betas : tuple
+        Grades de limites inferiores e superiores dos pesos (beta=None = sem limite).
+    linprog_method : str, opcional
+        Método para o scipy.optimize.linprog (default='highs').
+    max_workers : int, opcional
+        Número máximo de processos (default=None, escolha do executor).
+
+    Retorna:
+    --------
+    SweepCube
+        Cubo (ano x configuração x país) em float32.
+    """
+    alphas = sorted(alphas)
+    finite_betas = sorted(b for b in betas if b is not None)
+    betas = finite_betas + ([None] if None in betas else [])
+
+    df = df.dropna(subset=outputs)
+    years = np.array(sorted(df["Year"].unique()), dtype=np.int32)
+    countries = np.array(sorted(df["Country"].unique()), dtype=str)
+    country_pos = {c: i for i, c in enumerate(countries)}
+
+    tasks = []
+    positions = []
+    for year in years:
+        df_year = df[df["Year"] == year]
+        tasks.append((df_year.set_index("Country")[outputs], alphas, betas, linprog_method))
+        positions.append(df_year["Country"].map(country_pos).values)
+
+    n_configs = len(FLAG_COMBOS) * len(alphas) * len(betas)
+    scores = np.full((len(years), n_configs, len(countries)), np.nan, dtype=np.float32)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for i, year_scores in enumerate(executor.map(_sweep_year, tasks)):
+            scores[i][:, positions[i]] = year_scores
+
+    betas_arr = np.array([np.inf if b is None else b for b in betas], dtype=float)
+    return SweepCube(years, countries, alphas, betas_arr, scores, data_fingerprint(df, outputs))
+
+
+def load_or_build(
+    df: pd.DataFrame,
+    outputs: list[str],
+    path: str = CUBE_PATH,
+    **kwargs
+) -> SweepCube:
+    """
+    Carrega o cubo do disco se ele corresponder aos dados atuais; caso contrário,
+    reconstrói e persiste um novo.
+    """
+    if os.path.exists(path):
+        cube = SweepCube.load(path)
+        if cube.data_hash == data_fingerprint(df.dropna(subset=outputs), outputs):
+            return cube
+        logger.info("Cubo de sensibilidade desatualizado; reconstruindo.")
+    cube = build_sweep_cube(df, outputs, **kwargs)
+    cube.save(path)
+    return cube
+
+
+def main():
+    """Constrói e persiste o cubo de sensibilidade para os dados locais do LPI."""
+    from src.data import world_bank
+    from src.utils.helpers import SUBINDICATORS
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.getLogger(dea.__name__).setLevel(logging.ERROR)
+
+    df = world_bank.load_lpi_data()
+    cube = load_or_build(df, SUBINDICATORS)
+    logger.info(f"Cubo pronto: {cube.scores.shape} (ano x configuração x país)")
+
+
+if __name__ == "__main__":
+    main()
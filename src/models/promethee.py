@@ -0,0 +1,152 @@
+# src/models/promethee.py
+
+from typing import Union
+
+import pandas as pd
+import numpy as np
+
+from src.data.panel import PanelSlice
+from src.models.topsis import _normalizar_pesos
+
+PREFERENCE_FUNCTIONS = ("usual", "u-shape", "v-shape", "level", "linear", "gaussian")
+
+# Número de arrays (chunk x n x critérios) de float64 vivos ao mesmo tempo no cálculo
+_ARRAYS_POR_CHUNK = 3
+
+
+def promethee(
+    df: Union[pd.DataFrame, PanelSlice],
+    criterios: list[str],
+    pesos: list[float],
+    preferencia: Union[str, list[str]] = "usual",
+    q: Union[float, list[float]] = None,
+    p: Union[float, list[float]] = None,
+    s: Union[float, list[float]] = None,
+    memoria_mb: float = 64.0
+) -> pd.DataFrame:
+    """
+    Aplica o método PROMETHEE II para ranquear alternativas com base em critérios de benefício.
+
+    O tensor de preferências par a par (n x n x critérios) é calculado por broadcasting
+    do NumPy em blocos de linhas, dimensionados para caber no orçamento de memória.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame ou PanelSlice
+        DataFrame contendo pelo menos uma coluna "Country" e as colunas dos critérios,
+        ou fatia de um ano do `LPIPanel` contendo os critérios.
+    criterios : list[str]
+        Lista com os nomes das colunas que serão usados como critérios.
+    pesos : list[float]
+        Pesos relativos a cada critério (serão normalizados automaticamente).
+    preferencia : str ou list[str], opcional
+        Função de preferência, única ou por critério: 'usual', 'u-shape', 'v-shape',
+        'level', 'linear' ou 'gaussian' (default='usual').
+    q, p, s : float ou list[float], opcional
+        Limiares de indiferença (q), de preferência estrita (p) e parâmetro gaussiano (s),
+        únicos ou por critério. Por padrão, q = 0.25·σ, p = σ e s = σ, onde σ é o
+        desvio-padrão do critério.
+    memoria_mb : float, opcional
+        Orçamento de memória, em MB, para os blocos do tensor de preferências (default=64).
+
+    Retorna:
+    --------
+    pd.DataFrame
+        DataFrame com colunas: "Country", "Phi+", "Phi-", "PROMETHEE Net Flow" e
+        "Ranking", ordenado pelo ranking.
+    """
+    if isinstance(df, PanelSlice):
+        matriz = df.values[:, [df.indicators.index(c) for c in criterios]]
+        paises = df.countries
+    else:
+        if "Country" not in df.columns:
+            raise ValueError("O DataFrame deve conter uma coluna chamada 'Country'.")
+        matriz = df[criterios].astype(float).values
+        paises = df["Country"].values
+
+    if len(criterios) != len(pesos):
+        raise ValueError("O número de critérios deve ser igual ao número de pesos.")
+
+    if np.isnan(matriz).any():
+        raise ValueError("Há valores ausentes nos critérios fornecidos.")
+
+    n, m = matriz.shape
+    if n < 2:
+        raise ValueError("São necessárias pelo menos duas alternativas.")
+
+    pesos_norm = _normalizar_pesos(pesos)
+
+    sigma = matriz.std(axis=0)
+    tipos = _por_criterio(preferencia, m, "preferencia")
+    q_arr = np.asarray(_por_criterio(0.25 * sigma if q is None else q, m, "q"), dtype=float)
+    p_arr = np.asarray(_por_criterio(sigma if p is None else p, m, "p"), dtype=float)
+    s_arr = np.asarray(_por_criterio(sigma if s is None else s, m, "s"), dtype=float)
+
+    invalidos = set(tipos) - set(PREFERENCE_FUNCTIONS)
+    if invalidos:
+        raise ValueError(f"Funções de preferência inválidas: {sorted(invalidos)}. Use {PREFERENCE_FUNCTIONS}.")
+    for k, tipo in enumerate(tipos):
+        if tipo in ("level", "linear") and not q_arr[k] < p_arr[k]:
+            raise ValueError(f"O critério '{criterios[k]}' exige q < p para a função '{tipo}'.")
+
+    # Agrupa critérios pela função de preferência para aplicar cada uma de forma vetorizada
+    grupos = {tipo: np.flatnonzero(np.array(tipos) == tipo) for tipo in set(tipos)}
+
+    # Tamanho do bloco: linhas do tensor (bloco x n x m) que cabem no orçamento
+    bytes_por_linha = n * m * 8 * _ARRAYS_POR_CHUNK
+    tamanho_bloco = int(max(1, min(n, memoria_mb * 1024 ** 2 // bytes_por_linha)))
+
+    fluxo_saida = np.zeros(n)
+    fluxo_entrada = np.zeros(n)
+    for inicio in range(0, n, tamanho_bloco):
+        fim = min(n, inicio + tamanho_bloco)
+
+        # Diferenças d(a, b) = g(a) - g(b) para as alternativas a do bloco
+        diferencas = matriz[inicio:fim, None, :] - matriz[None, :, :]
+        preferencias = np.empty_like(diferencas)
+        for tipo, idx in grupos.items():
+            preferencias[..., idx] = _preferencia(tipo, diferencas[..., idx], q_arr[idx], p_arr[idx], s_arr[idx])
+
+        # Índice de preferência agregado pi(a, b)
+        pi = preferencias @ pesos_norm
+        fluxo_saida[inicio:fim] = pi.sum(axis=1)
+        fluxo_entrada += pi.sum(axis=0)
+
+    phi_mais = fluxo_saida / (n - 1)
+    phi_menos = fluxo_entrada / (n - 1)
+
+    resultado = pd.DataFrame({"Country": paises})
+    resultado["Phi+"] = phi_mais
+    resultado["Phi-"] = phi_menos
+    resultado["PROMETHEE Net Flow"] = phi_mais - phi_menos
+    resultado["Ranking"] = resultado["PROMETHEE Net Flow"].rank(ascending=False, method="min").astype(int)
+
+    return resultado.sort_values("Ranking").reset_index(drop=True)
+
+
+def _por_criterio(valor, m: int, nome: str) -> list:
+    """Expande um parâmetro escalar para uma lista por critério, validando o tamanho."""
+    if isinstance(valor, str) or np.ndim(valor) == 0:
+        return [valor] * m
+    valor = list(valor)
+    if len(valor) != m:
+        raise ValueError(f"O parâmetro '{nome}' deve ter um valor por critério ({m}).")
+    return valor
+
+
+def _preferencia(tipo: str, d: np.ndarray, q: np.ndarray, p: np.ndarray, s: np.ndarray) -> np.ndarray:
+    """Aplica a função de preferência generalizada às diferenças d (critérios no último eixo)."""
+    if tipo == "usual":
+        return (d > 0).astype(float)
+    if tipo == "u-shape":
+        return (d > q).astype(float)
+    if tipo == "v-shape":
+        p_seguro = np.where(p > 0, p, 1.0)
+        return np.where(p > 0, np.clip(d / p_seguro, 0.0, 1.0), (d > 0).astype(float))
+    if tipo == "level":
+        return np.where(d > p, 1.0, np.where(d > q, 0.5, 0.0))
+    if tipo == "linear":
+        return np.clip((d - q) / (p - q), 0.0, 1.0)
+    # gaussian
+    s_seguro = np.where(s > 0, s, 1.0)
+    return np.where(d > 0, -np.expm1(-d ** 2 / (2 * s_seguro ** 2)), 0.0)
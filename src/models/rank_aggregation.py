@@ -0,0 +1,226 @@
+# src/models/rank_aggregation.py
+
+import numpy as np
+import pandas as pd
+
+AGGREGATION_METHODS = ("borda", "copeland", "kemeny")
+
+
+def _preferencias(ranks: np.ndarray) -> np.ndarray:
+    """
+    Matriz de preferências par a par W[..., i, j] = nº de métodos que colocam i à frente de j.
+
+    ranks tem formato (..., métodos, itens); NaN indica item ausente e não gera preferências.
+    """
+    ri = ranks[..., :, :, None]
+    rj = ranks[..., :, None, :]
+    return (ri < rj).sum(axis=-3).astype(float)
+
+
+def _ordenar(scores: np.ndarray, validos: np.ndarray) -> np.ndarray:
+    """Converte scores (maior = melhor) em ranks 1..n (empates pelo mínimo), NaN para ausentes."""
+    scores = np.where(validos, scores, -np.inf)
+    # rank pelo mínimo: 1 + nº de itens válidos com score estritamente maior
+    maiores = (scores[..., None, :] > scores[..., :, None]) & validos[..., None, :]
+    return np.where(validos, 1.0 + maiores.sum(axis=-1), np.nan)
+
+
+def borda(ranks: np.ndarray) -> np.ndarray:
+    """
+    Agregação de Borda, vetorizada sobre todos os eixos iniciais (ex.: anos).
+
+    Parâmetros:
+    -----------
+    ranks : np.ndarray
+        Ranks com formato (..., métodos, itens); NaN indica item ausente.
+
+    Retorna:
+    --------
+    np.ndarray
+        Ranks de consenso com formato (..., itens), NaN para itens ausentes.
+    """
+    ranks = np.asarray(ranks, dtype=float)
+    validos = ~np.isnan(ranks).any(axis=-2)
+    n_validos = validos.sum(axis=-1, keepdims=True)[..., None]
+    pontos = np.nansum(n_validos - ranks, axis=-2)
+    return _ordenar(pontos, validos)
+
+
+def copeland(ranks: np.ndarray) -> np.ndarray:
+    """
+    Agregação de Copeland (vitórias menos derrotas nas maiorias par a par), vetorizada.
+
+    Mesmos formatos de entrada e saída de `borda`.
+    """
+    ranks = np.asarray(ranks, dtype=float)
+    validos = ~np.isnan(ranks).any(axis=-2)
+    # Só confrontos entre itens válidos contam (como em `kemeny`)
+    w = _preferencias(ranks) * (validos[..., :, None] & validos[..., None, :])
+    maioria = np.sign(w - np.swapaxes(w, -1, -2))
+    return _ordenar(maioria.sum(axis=-1), validos)
+
+
+def kemeny_cost(ordem: np.ndarray, w: np.ndarray) -> float:
+    """Custo de Kemeny de uma ordem: nº de discordâncias par a par com os métodos."""
+    wp = w[np.ix_(ordem, ordem)]
+    return float(np.tril(wp, -1).sum())
+
+
+def _kemeny_exato(w: np.ndarray) -> np.ndarray:
+    """Ordem Kemeny-ótima por programação dinâmica sobre subconjuntos (O(2^n · n))."""
+    n = w.shape[0]
+    total = 1 << n
+    # custo_add[mask, x] = custo de colocar x depois de todos os itens de mask
+    custo_add = np.zeros((total, n))
+    for mask in range(1, total):
+        menor = mask & -mask
+        custo_add[mask] = custo_add[mask ^ menor] + w[:, menor.bit_length() - 1]
+
+    melhor = np.full(total, np.inf)
+    melhor[0] = 0.0
+    escolha = np.zeros(total, dtype=int)
+    bits = 1 << np.arange(n)
+    for mask in range(total):
+        livres = np.flatnonzero((mask & bits) == 0)
+        if livres.size == 0:
+            continue
+        candidatos = melhor[mask] + custo_add[mask, livres]
+        destinos = mask | bits[livres]
+        melhora = candidatos < melhor[destinos]
+        melhor[destinos[melhora]] = candidatos[melhora]
+        escolha[destinos[melhora]] = livres[melhora]
+
+    ordem = []
+    mask = total - 1
+    while mask:
+        x = escolha[mask]
+        ordem.append(x)
+        mask ^= 1 << x
+    return np.array(ordem[::-1])
+
+
+def _kemeny_busca_local(w: np.ndarray, inicial: np.ndarray, max_iter: int) -> np.ndarray:
+    """
+    Heurística de busca local por movimentos de inserção, com parada antecipada.
+
+    Em cada iteração avalia, de forma vetorizada, o ganho de mover cada item para
+    cada posição e aplica o melhor movimento; para quando nenhum movimento melhora.
+    """
+    ordem = inicial.copy()
+    d = w - w.T  # d[x, y] > 0: mais métodos colocam x à frente de y
+    for _ in range(max_iter):
+        dp = d[np.ix_(ordem, ordem)]
+        # Mover o item da posição a para b > a: passa à frente dele os itens a+1..b
+        frente = np.cumsum(np.triu(dp, 1), axis=1)
+        # Mover para b < a: passa a ficar à frente dos itens b..a-1
+        acum = np.cumsum(np.tril(dp, -1)[:, ::-1], axis=1)[:, ::-1]
+        delta = np.where(np.triu(np.ones_like(dp, dtype=bool), 1), frente, -acum)
+        np.fill_diagonal(delta, 0.0)
+
+        a, b = np.unravel_index(np.argmin(delta), delta.shape)
+        if delta[a, b] >= 0:
+            break
+        item = ordem[a]
+        ordem = np.insert(np.delete(ordem, a), b, item)
+    return ordem
+
+
+def kemeny(ranks: np.ndarray, max_exato: int = 12, max_iter: int = 1000) -> np.ndarray:
+    """
+    Agregação de Kemeny: ordem que minimiza as discordâncias par a par com os métodos.
+
+    Usa programação dinâmica exata quando há até `max_exato` itens e, acima disso, uma
+    busca local por inserções iniciada na ordem de Borda, com parada antecipada.
+
+    Parâmetros:
+    -----------
+    ranks : np.ndarray
+        Ranks com formato (..., métodos, itens); NaN indica item ausente.
+    max_exato : int, opcional
+        Maior número de itens resolvido de forma exata (default=12).
+    max_iter : int, opcional
+        Número máximo de movimentos da busca local (default=1000).
+
+    Retorna:
+    --------
+    np.ndarray
+        Posições de consenso 1..n com formato (..., itens), NaN para itens ausentes.
+    """
+    ranks = np.asarray(ranks, dtype=float)
+    lotes = ranks.reshape((-1,) + ranks.shape[-2:])
+    pesos = _preferencias(lotes)
+    inicial = borda(lotes)
+    saida = np.full(lotes.shape[0:1] + lotes.shape[-1:], np.nan)
+
+    for t in range(lotes.shape[0]):
+        validos = np.flatnonzero(~np.isnan(lotes[t]).any(axis=0))
+        if validos.size == 0:
+            continue
+        w = pesos[t][np.ix_(validos, validos)]
+        if validos.size <= max_exato:
+            ordem = _kemeny_exato(w)
+        else:
+            ordem = _kemeny_busca_local(w, np.argsort(inicial[t, validos], kind="stable"), max_iter)
+        posicoes = np.empty(validos.size)
+        posicoes[ordem] = np.arange(1, validos.size + 1)
+        saida[t, validos] = posicoes
+
+    return saida.reshape(ranks.shape[:-2] + ranks.shape[-1:])
+
+
+def consensus_rankings(
+    df: pd.DataFrame,
+    rank_cols: list[str],
+    metodos: tuple = AGGREGATION_METHODS,
+    group_col: str = "Year",
+    **kemeny_kwargs
+) -> pd.DataFrame:
+    """
+    Calcula rankings de consenso para todos os grupos (anos) de uma vez.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        DataFrame em formato longo com "Country", a coluna de grupo (se existir) e os ranks.
+    rank_cols : list[str]
+        Colunas com os ranks a agregar (ex.: "WB Rank", "DEA Rank", "TOPSIS Rank").
+    metodos : tuple, opcional
+        Subconjunto de 'borda', 'copeland' e 'kemeny' (default=todos).
+    group_col : str, opcional
+        Coluna de agrupamento; se ausente, o DataFrame é tratado como um único grupo.
+    **kemeny_kwargs :
+        Parâmetros repassados a `kemeny` (max_exato, max_iter).
+
+    Retorna:
+    --------
+    pd.DataFrame
+        Cópia de `df` com as colunas "Borda Rank", "Copeland Rank" e/ou "Kemeny Rank",
+        do tipo inteiro anulável Int64: países com algum rank ausente ficam sem posição
+        de consenso (<NA>) e não contam na agregação do grupo.
+    """
+    invalidos = set(metodos) - set(AGGREGATION_METHODS)
+    if invalidos:
+        raise ValueError(f"Métodos de agregação inválidos: {sorted(invalidos)}.")
+    faltantes = [col for col in ["Country"] + list(rank_cols) if col not in df.columns]
+    if faltantes:
+        raise ValueError(f"Colunas ausentes no DataFrame: {faltantes}")
+
+    chave = [group_col, "Country"] if group_col in df.columns else ["Country"]
+    duplicados = df.duplicated(chave)
+    if duplicados.any():
+        raise ValueError(f"Linhas duplicadas por {chave}: {df.loc[duplicados, chave].values.tolist()}")
+
+    resultado = df.copy()
+    grupos = resultado[group_col] if group_col in resultado.columns else pd.Series(0, index=resultado.index)
+    codigos_grupo, _ = pd.factorize(grupos, sort=True)
+    codigos_pais, paises = pd.factorize(resultado["Country"], sort=True)
+
+    # Cubo (grupo x método x país) com NaN para países ausentes no grupo
+    cubo = np.full((codigos_grupo.max() + 1, len(rank_cols), len(paises)), np.nan)
+    cubo[codigos_grupo, :, codigos_pais] = resultado[rank_cols].to_numpy(dtype=float)
+
+    funcoes = {"borda": borda, "copeland": copeland, "kemeny": lambda r: kemeny(r, **kemeny_kwargs)}
+    for metodo in metodos:
+        consenso = funcoes[metodo](cubo)
+        resultado[f"{metodo.capitalize()} Rank"] = pd.array(consenso[codigos_grupo, codigos_pais], dtype="Int64")
+    return resultado
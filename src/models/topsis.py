@@ -1,16 +1,21 @@
 # src/models/topsis.py
 
+from typing import Union
+
 import pandas as pd
 import numpy as np
 
-def topsis(df: pd.DataFrame, criterios: list[str], pesos: list[float]) -> pd.DataFrame:
+from src.data.panel import LPIPanel, PanelSlice
+
+def topsis(df: Union[pd.DataFrame, PanelSlice], criterios: list[str], pesos: list[float]) -> pd.DataFrame:
     """
     Aplica o método TOPSIS para ranquear alternativas com base em critérios de benefício.
 
     Parâmetros:
     -----------
-    df : pd.DataFrame
-        DataFrame contendo pelo menos uma coluna "Country" e as colunas dos critérios.
+    df : pd.DataFrame ou PanelSlice
+        DataFrame contendo pelo menos uma coluna "Country" e as colunas dos critérios,
+        ou fatia de um ano do `LPIPanel` contendo os critérios.
     criterios : list[str]
         Lista com os nomes das colunas que serão usados como critérios.
     pesos : list[float]
@@ -21,8 +26,15 @@ def topsis(df: pd.DataFrame, criterios: list[str], pesos: list[float]) -> pd.Dat
     pd.DataFrame
         DataFrame com colunas: "Country", "TOPSIS Score" e "Ranking", ordenado pelo ranking.
     """
-    if "Country" not in df.columns:
-        raise ValueError("O DataFrame deve conter uma coluna chamada 'Country'.")
+    if isinstance(df, PanelSlice):
+        posicoes = [df.indicators.index(c) for c in criterios]
+        matriz_decisao = df.values[:, posicoes]
+        paises = df.countries
+    else:
+        if "Country" not in df.columns:
+            raise ValueError("O DataFrame deve conter uma coluna chamada 'Country'.")
+        matriz_decisao = df[criterios].astype(float).values
+        paises = df["Country"].values
 
     if len(criterios) != len(pesos):
         raise ValueError("O número de critérios deve ser igual ao número de pesos.")
@@ -30,24 +42,61 @@ def topsis(df: pd.DataFrame, criterios: list[str], pesos: list[float]) -> pd.Dat
     if any(p < 0 for p in pesos):
         raise ValueError("Os pesos não podem conter valores negativos.")
 
-    if df[criterios].isnull().values.any():
-        raise ValueError("Há valores ausentes nos critérios fornecidos.")
-
     # Etapa 1: Matriz de decisão (alternativas x critérios)
-    matriz_decisao = df[criterios].astype(float).values
+    if np.isnan(matriz_decisao).any():
+        raise ValueError("Há valores ausentes nos critérios fornecidos.")
 
     # Etapa 2: Normalização da matriz pelo método Euclidiano (norma L2)
+    matriz_normalizada = _normalizar_matriz(matriz_decisao)
+
+    # Etapa 3: Normalização dos pesos
+    pesos_norm = _normalizar_pesos(pesos)
+
+    # Etapas 4 a 7: Matriz ponderada, soluções ideal/anti-ideal, distâncias e score
+    scores = topsis_scores(matriz_normalizada, pesos_norm)
+
+    # Construção do DataFrame resultado com ranking coerente
+    resultado = pd.DataFrame({"Country": paises})
+    resultado["TOPSIS Score"] = scores
+    resultado["Ranking"] = resultado["TOPSIS Score"].rank(ascending=False, method="min").astype(int)
+
+    return resultado.sort_values("Ranking").reset_index(drop=True)
+
+
+def _normalizar_matriz(matriz_decisao: np.ndarray) -> np.ndarray:
+    """Normaliza cada critério pela norma L2 (Euclidiana) da coluna."""
     norm_fatores = np.linalg.norm(matriz_decisao, axis=0)
     norm_fatores = np.where(norm_fatores == 0, 1, norm_fatores)  # evitar divisão por zero
-    matriz_normalizada = matriz_decisao / norm_fatores
+    return matriz_decisao / norm_fatores
 
-    # Etapa 3: Normalização dos pesos
-    pesos_arr = np.array(pesos, dtype=float)
+
+def _normalizar_pesos(pesos) -> np.ndarray:
+    """Valida e normaliza os pesos para somarem 1."""
+    pesos_arr = np.asarray(pesos, dtype=float)
+    if np.any(pesos_arr < 0):
+        raise ValueError("Os pesos não podem conter valores negativos.")
     soma_pesos = pesos_arr.sum()
     if soma_pesos == 0:
         raise ValueError("A soma dos pesos não pode ser zero.")
-    pesos_norm = pesos_arr / soma_pesos
+    return pesos_arr / soma_pesos
 
+
+def topsis_scores(matriz_normalizada: np.ndarray, pesos_norm: np.ndarray) -> np.ndarray:
+    """
+    Calcula os scores TOPSIS a partir da matriz já normalizada e dos pesos normalizados.
+
+    Parâmetros:
+    -----------
+    matriz_normalizada : np.ndarray
+        Matriz (alternativas x critérios) normalizada pela norma L2.
+    pesos_norm : np.ndarray
+        Pesos dos critérios, somando 1.
+
+    Retorna:
+    --------
+    np.ndarray
+        Score TOPSIS (proximidade relativa ao ideal) de cada alternativa.
+    """
     # Etapa 4: Construção da matriz ponderada
     matriz_ponderada = matriz_normalizada * pesos_norm
 
@@ -60,11 +109,92 @@ def topsis(df: pd.DataFrame, criterios: list[str], pesos: list[float]) -> pd.Dat
     dist_anti_ideal = np.linalg.norm(matriz_ponderada - anti_ideal, axis=1)
 
     # Etapa 7: Cálculo do score TOPSIS
-    scores = dist_anti_ideal / (dist_ideal + dist_anti_ideal)
+    return dist_anti_ideal / (dist_ideal + dist_anti_ideal)
 
-    # Construção do DataFrame resultado com ranking coerente
-    resultado = df[["Country"]].copy()
-    resultado["TOPSIS Score"] = scores
-    resultado["Ranking"] = resultado["TOPSIS Score"].rank(ascending=False, method="min").astype(int)
 
-    return resultado.sort_values("Ranking").reset_index(drop=True)
+class TopsisIncremental:
+    """
+    Avaliador TOPSIS com estado para re-ponderação interativa.
+
+    A matriz de decisão normalizada (norma L2) de cada ano é calculada uma única vez.
+    Uma mudança de pesos custa apenas a multiplicação por broadcast, a extração do
+    ideal/anti-ideal e as distâncias, sem alocações de pandas no caminho crítico.
+
+    Construa-o com `from_frame` (DataFrame em formato longo) ou `from_panel` (`LPIPanel`).
+
+    Parâmetros:
+    -----------
+    criterios : list[str]
+        Lista com os nomes dos critérios.
+    anos : dict[int, tuple[np.ndarray, np.ndarray]]
+        Para cada ano, os países e a matriz de decisão (países x critérios) sem ausentes.
+    """
+
+    def __init__(self, criterios: list[str], anos: dict):
+        self.criterios = list(criterios)
+        self._paises = {}
+        self._matrizes = {}
+        for ano, (paises, valores) in anos.items():
+            ano = int(ano)
+            self._paises[ano] = np.asarray(paises)
+            self._matrizes[ano] = np.ascontiguousarray(_normalizar_matriz(np.asarray(valores, dtype=float)))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, criterios: list[str]) -> "TopsisIncremental":
+        """
+        Constrói o avaliador a partir de um DataFrame em formato longo.
+
+        Parâmetros:
+        -----------
+        df : pd.DataFrame
+            DataFrame com as colunas "Country", "Year" e os critérios; linhas com algum
+            critério ausente são descartadas.
+        criterios : list[str]
+            Lista com os nomes das colunas que serão usados como critérios.
+        """
+        if "Country" not in df.columns or "Year" not in df.columns:
+            raise ValueError("O DataFrame deve conter as colunas 'Country' e 'Year'.")
+        df = df.dropna(subset=list(criterios))
+        return cls(criterios, {
+            ano: (df_ano["Country"].to_numpy(), df_ano[list(criterios)].values)
+            for ano, df_ano in df.groupby("Year")
+        })
+
+    @classmethod
+    def from_panel(cls, panel: LPIPanel, criterios: list[str]) -> "TopsisIncremental":
+        """Constrói o avaliador a partir das fatias anuais de um `LPIPanel` (anos com dados completos)."""
+        fatias = {ano: panel.slice_year(ano, criterios) for ano in panel.available_years(criterios)}
+        return cls(criterios, {ano: (fatia.countries, fatia.values) for ano, fatia in fatias.items()})
+
+    @property
+    def anos(self) -> list[int]:
+        """Anos com dados completos para os critérios."""
+        return sorted(self._matrizes)
+
+    def paises(self, ano: int) -> np.ndarray:
+        """Países avaliados no ano, na ordem dos scores."""
+        return self._paises[int(ano)]
+
+    def scores(self, ano: int, pesos) -> np.ndarray:
+        """
+        Scores TOPSIS do ano para os pesos informados (normalizados automaticamente).
+
+        Retorna um np.ndarray alinhado com `paises(ano)`.
+        """
+        ano = int(ano)
+        if ano not in self._matrizes:
+            raise ValueError(f"Ano {ano} sem dados completos para os critérios.")
+        if len(pesos) != len(self.criterios):
+            raise ValueError("O número de critérios deve ser igual ao número de pesos.")
+        return topsis_scores(self._matrizes[ano], _normalizar_pesos(pesos))
+
+    def ranking(self, ano: int, pesos) -> pd.DataFrame:
+        """Resultado no mesmo formato de `topsis`: "Country", "TOPSIS Score" e "Ranking"."""
+        scores = self.scores(ano, pesos)
+        ordem = np.argsort(-scores, kind="stable")
+        resultado = pd.DataFrame({
+            "Country": self._paises[int(ano)][ordem],
+            "TOPSIS Score": scores[ordem]
+        })
+        resultado["Ranking"] = resultado["TOPSIS Score"].rank(ascending=False, method="min").astype(int)
+        return resultado
@@ -0,0 +1,126 @@
+# src/models/weighting.py
+
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.panel import LPIPanel
+
+WEIGHTING_METHODS = ("entropy", "critic", "std")
+
+
+def _normalizar_min_max(matriz: np.ndarray) -> np.ndarray:
+    """Normalização min-max de cada critério ao longo do eixo das alternativas (-2), ignorando NaN."""
+    minimo = np.nanmin(matriz, axis=-2, keepdims=True)
+    amplitude = np.nanmax(matriz, axis=-2, keepdims=True) - minimo
+    return (matriz - minimo) / np.where(amplitude > 0, amplitude, 1.0)
+
+
+def _normalizar(valores: np.ndarray) -> np.ndarray:
+    """Divide pelo total do último eixo; grupos sem informação recebem pesos iguais."""
+    total = valores.sum(axis=-1, keepdims=True)
+    iguais = np.full_like(valores, 1.0 / valores.shape[-1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, valores / total, iguais)
+
+
+def entropy_weights(matriz: np.ndarray) -> np.ndarray:
+    """
+    Pesos pela entropia de Shannon: critérios com maior dispersão relativa pesam mais.
+
+    Parâmetros:
+    -----------
+    matriz : np.ndarray
+        Valores (positivos) com formato (..., alternativas, critérios); linhas com NaN
+        são tratadas como alternativas ausentes.
+
+    Retorna:
+    --------
+    np.ndarray
+        Pesos com formato (..., critérios), somando 1.
+    """
+    matriz = np.asarray(matriz, dtype=float)
+    n = (~np.isnan(matriz)).sum(axis=-2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = matriz / np.nansum(matriz, axis=-2, keepdims=True)
+        termos = np.where(p > 0, p * np.log(p), 0.0)
+        entropia = -np.nansum(termos, axis=-2) / np.log(np.where(n > 1, n, 2))
+    return _normalizar(np.clip(1.0 - entropia, 0.0, None))
+
+
+def std_weights(matriz: np.ndarray) -> np.ndarray:
+    """
+    Pesos proporcionais ao desvio-padrão de cada critério após normalização min-max.
+
+    Mesmos formatos de entrada e saída de `entropy_weights`.
+    """
+    normalizada = _normalizar_min_max(np.asarray(matriz, dtype=float))
+    return _normalizar(np.nan_to_num(np.nanstd(normalizada, axis=-2)))
+
+
+def critic_weights(matriz: np.ndarray) -> np.ndarray:
+    """
+    Pesos CRITIC (Diakoulaki et al., 1995): C_j = σ_j · Σ_k (1 - r_jk), normalizados.
+
+    Combina o contraste de cada critério (desvio-padrão após normalização min-max) com
+    o seu conflito com os demais (correlações de Pearson). As matrizes de correlação de
+    todos os grupos são calculadas em lote.
+
+    Mesmos formatos de entrada e saída de `entropy_weights`.
+    """
+    normalizada = _normalizar_min_max(np.asarray(matriz, dtype=float))
+    presente = ~np.isnan(normalizada)
+    n = presente.sum(axis=-2, keepdims=True)
+    centrada = np.where(presente, normalizada - np.nanmean(normalizada, axis=-2, keepdims=True), 0.0)
+    sigma = np.sqrt((centrada ** 2).sum(axis=-2) / np.maximum(n[..., 0, :], 1))
+
+    covariancia = np.einsum("...ij,...ik->...jk", centrada, centrada) / np.maximum(n, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlacao = covariancia / (sigma[..., :, None] * sigma[..., None, :])
+    correlacao = np.nan_to_num(correlacao)
+    conflito = (1.0 - correlacao).sum(axis=-1)
+    return _normalizar(sigma * conflito)
+
+
+_FUNCOES = {"entropy": entropy_weights, "critic": critic_weights, "std": std_weights}
+
+
+def objective_weights(
+    dados: Union[LPIPanel, pd.DataFrame],
+    criterios: list[str],
+    metodo: str = "entropy"
+) -> pd.DataFrame:
+    """
+    Pesos objetivos dos critérios para todos os anos, numa única passada vetorizada.
+
+    Cada ano usa apenas os países com todos os critérios informados (as mesmas
+    alternativas avaliadas por `topsis`); o cubo (ano x país x critério) é processado de
+    uma vez pelas funções de ponderação.
+
+    Parâmetros:
+    -----------
+    dados : LPIPanel ou pd.DataFrame
+        Painel ou dados em formato longo com "Country", "Year" e os critérios.
+    criterios : list[str]
+        Critérios a ponderar.
+    metodo : str, opcional
+        'entropy' (entropia de Shannon), 'critic' ou 'std' (desvio-padrão) (default='entropy').
+
+    Retorna:
+    --------
+    pd.DataFrame
+        Pesos por ano (índice "Year") e critério (colunas), somando 1 em cada linha;
+        apenas anos com pelo menos duas alternativas completas.
+    """
+    if metodo not in WEIGHTING_METHODS:
+        raise ValueError(f"Método de ponderação inválido: '{metodo}'. Use {WEIGHTING_METHODS}.")
+
+    panel = dados if isinstance(dados, LPIPanel) else LPIPanel.from_frame(dados, criterios)
+    cubo = panel.values[:, :, [panel._indicator_pos(c) for c in criterios]]
+    completos = ~np.isnan(cubo).any(axis=2)
+    cubo = np.where(completos[:, :, None], cubo, np.nan).swapaxes(0, 1)  # (ano, país, critério)
+
+    anos = completos.sum(axis=0) >= 2
+    pesos = _FUNCOES[metodo](cubo[anos])
+    return pd.DataFrame(pesos, index=pd.Index(panel.years[anos], name="Year"), columns=list(criterios))
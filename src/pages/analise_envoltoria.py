@@ -1,25 +1,61 @@
 # src/pages/analise_envoltoria.py
 
+import os
+import uuid
 import streamlit as st
 import pandas as pd
-from src.data import world_bank
-from src.models import dea
+from src.data import regions
+from src.models import dea, dea_sweep
 from src.plots import viz
+from src.utils import cache, jobs, prefetch
+
+OUTPUTS = [
+    "Customs",
+    "Infrastructure",
+    "International Shipments",
+    "Logistics Quality and Competence",
+    "Tracking and Tracing",
+    "Timeliness"
+]
+# Weight restrictions as the widgets return them before any change
+DEFAULT_RESTRICTIONS = dict(normalize_data=False, normalize_weights=False, alpha=0.0, beta=None)
+
+def _cube_mtime():
+    """Modification time of the sweep cube file, or None while it does not exist."""
+    try:
+        return os.path.getmtime(dea_sweep.CUBE_PATH)
+    except OSError:
+        return None
+
+@st.cache_resource
+def _load_sweep_cube(data_hash: str, mtime):
+    if mtime is None:
+        return None
+    cube = dea_sweep.SweepCube.load(dea_sweep.CUBE_PATH)
+    return cube if cube.data_hash == data_hash else None
+
+def load_sweep_cube(data_hash: str):
+    """Loads the precomputed alpha/beta sweep cube, if it exists and matches the data.
+
+    The cache is keyed by the file's mtime, so a cube built or rebuilt while the app runs is picked up.
+    """
+    return _load_sweep_cube(data_hash, _cube_mtime())
 
 def render():
     st.title("📈 Logistics Efficiency - BoD Model")
 
+    region = cache.selected_region()
     st.markdown(
-        """
+        f"""
         This analysis uses the BoD (Benefit of the Doubt) model with constraints to assess the logistics efficiency 
-        of European Union countries, based on LPI sub-indicators. The model allows each country to choose the 
+        of countries in {regions.display_name(region)}, based on LPI sub-indicators. The model allows each country to choose the 
         most favorable weights within established limits, reflecting its specific logistics specialization.
         """
     )
 
     # Data loading
-    df = world_bank.load_lpi_data()
-    anos_disponiveis = sorted(df["Year"].unique(), reverse=True)
+    panel = cache.get_panel(region=region)
+    anos_disponiveis = sorted(panel.years.tolist(), reverse=True)
 
     col1, col2 = st.columns([2, 1])
     with col1:
@@ -35,36 +71,139 @@ def render():
         st.warning("Please select a year to proceed.")
         return
 
-    outputs = [
-        "Customs",
-        "Infrastructure",
-        "International Shipments",
-        "Logistics Quality and Competence",
-        "Tracking and Tracing",
-        "Timeliness"
-    ]
-
-    with st.spinner("Calculating BoD efficiency for the selected year..."):
-        df_ano = df[df["Year"] == ano_selecionado].copy()
-        df_ano = df_ano.dropna(subset=outputs)
-
-        if df_ano.empty:
-            st.warning("Insufficient data for the selected year after filtering.")
+    outputs = OUTPUTS
+
+    cube = load_sweep_cube(dea_sweep.data_fingerprint(panel.frame().dropna(subset=outputs), outputs))
+    max_alpha = float(cube.alphas[-1]) if cube is not None else 0.15
+
+    with st.expander("⚖️ Weight restrictions", expanded=False):
+        col_a, col_b = st.columns(2)
+        normalize_data = col_a.checkbox("Normalize data (Min-Max)", value=False)
+        normalize_weights = col_b.checkbox("Normalize weights (sum = 1)", value=False)
+        alpha = st.slider("Lower bound for weights (alpha)", 0.0, max_alpha, 0.0, step=0.005)
+        bounded = st.checkbox("Set an upper bound for weights (beta)", value=False)
+        beta = st.slider("Upper bound for weights (beta)", 0.2, 1.0, 1.0, step=0.01, disabled=not bounded)
+        beta = beta if bounded else None
+
+        if cube is not None:
+            lookup_method = st.radio("Answer from the precomputed grid by", ["linear", "nearest"], horizontal=True)
+        else:
+            st.caption("No precomputed sweep cube found; each change is solved in the background. "
+                       "Build it with `python -m src.models.dea_sweep`.")
+
+    dados = panel.slice_year(ano_selecionado, outputs)
+    if len(dados.countries) == 0:
+        st.warning("Insufficient data for the selected year after filtering.")
+        return
+
+    if cube is not None:
+        # Answered from the sweep cube in milliseconds
+        try:
+            scores = cube.lookup(
+                ano_selecionado, alpha=alpha, beta=beta,
+                normalize_weights=normalize_weights, normalize_data=normalize_data,
+                method=lookup_method
+            )
+        except ValueError as e:
+            st.error(f"Invalid weight restrictions: {e}")
             return
+        show_results(scores, ano_selecionado, mostrar_grafico)
+        return
+
+    # Otherwise the model is solved by the shared background executor: identical requests
+    # from other sessions reuse the same job, and a job nobody watches any more is cancelled.
+    # Completed solutions go to the shared result cache, which the prefetcher also fills
+    # with the neighbouring years under the same restrictions.
+    executor = cache.get_job_executor()
+    results = cache.get_result_cache()
+    owner = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+    params = dict(normalize_data=normalize_data, normalize_weights=normalize_weights, alpha=alpha, beta=beta)
+    key = jobs.fingerprint("bod", dados.values, dados.countries, **params)
+    cache.prefetch("bod", [
+        bod_task(panel.slice_year(ano, outputs), ano, params)
+        for ano in prefetch.neighbours(panel.available_years(outputs), ano_selecionado)
+    ])
 
-        dados = df_ano[outputs]
-        dados.index = df_ano["Country"]
+    previous = st.session_state.get("bod_job")
+    if previous is not None and previous != key:
+        executor.release(previous, owner)
+    st.session_state["bod_job"] = key
 
-        # Apply the BoD model
-        scores = dea.bod_model(dados)
+    job = executor.get(key)
+    if job is None or job.cancelled:
+        scores = results.get(key)
+        if scores is not None:
+            show_results(scores, ano_selecionado, mostrar_grafico)
+            st.caption("Served from the shared result cache.")
+            return
+
+    tags = (f"year:{ano_selecionado}",)
+    job = executor.submit(
+        key, lambda: store_scores(results, key, tags, dea.bod_model_iter(dados, **params)),
+        owner, total=len(dados.countries)
+    )
+
+    if job.finished:
+        show_job(job, ano_selecionado, mostrar_grafico)
+    else:
+        bod_job_section(key, ano_selecionado, mostrar_grafico)
+
+def bod_task(dados, ano: int, params: dict) -> prefetch.PrefetchTask:
+    """Prefetch task solving the BoD model of one year under the same restrictions."""
+    key = jobs.fingerprint("bod", dados.values, dados.countries, **params)
+    return prefetch.PrefetchTask(key, lambda: dea.bod_model(dados, **params), (f"year:{ano}",))
+
+def store_scores(results, key: str, tags: tuple, items):
+    """Passes the solver's (dmu, score, weights) items through and caches the complete scores."""
+    scores = {}
+    for item in items:
+        scores[item[0]] = item[1]
+        yield item
+    results.put(key, pd.Series(scores, name="BoD_Score", dtype=float), tags)
+
+def release_job():
+    """Stops watching this session's job, e.g. when the user leaves the page; an unwatched job is cancelled."""
+    key = st.session_state.pop("bod_job", None)
+    owner = st.session_state.get("session_id")
+    if key is not None and owner is not None:
+        cache.get_job_executor().release(key, owner)
+
+@st.fragment(run_every=0.5)
+def bod_job_section(key: str, ano: int, mostrar_grafico: bool):
+    """Polls the running background job, showing per-country results as they arrive."""
+    job = cache.get_job_executor().get(key)
+    if job is None or job.status in (jobs.DONE, jobs.CANCELLED):
+        # A full rerun renders the finished job without this polling fragment
+        st.rerun()
+    show_job(job, ano, mostrar_grafico)
+
+def show_job(job: jobs.Job, ano: int, mostrar_grafico: bool):
+    status, results = job.snapshot()
+    if status == jobs.FAILED:
+        st.error(f"The BoD model failed: {type(job.error).__name__}: {job.error}")
+        return
+    if status == jobs.RUNNING:
+        st.progress(job.progress(), text=f"Solving the BoD model: {len(results)} of {job.total} countries...")
+
+    scores = pd.Series({country: score for country, score, _ in results}, name="BoD_Score", dtype=float)
+    show_results(scores, ano, mostrar_grafico and status == jobs.DONE, partial=status != jobs.DONE)
+    if status == jobs.DONE:
+        st.caption(f"Solved in {job.elapsed:.2f} s by the background executor.")
+
+def show_results(scores: pd.Series, ano: int, mostrar_grafico: bool, partial: bool = False):
+    scores = scores.dropna()
+    if scores.empty:
+        if not partial:
+            st.warning("The selected weight restrictions are infeasible for this year.")
+        return
 
-        results_df = pd.DataFrame({
-            "Country": scores.index,
-            "BoD Score": scores.values,
-            "Year": ano_selecionado
-        })
+    results_df = pd.DataFrame({
+        "Country": scores.index,
+        "BoD Score": scores.values,
+        "Year": ano
+    })
 
-    st.markdown(f"### BoD Model Results for the year: {ano_selecionado}")
+    st.markdown(f"### BoD Model Results for the year: {ano}")
     st.dataframe(results_df.style.format({"BoD Score": "{:.4f}"}), use_container_width=True)
 
     if mostrar_grafico:
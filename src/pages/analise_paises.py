@@ -1,19 +1,27 @@
 # src/pages/analise_paises.py
 
 import streamlit as st
-from src.data import world_bank
+from src.analysis import trends
+from src.data import regions
 from src.plots import viz
+from src.utils import cache
+
+@st.cache_resource(max_entries=4)
+def get_trends(_panel, version: str, method: str):
+    """Trends and next-edition forecasts for every country and indicator, fitted in one batch."""
+    return trends.fit_trends(_panel, method=method)
 
 def render():
-    st.title("📊 Comparative Analysis between EU Countries")
+    region = cache.selected_region()
+    st.title(f"📊 Comparative Analysis between Countries in {regions.display_name(region)}")
 
     # Load data
-    df = world_bank.load_lpi_data()
+    panel = cache.get_panel(region=region)
 
     # Sidebar filters
     st.sidebar.header("🎛️ Analysis Filters")
 
-    countries = sorted(df['Country'].unique())
+    countries = sorted(panel.countries)
     selected_countries = st.sidebar.multiselect(
         "Select one or more countries",
         countries,
@@ -33,7 +41,7 @@ def render():
         return
 
     # Filter data
-    df_filtered = df[df['Country'].isin(selected_countries)]
+    df_filtered = panel.frame(countries=selected_countries)
 
     if df_filtered.empty:
         st.error("❌ No data available for the selected countries.")
@@ -42,11 +50,28 @@ def render():
     # Time evolution chart
     st.subheader(f"📈 Evolution of the **{selected_indicator}** Indicator Over the Years")
     try:
-        fig = viz.plot_comparative_indicator(df_filtered, selected_countries, selected_indicator)
-        st.pyplot(fig)
+        fig = viz.plot_comparative_indicator_plotly(panel, selected_countries, selected_indicator)
+        st.plotly_chart(fig, use_container_width=True)
     except ValueError as e:
         st.error(f"Error generating chart: {e}")
 
+    # Trends and next-edition forecasts
+    st.markdown("---")
+    st.subheader("📉 Trend and Next-Edition Forecast")
+    method_label = st.radio("Trend estimator", ["Linear (OLS)", "Robust (Huber)"], horizontal=True)
+    trend_table = get_trends(panel, panel.version, "ols" if method_label.startswith("Linear") else "huber")
+    selected_trends = trend_table[
+        trend_table["Country"].isin(selected_countries) & (trend_table["Indicator"] == selected_indicator)
+    ]
+    forecast_year = int(trend_table["Forecast Year"].iloc[0])
+    st.dataframe(
+        selected_trends.set_index("Country")[["Observations", "Last Value", "Slope", "Slope SE", "Forecast", "Forecast SE"]]
+        .rename(columns={"Forecast": f"Forecast {forecast_year}"})
+        .style.format("{:.3f}", subset=["Last Value", "Slope", "Slope SE", f"Forecast {forecast_year}", "Forecast SE"]),
+        use_container_width=True
+    )
+    st.caption("Slope is the change per year. Countries with fewer than three editions have no trend estimate.")
+
     # Data table
     st.markdown("---")
     st.subheader("📄 Summary Data Table")
@@ -1,25 +1,63 @@
 # src/pages/analises_estatisticas.py
 
 import streamlit as st
-from src.data import world_bank
-from src.analysis import stat_analysis
+from src.utils import cache, instrumentation
+from src.analysis import stat_analysis, resampling
 from src.plots import viz
-import matplotlib.pyplot as plt
+
+INDICATORS = (
+    'LPI Aggregate', 'Customs', 'Infrastructure', 'International Shipments',
+    'Logistics Quality and Competence', 'Tracking and Tracing', 'Timeliness'
+)
+
+CORRECTIONS = {
+    "Holm": "holm",
+    "Benjamini-Hochberg (FDR)": "fdr_bh",
+    "Bonferroni": "bonferroni",
+    "None": None
+}
+
+@st.cache_resource(max_entries=2)
+def get_grouped_stats(_df, version: str, indicators: tuple):
+    """Global, per-year and per-country statistics, computed once per data version."""
+    instrumentation.record("grouped_stats")
+    return stat_analysis.grouped_descriptive_stats(_df, list(indicators))
+
+@st.cache_resource(max_entries=8)
+def get_correlation_significance(_df, version: str, indicators: tuple, correction: str):
+    """All-pairs Pearson/Spearman significance, computed once per data version and correction."""
+    instrumentation.record("correlation_significance")
+    return stat_analysis.correlation_significance(_df, list(indicators), correction=correction)
+
+@st.cache_resource(max_entries=32)
+def get_figure(_df, version: str, name: str, *args):
+    """Interactive figure built once per data version and arguments; must not be mutated."""
+    instrumentation.record(f"figure:{name}")
+    return getattr(viz, name)(_df, *args)
+
+@st.cache_resource(max_entries=32)
+def get_pair_inference(_df, version: str, x_indicator: str, y_indicator: str) -> dict:
+    """Parametric and resampling inference for the correlation of one pair of indicators."""
+    instrumentation.record("pair_inference")
+    pair = _df[[x_indicator, y_indicator]].dropna()
+    return {
+        "pearson": viz.pearson_correlation_test(pair, x_indicator, y_indicator),
+        "permutation": resampling.permutation_test(pair[x_indicator], pair[y_indicator], n_resamples=10000, seed=0),
+        "bootstrap": resampling.bootstrap_ci(pair[x_indicator], pair[y_indicator], n_resamples=10000, seed=0)
+    }
 
 def render():
     st.title("Statistical Analysis of Logistics Performance")
 
     # Load data
-    df = world_bank.load_lpi_data()
-
-    indicators = [
-        'LPI Aggregate', 'Customs', 'Infrastructure', 'International Shipments',
-        'Logistics Quality and Competence', 'Tracking and Tracing', 'Timeliness'
-    ]
+    panel = cache.get_panel(region=cache.selected_region())
+    df = panel.frame()
+    indicators = list(INDICATORS)
 
     # Global descriptive statistics
     st.header("📊 Global Descriptive Statistics")
-    stats_global = stat_analysis.descriptive_stats_global(df, indicators)
+    stats = get_grouped_stats(df, panel.version, INDICATORS)
+    stats_global = stats.describe()
 
     col1, col2 = st.columns(2)
     col1.metric("Average Aggregate LPI", f"{stats_global.loc['mean', 'LPI Aggregate']:.3f}")
@@ -27,49 +65,90 @@ def render():
 
     st.dataframe(stats_global.style.format("{:.3f}"))
 
+    with st.expander("Aggregate LPI statistics by year"):
+        st.dataframe(stats.describe('Year')['LPI Aggregate'].style.format("{:.3f}"))
+
     st.markdown("---")
 
     # Histogram
     st.header("📈 Histogram of Aggregate LPI")
-    fig_hist = viz.plot_histogram(df, 'LPI Aggregate')
-    st.pyplot(fig_hist)
-    plt.close(fig_hist)
+    fig_hist = get_figure(df, panel.version, "plot_histogram_plotly", 'LPI Aggregate')
+    st.plotly_chart(fig_hist, use_container_width=True)
 
     st.markdown("---")
 
     # Boxplot by year
     st.header("📦 Boxplot of Aggregate LPI by Year")
-    fig_box = viz.plot_boxplot_by_year(df, 'LPI Aggregate')
-    st.pyplot(fig_box)
-    plt.close(fig_box)
+    fig_box = get_figure(df, panel.version, "plot_boxplot_by_year_plotly", 'LPI Aggregate')
+    st.plotly_chart(fig_box, use_container_width=True)
 
     st.markdown("---")
 
     # Correlation heatmap
     st.header("🧪 Correlation Matrix of Indicators")
-    fig_heatmap = viz.plot_correlation_heatmap_seaborn(df, indicators)
-    st.pyplot(fig_heatmap)
-    plt.close(fig_heatmap)
+    fig_heatmap = viz.plot_correlation_heatmap_plotly(
+        get_correlation_significance(df, panel.version, INDICATORS, None)['pearson_r'].round(2)
+    )
+    st.plotly_chart(fig_heatmap, use_container_width=True)
     st.caption("Values close to 1 indicate a strong positive correlation; values close to -1 indicate a negative correlation.")
 
+    significance_section(df, panel.version)
+
     st.markdown("---")
 
-    # Relationship between selectable indicators
+    relationship_section(df, panel.version)
+
+# The sections below are fragments: their widgets rerun only the fragment, and their
+# inputs are the data frame and its version, fixed by the last full run.
+
+@st.fragment
+def significance_section(df, version: str):
+    """Significance heatmap of all indicator pairs (depends on: data, coefficient, correction)."""
+    st.subheader("Significance of All Indicator Pairs")
+    col1, col2 = st.columns(2)
+    method = col1.radio("Coefficient", ["Pearson", "Spearman"], horizontal=True)
+    correction = col2.selectbox("Multiple-testing correction", list(CORRECTIONS))
+
+    significance = get_correlation_significance(df, version, INDICATORS, CORRECTIONS[correction])
+    key = method.lower()
+    fig_significance = viz.plot_correlation_significance_heatmap(
+        significance[f'{key}_r'],
+        significance[f'{key}_p_adj'],
+        significance[f'{key}_ci_low'],
+        significance[f'{key}_ci_high'],
+        title=f'{method} Correlation ({correction} correction)'
+    )
+    st.plotly_chart(fig_significance, use_container_width=True)
+    st.caption(
+        "* p < 0.05, ** p < 0.01, *** p < 0.001 after correction. Each pair uses the rows where both indicators "
+        "are available; hover a cell for its p-value and 95% confidence interval (Fisher z)."
+    )
+
+@st.fragment
+def relationship_section(df, version: str):
+    """Scatter, regression and correlation tests for one pair (depends on: data, X/Y indicators)."""
+    indicators = list(INDICATORS)
     st.header("🔍 Relationship between Indicators")
     col1, col2 = st.columns(2)
     x_indicator = col1.selectbox("Indicator for X-axis", indicators, index=2)
     y_indicator = col2.selectbox("Indicator for Y-axis", indicators, index=0)
 
     if x_indicator != y_indicator:
-        fig_scatter = viz.plot_scatter_regression(df, x_indicator, y_indicator)
-        st.pyplot(fig_scatter)
-        plt.close(fig_scatter)
+        fig_scatter = get_figure(df, version, "plot_scatter_regression_plotly", x_indicator, y_indicator)
+        st.plotly_chart(fig_scatter, use_container_width=True)
 
         st.subheader("📐 Pearson Correlation Test")
-        stats = viz.pearson_correlation_test(df, x_indicator, y_indicator)
+        inference = get_pair_inference(df, version, x_indicator, y_indicator)
+        stats = inference["pearson"]
         st.write(f"**Pearson Correlation between {x_indicator} and {y_indicator}**: `{stats['correlation']:.3f}`")
         st.write(f"**p-value**: `{stats['p_value']:.4f}`")
 
+        permutation, bootstrap = inference["permutation"], inference["bootstrap"]
+        st.write(
+            f"**Permutation p-value** (10,000 permutations): `{permutation['p_value']:.4f}` — "
+            f"**95% bootstrap CI**: `[{bootstrap['ci_low']:.3f}, {bootstrap['ci_high']:.3f}]`"
+        )
+
         if stats['p_value'] < 0.05:
             st.success("The correlation is statistically significant, meaning there is evidence of a linear relationship between the indicators.")
         else:
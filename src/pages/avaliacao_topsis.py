@@ -1,55 +1,106 @@
 # src/pages/avaliacao_topsis.py
 
+import time
 import streamlit as st
-from src.data import world_bank
+from src.data import regions
 from src.models import topsis
 import pandas as pd
 import plotly.express as px
 from src.utils.helpers import SUBINDICATORS
+from src.utils import cache, prefetch
+
+WEIGHTING_OPTIONS = {
+    "Entropy": "entropy",
+    "CRITIC": "critic",
+    "Standard deviation": "std",
+    "Custom": None
+}
+
+@st.cache_resource(max_entries=2)
+def get_topsis_evaluator(_panel, version: str) -> topsis.TopsisIncremental:
+    """Builds the TOPSIS evaluator once per data version, caching the normalized matrix of every year."""
+    return topsis.TopsisIncremental.from_panel(_panel, SUBINDICATORS)
+
+def default_custom_weights(criterios: list[str]) -> list[float]:
+    """Initial values of the custom weight sliders (equal weights)."""
+    return [1 / len(criterios)] * len(criterios)
+
+def topsis_view(evaluator: topsis.TopsisIncremental, ano: int, pesos: list[float]):
+    """Ranking and bar chart of one year, stored together in the shared result cache."""
+    ranking = evaluator.ranking(ano, pesos)
+    fig = px.bar(
+        ranking.sort_values("TOPSIS Score", ascending=False),
+        x="Country",
+        y="TOPSIS Score",
+        color="TOPSIS Score",
+        color_continuous_scale="RdYlGn",
+        title=f"Country Ranking (TOPSIS) - {ano}",
+        labels={"TOPSIS Score": "Performance Score", "Country": "Country"}
+    )
+    fig.update_layout(xaxis_tickangle=-45, template='plotly_white')
+    return ranking, fig
+
+def topsis_task(evaluator, version: str, ano: int, pesos: list[float]) -> prefetch.PrefetchTask:
+    key = ("topsis", version, ano, tuple(pesos))
+    return prefetch.PrefetchTask(key, lambda: topsis_view(evaluator, ano, pesos), (f"year:{ano}",))
 
 def render():
     st.title("📌 Multicriteria Analysis - TOPSIS Method")
 
+    region = cache.selected_region()
     st.markdown(
-        """
+        f"""
         This analysis utilizes the TOPSIS (Technique for Order of Preference by Similarity to Ideal Solution) 
-        method to rank European Union countries based on LPI sub-indicators. 
+        method to rank countries in {regions.display_name(region)} based on LPI sub-indicators. 
         It evaluates performance by measuring the distance of each country to the 
         theoretical ideal (best observed values) and the negative-ideal solutions.
         """
     )
 
-    df = world_bank.load_lpi_data()
-    anos_disponiveis = sorted(df["Year"].unique(), reverse=True)
+    panel = cache.get_panel(region=region)
+    evaluator = get_topsis_evaluator(panel, panel.version)
+    anos_disponiveis = sorted(evaluator.anos, reverse=True)
 
     ano = st.selectbox("Select the year for TOPSIS analysis", anos_disponiveis)
 
-    df_ano = df[df["Year"] == ano].copy()
-
     criterios = SUBINDICATORS
 
-    # Validate missing data
-    df_ano = df_ano.dropna(subset=criterios)
-    if df_ano.empty:
-        st.warning(f"Insufficient data for TOPSIS analysis in the year {ano}.")
+    # Objective weights (computed for every year at once) or per-criterion sliders
+    with st.expander("⚖️ Criteria weights", expanded=False):
+        esquema = st.radio("Weighting scheme", list(WEIGHTING_OPTIONS), horizontal=True)
+        metodo = WEIGHTING_OPTIONS[esquema]
+        if metodo is None:
+            cols = st.columns(3)
+            pesos = [
+                cols[i % 3].slider(criterio, 0.0, 1.0, inicial, step=0.01, key=f"topsis_w_{criterio}")
+                for i, (criterio, inicial) in enumerate(zip(criterios, default_custom_weights(criterios)))
+            ]
+        else:
+            pesos_anos = cache.get_objective_weights(panel, panel.version, metodo, tuple(criterios))
+            if ano not in pesos_anos.index:
+                # Objective weights need at least two countries with every criterion
+                st.warning(f"Not enough complete data in {ano} for {esquema} weights; choose another scheme or year.")
+                return
+            pesos = pesos_anos.loc[ano].tolist()
+            st.dataframe(pesos_anos.loc[[ano]].style.format("{:.3f}"), use_container_width=True)
+            st.caption("Entropy and standard-deviation weights favour criteria that discriminate more between countries; CRITIC also rewards criteria that are less correlated with the others.")
+
+    if sum(pesos) == 0:
+        st.warning("At least one criterion must have a positive weight.")
         return
 
-    pesos = [1 / len(criterios)] * len(criterios)  # equal weights
+    inicio = time.perf_counter()
+    task = topsis_task(evaluator, panel.version, ano, pesos)
+    ranking, fig = cache.get_result_cache().get_or_compute(*task)
+    st.caption(f"Ranking updated in {(time.perf_counter() - inicio) * 1000:.1f} ms")
 
-    with st.spinner("Calculating TOPSIS ranking..."):
-        ranking = topsis.topsis(df_ano, criterios, pesos)
+    # Neighbouring years under the same scheme (objective weights are recomputed per year)
+    cache.prefetch("topsis", [
+        topsis_task(evaluator, panel.version, vizinho, pesos if metodo is None else pesos_anos.loc[vizinho].tolist())
+        for vizinho in prefetch.neighbours(evaluator.anos, ano)
+        if metodo is None or vizinho in pesos_anos.index
+    ])
 
     st.subheader(f"TOPSIS Ranking ({ano})")
     st.dataframe(ranking.style.format({"TOPSIS Score": "{:.4f}"}), use_container_width=True)
-
-    fig = px.bar(
-        ranking.sort_values("TOPSIS Score", ascending=False),
-        x="Country",
-        y="TOPSIS Score",
-        color="TOPSIS Score",
-        color_continuous_scale="RdYlGn",
-        title=f"Country Ranking (TOPSIS) - {ano}",
-        labels={"TOPSIS Score": "Performance Score", "Country": "Country"}
-    )
-    fig.update_layout(xaxis_tickangle=-45, template='plotly_white')
     st.plotly_chart(fig, use_container_width=True)
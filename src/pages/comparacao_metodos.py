@@ -2,11 +2,87 @@
 
 import streamlit as st
 import pandas as pd
-from src.data import world_bank
-from src.models import dea, topsis
+from src.data.panel import PanelSlice
+from src.models import dea, topsis, rank_aggregation
+from src.analysis import resampling
 from src.utils.helpers import SUBINDICATORS
+from src.utils import cache, instrumentation, prefetch
 from src.plots import viz
 
+RANK_COLS = ("WB Rank", "DEA Rank", "TOPSIS Rank")
+WEIGHTING_SCHEMES = {"Entropy": "entropy", "CRITIC": "critic", "Standard deviation": "std", "Equal": None}
+
+def _year_inputs(panel, ano: int):
+    fatia = panel.slice_year(ano, ["LPI Aggregate"] + SUBINDICATORS)
+    return fatia, PanelSlice(fatia.countries, fatia.values[:, 1:], SUBINDICATORS)
+
+# Every result below depends on a single year, so it lives in the shared result cache
+# tagged with that year and survives data changes that leave the year untouched. The
+# *_task functions are shared with the warm-up command (src/utils/warmup.py).
+
+def _per_year(name: str, version: str, ano: int, params: tuple, compute) -> prefetch.PrefetchTask:
+    key = (f"comparison:{name}", version, ano) + params
+    return prefetch.PrefetchTask(key, compute, (f"year:{ano}",))
+
+def _cached(task: prefetch.PrefetchTask):
+    return cache.get_result_cache().get_or_compute(task.key, task.compute, task.tags)
+
+def dea_task(panel, version: str, ano: int) -> prefetch.PrefetchTask:
+    """World Bank and DEA (BoD) ranks of one year; independent of the TOPSIS weighting."""
+    def compute():
+        instrumentation.record("dea")
+        fatia, inputs = _year_inputs(panel, ano)
+        ranking = pd.DataFrame({
+            "Country": fatia.countries,
+            "LPI Aggregate": fatia.values[:, 0],
+            "Efficiency Score": dea.bod_model(inputs).values
+        })
+        ranking["WB Rank"] = ranking["LPI Aggregate"].rank(ascending=False, method="min").astype(int)
+        ranking["DEA Rank"] = ranking["Efficiency Score"].rank(ascending=False, method="min").astype(int)
+        return ranking
+    return _per_year("dea", version, ano, (), compute)
+
+def topsis_task(panel, version: str, ano: int, metodo: str, pesos_anos: pd.DataFrame = None) -> prefetch.PrefetchTask:
+    """TOPSIS ranks of one year for an objective weighting method (None for equal weights).
+
+    `pesos_anos` holds the method's weights for every year (see cache.get_objective_weights).
+    """
+    def compute():
+        instrumentation.record("topsis")
+        _, inputs = _year_inputs(panel, ano)
+        if pesos_anos is not None and ano in pesos_anos.index:
+            pesos = pesos_anos.loc[ano].tolist()
+        else:
+            # Equal weights; objective ones need two complete countries, and with fewer
+            # the ranking does not depend on the weights
+            pesos = [1.0 / len(SUBINDICATORS)] * len(SUBINDICATORS)
+        return topsis.topsis(inputs, SUBINDICATORS, pesos).rename(columns={"Ranking": "TOPSIS Rank"})
+    return _per_year("topsis", version, ano, (metodo,), compute)
+
+def merge_rankings(dea_ranking: pd.DataFrame, topsis_result: pd.DataFrame) -> pd.DataFrame:
+    """World Bank, DEA and TOPSIS ranks of the countries present in both results."""
+    return dea_ranking[["Country", "WB Rank", "DEA Rank"]].merge(
+        topsis_result[["Country", "TOPSIS Rank"]], on="Country", how="inner"
+    )
+
+def has_rank_agreement(comparativo: pd.DataFrame) -> bool:
+    """Whether the resampling inference can run (three countries ranked by every method)."""
+    return len(comparativo.dropna(subset=list(RANK_COLS))) >= 3
+
+def consensus_task(comparativo, version: str, ano: int, metodo: str) -> prefetch.PrefetchTask:
+    """Borda, Copeland and Kemeny consensus of the three rankings of one year."""
+    def compute():
+        instrumentation.record("consensus")
+        return rank_aggregation.consensus_rankings(comparativo, list(RANK_COLS))
+    return _per_year("consensus", version, ano, (metodo,), compute)
+
+def rank_agreement_task(comparativo, version: str, ano: int, metodo: str, rank_cols: tuple = RANK_COLS) -> prefetch.PrefetchTask:
+    """Permutation p-values and bootstrap intervals for the rank correlations of one year."""
+    def compute():
+        instrumentation.record("rank_agreement")
+        return resampling.rank_agreement(comparativo, list(rank_cols), n_resamples=10000, seed=ano)
+    return _per_year("rank_agreement", version, ano, (metodo, rank_cols), compute)
+
 def render():
     st.title("📊 Country Ranking Comparison")
 
@@ -20,53 +96,41 @@ def render():
         """
     )
 
-    df = world_bank.load_lpi_data()
-    anos_disponiveis = sorted(df["Year"].unique(), reverse=True)
+    comparison_section(cache.get_panel(region=cache.selected_region()))
+
+@st.fragment
+def comparison_section(panel):
+    """Rankings, consensus, correlations and highlights (depends on: data, year, weighting scheme)."""
+    anos_disponiveis = sorted(panel.years.tolist(), reverse=True)
     ano = st.selectbox("Select year for analysis", anos_disponiveis)
-    df_ano = df[df["Year"] == ano].copy()
 
-    subindicadores = SUBINDICATORS
-    df_ano = df_ano.dropna(subset=subindicadores + ["LPI Aggregate"])
-    if df_ano.empty:
+    if ano not in panel.available_years(["LPI Aggregate"] + SUBINDICATORS):
         st.warning(f"Insufficient data for the year {ano} after filtering.")
         return
 
-    # Ensure sub-indicators are numeric
-    for col in subindicadores:
-        df_ano[col] = pd.to_numeric(df_ano[col], errors="coerce")
-    df_ano = df_ano.dropna(subset=subindicadores + ["Country"])
-    if df_ano.empty:
-        st.warning("Insufficient data after converting sub-indicators to numeric values.")
-        return
+    esquema = st.selectbox("TOPSIS weighting scheme", list(WEIGHTING_SCHEMES))
+    metodo = WEIGHTING_SCHEMES[esquema]
 
-    # DEA (Benefit of the Doubt)
-    inputs = df_ano[subindicadores]
-    dea_result = dea.bod_model(inputs)
-    dea_ranking = pd.DataFrame({
-        "Country": df_ano["Country"].values,
-        "Efficiency Score": dea_result.values
-    })
-    dea_ranking["DEA Rank"] = dea_ranking["Efficiency Score"].rank(ascending=False, method="min").astype(int)
-
-    # TOPSIS
-    n_criterios = int(len(subindicadores))
-    pesos = [1.0 / n_criterios] * n_criterios
-    topsis_result = topsis.topsis(df_ano[["Country"] + subindicadores], subindicadores, pesos)
-    topsis_result = topsis_result.rename(columns={"Ranking": "TOPSIS Rank"})
-
-    # World Bank Ranking
-    df_ano["WB Rank"] = df_ano["LPI Aggregate"].rank(ascending=False, method="min").astype(int)
+    # DEA depends only on the year; TOPSIS on the year and the weighting scheme
+    pesos_anos = None if metodo is None else cache.get_objective_weights(panel, panel.version, metodo, tuple(SUBINDICATORS))
+    dea_ranking = _cached(dea_task(panel, panel.version, ano))
+    topsis_result = _cached(topsis_task(panel, panel.version, ano, metodo, pesos_anos))
 
     # Combine rankings
-    comparativo = df_ano[["Country", "WB Rank"]].merge(
-        dea_ranking[["Country", "DEA Rank"]], on="Country", how="inner"
-    ).merge(
-        topsis_result[["Country", "TOPSIS Rank"]], on="Country", how="inner"
-    )
+    comparativo = merge_rankings(dea_ranking, topsis_result)
 
     st.subheader(f"Ranking Comparison Table - Year {ano}")
     st.dataframe(comparativo.set_index("Country"), use_container_width=True)
 
+    # Consensus ranking (Borda, Copeland and Kemeny aggregation of the three methods)
+    st.subheader("Consensus Ranking")
+    consenso = _cached(consensus_task(comparativo, panel.version, ano, metodo))
+    st.dataframe(
+        consenso.set_index("Country")[["Borda Rank", "Copeland Rank", "Kemeny Rank"]].sort_values("Kemeny Rank"),
+        use_container_width=True
+    )
+    st.caption("Kemeny minimizes the total number of pairwise disagreements with the three rankings.")
+
     # Spearman Correlations
     st.subheader("Spearman Rank Correlation")
     corr_matrix = comparativo[["WB Rank", "DEA Rank", "TOPSIS Rank"]].corr(method='spearman')
@@ -75,6 +139,24 @@ def render():
     fig_corr = viz.plot_correlation_heatmap_plotly(corr_matrix)
     st.plotly_chart(fig_corr, use_container_width=True)
 
+    # Resampling inference for the rank agreement (needs three countries ranked by every method)
+    if not has_rank_agreement(comparativo):
+        st.info("Rank agreement inference needs at least three countries ranked by every method.")
+    else:
+        agreement = _cached(rank_agreement_task(comparativo, panel.version, ano, metodo))
+        st.dataframe(
+            agreement["pairs"].set_index("Pair").style.format({
+                "Spearman": "{:.2f}", "p-value": "{:.4f}", "CI Low": "{:.2f}", "CI High": "{:.2f}"
+            }),
+            use_container_width=True
+        )
+        kendall = agreement["kendall_w"]
+        st.caption(
+            f"p-values from 10,000 permutations and 95% percentile intervals from 10,000 bootstrap resamples of "
+            f"the countries. Kendall's W across the three rankings: {kendall['statistic']:.2f} "
+            f"(permutation p-value {kendall['p_value']:.4f})."
+        )
+
     # Scatter Plots
     st.subheader("Ranking Scatter Analysis")
     comparativo_clean = comparativo.dropna(subset=["WB Rank", "DEA Rank", "TOPSIS Rank"])
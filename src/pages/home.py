@@ -1,11 +1,13 @@
 # src/pages/home.py
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import plotly.express as px
-from src.data import world_bank
+from src.data import regions
+from src.utils import cache
 
 # Application home page with an overview of LPI in the EU
 
@@ -52,36 +54,39 @@ def render():
         unsafe_allow_html=True
     )
 
+    region = cache.selected_region()
+    area = regions.display_name(region)
+
     # Title and description
-    st.markdown("# 🚛 Logistics Performance Assessment in the European Union")
+    st.markdown(f"# 🚛 Logistics Performance Assessment in {area}")
     st.markdown(
-        '<div class="subtitle">Interactive system for analyzing the logistics performance of European Union countries, based on the World Bank\'s Logistics Performance Index (LPI).</div>',
+        f'<div class="subtitle">Interactive system for analyzing the logistics performance of countries in {area}, based on the World Bank\'s Logistics Performance Index (LPI).</div>',
         unsafe_allow_html=True
     )
 
     # Load data
-    df = world_bank.load_lpi_data()
-    df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
+    panel = cache.get_panel(region=region)
+    lpi = panel.indicator('LPI Aggregate')  # country x year view
 
     # Main KPIs
-    ultimo_ano = int(df['Year'].max())
-    media_lpi = df[df['Year'] == ultimo_ano]['LPI Aggregate'].mean()
-    num_paises = df['Country'].nunique()
+    ultimo_ano = int(panel.years.max())
+    media_lpi = np.nanmean(lpi[:, panel.year_index[ultimo_ano]])
+    num_paises = len(panel.countries)
 
     col1, col2, col3 = st.columns([1.8, 1.2, 1])
     col1.markdown(f'<div class="kpi">📅 <b>Most Recent Year:</b> {ultimo_ano}</div>', unsafe_allow_html=True)
-    col2.metric(label="Average Aggregate LPI (EU)", value=f"{media_lpi:.2f}")
-    col3.metric(label="EU Countries", value=num_paises)
+    col2.metric(label=f"Average Aggregate LPI ({region})", value=f"{media_lpi:.2f}")
+    col3.metric(label=f"Countries ({region})", value=num_paises)
 
     st.markdown("---")
 
     # Annual LPI Average Chart
     sns.set_theme(style="whitegrid", palette="muted")
-    media_ano = df.groupby('Year')['LPI Aggregate'].mean().reset_index()
+    media_ano = pd.DataFrame({'Year': panel.years, 'LPI Aggregate': np.nanmean(lpi, axis=0)})
 
     fig, ax = plt.subplots(figsize=(10, 4.5))
     sns.lineplot(x='Year', y='LPI Aggregate', data=media_ano, marker='o', ax=ax, color="#0B4C5F", linewidth=2)
-    ax.set_title('Evolution of Average Aggregate LPI in the European Union', fontsize=16, fontweight='bold', color='#0B4C5F')
+    ax.set_title(f'Evolution of Average Aggregate LPI in {area}', fontsize=16, fontweight='bold', color='#0B4C5F')
     ax.set_xlabel('Year', fontsize=13)
     ax.set_ylabel('Average LPI', fontsize=13)
     ax.grid(True, linestyle='--', alpha=0.5)
@@ -90,7 +95,7 @@ def render():
     # st.pyplot(fig)
     st.plotly_chart(px.line(media_ano, x='Year', y='LPI Aggregate', 
                             labels={'LPI Aggregate': 'Average LPI', 'Year': 'Year'},
-                            title='Evolution of Average Aggregate LPI in the EU'))
+                            title=f'Evolution of Average Aggregate LPI in {area}'))
 
     st.markdown("---")
 
@@ -99,7 +104,7 @@ def render():
     nav_col1, nav_col2 = st.columns(2)
 
     nav_col1.markdown('<div class="nav-item"><span class="nav-emoji">📊</span><b>Statistical Analysis</b> — Explore indicators and trends.</div>', unsafe_allow_html=True)
-    nav_col1.markdown('<div class="nav-item"><span class="nav-emoji">🇪🇺</span><b>Country Analysis</b> — Detailed comparison between EU countries.</div>', unsafe_allow_html=True)
+    nav_col1.markdown(f'<div class="nav-item"><span class="nav-emoji">🇪🇺</span><b>Country Analysis</b> — Detailed comparison between countries in {area}.</div>', unsafe_allow_html=True)
     nav_col2.markdown('<div class="nav-item"><span class="nav-emoji">📈</span><b>Sub-indicators by Country</b> — Visualize LPI components.</div>', unsafe_allow_html=True)
     nav_col2.markdown('<div class="nav-item"><span class="nav-emoji">🗺️</span><b>Interactive Map</b> — Geographic data analysis.</div>', unsafe_allow_html=True)
 
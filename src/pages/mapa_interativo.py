@@ -2,20 +2,56 @@
 
 import streamlit as st
 import pandas as pd
-from src.data import world_bank
-from src.plots.viz import plot_europe_map
+from src.data import geo, regions
+from src.plots.viz import figure_payload_bytes, map_view, plot_europe_map, plot_europe_map_comparison
+from src.utils import cache, instrumentation, prefetch
 import plotly.express as px
 
+INDICATORS = [
+    'LPI Aggregate', 'Customs', 'Infrastructure',
+    'International Shipments', 'Logistics Quality and Competence',
+    'Tracking and Tracing', 'Timeliness'
+]
+
+def build_map_figure(panel, years: tuple, indicator: str, countries: tuple, geojson, region: str = regions.DEFAULT_REGION):
+    """Map (or two-year comparison) figure; depends on the data, years, indicator, countries, geometry and region."""
+    instrumentation.record("map")
+    filtro = list(countries) if countries else None
+    view = map_view(region, panel.countries)
+    area = "Europe" if region == "EU" else region
+    if len(years) == 2:
+        df_anos = pd.concat([panel.frame(year=year, countries=filtro) for year in years])
+        return plot_europe_map_comparison(df_anos, years, indicator, geojson, view=view, area=area)
+    return plot_europe_map(panel.frame(year=years[0], countries=filtro), years[0], indicator, geojson, view=view, area=area)
+
+def map_task(
+    panel, years: tuple, indicator: str, countries: tuple, geojson, region: str = regions.DEFAULT_REGION
+) -> prefetch.PrefetchTask:
+    """Map figure as a result-cache task, keyed by the data version and tagged by its years."""
+    key = ("map", panel.version, years, indicator, countries, geojson, region)
+    return prefetch.PrefetchTask(
+        key, lambda: build_map_figure(panel, years, indicator, countries, geojson, region),
+        tuple(f"year:{year}" for year in years)
+    )
+
+def _geojson_for(width: int, region: str = regions.DEFAULT_REGION, countries=None):
+    # With static serving enabled the browser downloads the geometry once and caches it;
+    # otherwise the region's features are embedded at the level that fits the map width.
+    if st.get_option("server.enableStaticServing"):
+        return geo.geojson_url(geo.pick_level(map_view(region, countries)["lon_range"], width))
+    return None
+
 def render():
     st.title("🗺️ Interactive Logistics Performance Map")
 
     # Load data
-    df = world_bank.load_lpi_data()
+    region = cache.selected_region()
+    panel = cache.get_panel(region=region)
 
     # --- Sidebar filters ---
     st.sidebar.header("Filters")
 
-    anos_disponiveis = sorted(df["Year"].unique(), reverse=True)
+    anos_disponiveis = sorted(panel.years.tolist(), reverse=True)
     selected_year = st.sidebar.selectbox("Select year", anos_disponiveis, index=0)
 
     comparar_anos = st.sidebar.checkbox("Compare two years?")
@@ -28,40 +64,46 @@ def render():
             index=0
         )
 
-    indicadores = [
-        'LPI Aggregate', 'Customs', 'Infrastructure',
-        'International Shipments', 'Logistics Quality and Competence',
-        'Tracking and Tracing', 'Timeliness'
-    ]
-    selected_indicator = st.sidebar.selectbox("Select indicator for map", indicadores)
+    selected_indicator = st.sidebar.selectbox("Select indicator for map", INDICATORS)
 
-    paises = sorted(df['Country'].unique())
+    paises = sorted(panel.countries)
     selected_countries = st.sidebar.multiselect("Select countries (optional)", paises, default=paises)
 
-    # Filter data based on selection
-    if selected_countries:
-        df = df[df['Country'].isin(selected_countries)]
+    # Year slices for the selected countries, built directly from the panel
+    filtro_paises = selected_countries or None
+    df_ano = panel.frame(year=selected_year, countries=filtro_paises)
 
     st.markdown(f"### Interactive Map: **{selected_indicator}**")
 
     col1, col2 = st.columns([2, 1])
 
     with col1:
-        # Map for the first year
-        fig = plot_europe_map(df, selected_year, selected_indicator)
+        compare = comparar_anos and selected_year_2
+        geojson = _geojson_for(475 if compare else 950, region, panel.countries)
+        anos = (selected_year, selected_year_2) if compare else (selected_year,)
+        paises_mapa = tuple(selected_countries)
+        fig = cache.get_result_cache().get_or_compute(
+            *map_task(panel, anos, selected_indicator, paises_mapa, geojson, region)
+        )
         st.plotly_chart(fig, use_container_width=True)
 
-        # Map for second year, if selected
-        if comparar_anos and selected_year_2:
-            st.markdown(f"### Map for Year {selected_year_2}")
-            fig2 = plot_europe_map(df, selected_year_2, selected_indicator)
-            st.plotly_chart(fig2, use_container_width=True)
+        # Likely next views: the neighbouring years and, when viewing one year, the
+        # comparison with the default second year
+        tarefas = [
+            map_task(panel, (ano,), selected_indicator, paises_mapa, _geojson_for(950, region, panel.countries), region)
+            for ano in prefetch.neighbours(anos_disponiveis, selected_year)
+        ]
+        if not compare and len(anos_disponiveis) > 1:
+            segundo = next(ano for ano in anos_disponiveis if ano != selected_year)
+            tarefas.insert(1, map_task(
+                panel, (selected_year, segundo), selected_indicator, paises_mapa, _geojson_for(475, region, panel.countries), region
+            ))
+        cache.prefetch("map", tarefas)
+        st.caption(f"Map payload: {figure_payload_bytes(fig) / 1024:.1f} KB")
 
     with col2:
         st.markdown(f"### Indicator Summary Statistics ({selected_year})")
 
-        df_ano = df[df["Year"] == selected_year]
-
         if not df_ano.empty:
             media = df_ano[selected_indicator].mean()
             minimo = df_ano[selected_indicator].min()
@@ -91,7 +133,7 @@ def render():
         st.markdown("---")
 
         st.markdown(f"### Detailed Data - Year {selected_year}")
-        df_detalhes = df[df["Year"] == selected_year].reset_index(drop=True)
+        df_detalhes = df_ano.reset_index(drop=True)
         st.dataframe(df_detalhes, use_container_width=True)
 
         csv = df_detalhes.to_csv(index=False).encode('utf-8')
@@ -100,4 +142,5 @@ def render():
             data=csv,
             file_name=f'lpi_data_{selected_year}.csv',
             mime='text/csv',
+            on_click="ignore"
         )
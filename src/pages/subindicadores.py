@@ -1,20 +1,26 @@
 # src/pages/subindicadores.py
 
 import streamlit as st
-from src.data import world_bank
+from src.analysis.similarity import PeerIndex, METRICS
 from src.plots import viz
+from src.utils import cache
+
+@st.cache_resource(max_entries=2)
+def get_peer_index(_panel, version: str):
+    """Nearest-neighbour index over the sub-indicator profiles, rebuilt only when the data version changes."""
+    return PeerIndex(_panel)
 
 def render():
     st.title("📊 Strengths and Weaknesses by Sub-indicators")
 
     # Load data
-    df = world_bank.load_lpi_data()
+    panel = cache.get_panel(region=cache.selected_region())
 
     # Sidebar filters
     st.sidebar.header("🎛️ Filters")
-    selected_country = st.sidebar.selectbox("Select a country", sorted(df["Country"].unique()))
+    selected_country = st.sidebar.selectbox("Select a country", sorted(panel.countries))
 
-    all_years = sorted(df["Year"].unique(), reverse=True)
+    all_years = sorted(panel.years.tolist(), reverse=True)
     selected_years = st.sidebar.multiselect(
         "Select one or more years",
         all_years,
@@ -42,10 +48,31 @@ def render():
     try:
         # Assuming viz.plot_radar_subindicators handles title/labels via its logic
         # If not, ensure the internal labels in viz.py are also in English.
-        fig, table = viz.plot_radar_subindicators(df, selected_country, selected_years, subindicators)
+        fig, table = viz.plot_radar_subindicators(panel, selected_country, selected_years, subindicators)
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("### 📄 Table of Sub-indicator Values")
         st.dataframe(table, use_container_width=True)
     except ValueError as e:
         st.error(f"❌ Error generating visualization: {e}")
+
+    # Peer similarity
+    st.markdown("---")
+    st.markdown(f"### 🧭 Countries with the Most Similar Sub-indicator Profile to **{selected_country}**")
+    col1, col2, col3 = st.columns(3)
+    reference_year = col1.selectbox("Reference year", selected_years)
+    metric = col2.selectbox("Distance metric", list(METRICS))
+    k = col3.slider("Number of peers", 1, 15, 5)
+    same_year = st.checkbox("Only compare with the same year", value=False)
+
+    try:
+        peers = get_peer_index(panel, panel.version).peers(
+            selected_country, reference_year, k=k, metric=metric, same_year=same_year
+        )
+        st.dataframe(peers.set_index("Rank"), use_container_width=True)
+        st.caption(
+            "Profiles are the six sub-indicators of each country-year. 'standardized' uses z-scores per "
+            "sub-indicator and 'cosine' compares the shape of the profile regardless of its level."
+        )
+    except ValueError as e:
+        st.info(f"No peer profile available: {e}")
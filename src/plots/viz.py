@@ -1,5 +1,6 @@
 # src/plots/viz.py
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -7,17 +8,35 @@ import plotly.express as px
 from scipy.stats import pearsonr
 import plotly.graph_objects as go
 import plotly.colors
+from typing import Union
+from src.data import geo, regions
+from src.data.panel import LPIPanel
 
 # Set global style for Seaborn
 sns.set(style="whitegrid")
 
+# Map view of the European region
+EUROPE_VIEW = {"lon_range": (-25, 40), "lat_range": (35, 70), "center": {"lat": 54, "lon": 15}}
 
-def plot_comparative_indicator(df: pd.DataFrame, countries: list[str], indicator: str) -> plt.Figure:
+
+def map_view(region: str, countries=None) -> dict:
+    """
+    Map view of a region of src/data/regions.py: the fixed European view for the EU,
+    else fitted to `countries` (the ones with data), or to all its members if not given.
+    """
+    if region == "EU":
+        return EUROPE_VIEW
+    if countries is None:
+        return geo.region_view(regions.get_registry().iso3_codes(region))
+    return geo.region_view(regions.to_iso3(countries))
+
+
+def plot_comparative_indicator(df: Union[pd.DataFrame, LPIPanel], countries: list[str], indicator: str) -> plt.Figure:
     """
     Plots the time evolution of an LPI indicator for multiple countries.
 
     Parameters:
-        df (pd.DataFrame): DataFrame containing LPI data.
+        df (pd.DataFrame | LPIPanel): DataFrame or panel containing LPI data.
         countries (list[str]): List of countries for comparison.
         indicator (str): Name of the LPI indicator to be plotted.
 
@@ -26,8 +45,13 @@ def plot_comparative_indicator(df: pd.DataFrame, countries: list[str], indicator
     """
     plt.figure(figsize=(12, 6))
     for country in countries:
-        country_data = df[df["Country"] == country]
-        plt.plot(country_data["Year"], country_data[indicator], marker='o', label=country)
+        if isinstance(df, LPIPanel):
+            series = df.country(country)[:, df.indicator_index[indicator]]
+            present = ~np.isnan(series)
+            plt.plot(df.years[present], series[present], marker='o', label=country)
+        else:
+            country_data = df[df["Country"] == country]
+            plt.plot(country_data["Year"], country_data[indicator], marker='o', label=country)
     
     plt.title(f'Evolution of Indicator: {indicator}')
     plt.xlabel('Year')
@@ -39,76 +63,159 @@ def plot_comparative_indicator(df: pd.DataFrame, countries: list[str], indicator
     return fig
 
 
-def plot_europe_map(df: pd.DataFrame, year: int, indicator: str = "LPI Aggregate") -> go.Figure:
+def _map_trace(df_year: pd.DataFrame, indicator: str, geojson: Union[dict, str]) -> go.Choropleth:
+    """Choropleth trace matched to the geometry by ISO-3 code, with the sub-indicator tooltip."""
+    hover_cols = [
+        ('LPI Aggregate', 'LPI Aggregate'), ('Customs', 'Customs'), ('Infrastructure', 'Infrastructure'),
+        ('International Shipments', 'International Shipments'),
+        ('Logistics Quality and Competence', 'Logistics Quality'),
+        ('Tracking and Tracing', 'Tracking and Tracing'), ('Timeliness', 'Timeliness')
+    ]
+    present = [(col, label) for col, label in hover_cols if col in df_year.columns]
+    hovertemplate = '<b>%{text}</b><br>' + '<br>'.join(
+        f'{label}: %{{customdata[{i}]}}' for i, (_, label) in enumerate(present)
+    ) + '<extra></extra>'
+
+    return go.Choropleth(
+        geojson=geojson,
+        featureidkey=geo.FEATURE_ID_KEY,
+        locations=geo.country_to_iso3(df_year['Country']),
+        z=df_year[indicator],
+        text=df_year['Country'],
+        customdata=df_year[[col for col, _ in present]].round(3).to_numpy(),
+        hovertemplate=hovertemplate,
+        coloraxis='coloraxis',
+        marker_line_width=0.5
+    )
+
+
+def _resolve_geojson(
+    geojson: Union[dict, str, None], countries, width: int, view: dict = EUROPE_VIEW
+) -> Union[dict, str]:
+    """Region geometry at the level that fits the viewport, unless a dict or URL is given."""
+    if geojson is not None:
+        return geojson
+    level = geo.pick_level(view['lon_range'], width)
+    return geo.load_geojson(level, tuple(sorted(set(filter(None, geo.country_to_iso3(countries))))))
+
+
+def _update_europe_geos(fig: go.Figure, view: dict = EUROPE_VIEW) -> None:
+    # Base layers off: everything drawn comes from the bundled GeoJSON, nothing is fetched
+    fig.update_geos(
+        visible=False,
+        projection_type="natural earth",
+        center=view['center'],
+        lataxis_range=list(view['lat_range']),
+        lonaxis_range=list(view['lon_range'])
+    )
+
+
+def plot_europe_map(
+    df: pd.DataFrame,
+    year: int,
+    indicator: str = "LPI Aggregate",
+    geojson: Union[dict, str] = None,
+    width: int = 950,
+    view: dict = EUROPE_VIEW,
+    area: str = "Europe"
+) -> go.Figure:
     """
     Generates an interactive map of Europe showing the values of an LPI indicator in a given year.
 
+    Countries are matched to the bundled simplified GeoJSON by ISO-3 code; the
+    simplification level is chosen from the map width.
+
     Parameters:
         df (pd.DataFrame): DataFrame with LPI data.
         year (int): Year to be displayed on the map.
         indicator (str, optional): Indicator to be displayed. Default is "LPI Aggregate".
+        geojson (dict | str, optional): FeatureCollection or URL of a static GeoJSON file.
+        width (int, optional): Map width in pixels. Default is 950.
+        view (dict, optional): Map view (see `map_view`). Default is EUROPE_VIEW.
+        area (str, optional): Area named in the title. Default is "Europe".
 
     Returns:
         plotly.graph_objects.Figure: Interactive map figure.
     """
-    df_year = df[df["Year"] == year].copy()
+    df_year = df[df["Year"] == year]
 
     if indicator not in df_year.columns:
         raise ValueError(f"Indicator '{indicator}' not found in data.")
 
-    # Customized Tooltip
-    def format_tooltip(row):
-        return (
-            f"<b>{row['Country']}</b><br>"
-            f"LPI Aggregate: {row.get('LPI Aggregate', 'N/A')}<br>"
-            f"Customs: {row.get('Customs', 'N/A')}<br>"
-            f"Infrastructure: {row.get('Infrastructure', 'N/A')}<br>"
-            f"International Shipments: {row.get('International Shipments', 'N/A')}<br>"
-            f"Logistics Quality: {row.get('Logistics Quality and Competence', 'N/A')}<br>"
-            f"Tracking and Tracing: {row.get('Tracking and Tracing', 'N/A')}<br>"
-            f"Timeliness: {row.get('Timeliness', 'N/A')}"
-        )
+    fig = go.Figure(_map_trace(df_year, indicator, _resolve_geojson(geojson, df_year['Country'], width, view)))
+    _update_europe_geos(fig, view)
+    fig.update_layout(
+        title=f"{indicator} in {area} - {year}",
+        margin={"r": 0, "t": 50, "l": 0, "b": 0},
+        height=650,
+        width=width,
+        coloraxis=dict(colorscale="RdYlGn", colorbar=dict(title=indicator)),
+        template='plotly_white'
+    )
 
-    df_year["tooltip"] = df_year.apply(format_tooltip, axis=1)
+    return fig
 
-    fig = px.choropleth(
-        df_year,
-        locations="Country",
-        locationmode="country names",
-        color=indicator,
-        hover_name="Country",
-        color_continuous_scale="RdYlGn",
-        title=f"{indicator} in Europe - {year}"
-    )
 
-    # Use hovertemplate for custom tooltip
-    fig.update_traces(
-        hovertemplate=df_year["tooltip"],
-        marker_line_width=0.5
-    )
+def plot_europe_map_comparison(
+    df: pd.DataFrame,
+    years: tuple[int, int],
+    indicator: str = "LPI Aggregate",
+    geojson: Union[dict, str] = None,
+    width: int = 950,
+    view: dict = EUROPE_VIEW,
+    area: str = "Europe"
+) -> go.Figure:
+    """
+    Side-by-side maps of an indicator in two years, in a single figure.
 
-    fig.update_geos(
-        projection_type="natural earth",
-        showcountries=True,
-        showcoastlines=True,
-        showland=True,
-        landcolor="LightGray",
-        center={"lat": 54, "lon": 15},
-        lataxis_range=[35, 70],
-        lonaxis_range=[-25, 40]
+    Both traces share one color scale and the same geometry object, which is serialized
+    once per trace; pass a static GeoJSON URL to have the browser download it only once.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame with LPI data for (at least) both years.
+        years (tuple[int, int]): Years to compare.
+        indicator (str, optional): Indicator to be displayed. Default is "LPI Aggregate".
+        geojson (dict | str, optional): FeatureCollection or URL of a static GeoJSON file.
+        width (int, optional): Total figure width in pixels. Default is 950.
+        view (dict, optional): Map view (see `map_view`). Default is EUROPE_VIEW.
+        area (str, optional): Area named in the title. Default is "Europe".
+
+    Returns:
+        plotly.graph_objects.Figure: Figure with two geo subplots.
+    """
+    from plotly.subplots import make_subplots
+
+    if indicator not in df.columns:
+        raise ValueError(f"Indicator '{indicator}' not found in data.")
+
+    geojson = _resolve_geojson(geojson, df['Country'], width // 2, view)
+    fig = make_subplots(
+        rows=1, cols=2,
+        specs=[[{"type": "choropleth"}, {"type": "choropleth"}]],
+        subplot_titles=[str(y) for y in years],
+        horizontal_spacing=0.01
     )
+    for col, year in enumerate(years, start=1):
+        fig.add_trace(_map_trace(df[df["Year"] == year], indicator, geojson), row=1, col=col)
 
+    _update_europe_geos(fig, view)
+    values = df.loc[df["Year"].isin(years), indicator]
     fig.update_layout(
-        margin={"r": 0, "t": 50, "l": 0, "b": 0},
-        height=650,
-        width=950,
-        coloraxis_colorbar=dict(title=indicator),
+        title=f"{indicator} in {area} - {years[0]} vs {years[1]}",
+        margin={"r": 0, "t": 70, "l": 0, "b": 0},
+        height=450,
+        width=width,
+        coloraxis=dict(colorscale="RdYlGn", cmin=values.min(), cmax=values.max(), colorbar=dict(title=indicator)),
         template='plotly_white'
     )
-
     return fig
 
 
+def figure_payload_bytes(fig: go.Figure) -> int:
+    """Size in bytes of the JSON the browser receives for a figure."""
+    return len(fig.to_json().encode('utf-8'))
+
+
 def plot_histogram(df: pd.DataFrame, indicator: str) -> plt.Figure:
     """
     Creates a histogram with a KDE curve for an LPI indicator.
@@ -205,7 +312,7 @@ def pearson_correlation_test(df: pd.DataFrame, x_indicator: str, y_indicator: st
 
 
 def plot_radar_subindicators(
-    df: pd.DataFrame,
+    df: Union[pd.DataFrame, LPIPanel],
     country: str,
     years: list[int],
     subindicators: list[str]
@@ -213,8 +320,18 @@ def plot_radar_subindicators(
     """
     Generates a radar chart for the evolution of LPI sub-indicators of a country.
     """
-    df_country = df[(df["Country"] == country) & (df["Year"].isin(years))]
-    df_selected = df_country.set_index("Year")[subindicators]
+    if isinstance(df, LPIPanel):
+        view = df.country(country)
+        rows = [df.year_index[int(y)] for y in years if int(y) in df.year_index]
+        cols = [df.indicator_index[s] for s in subindicators]
+        values = view[rows][:, cols]
+        present = ~np.isnan(values).all(axis=1)
+        df_selected = pd.DataFrame(
+            values[present], index=pd.Index(df.years[rows][present], name="Year"), columns=subindicators
+        )
+    else:
+        df_country = df[(df["Country"] == country) & (df["Year"].isin(years))]
+        df_selected = df_country.set_index("Year")[subindicators]
 
     fig = go.Figure()
     categories = subindicators
@@ -297,6 +414,60 @@ def plot_correlation_heatmap_plotly(corr_matrix: pd.DataFrame) -> go.Figure:
     return fig
 
 
+def plot_correlation_significance_heatmap(
+    corr_matrix: pd.DataFrame,
+    p_values: pd.DataFrame,
+    ci_low: pd.DataFrame = None,
+    ci_high: pd.DataFrame = None,
+    alpha: float = 0.05,
+    title: str = 'Correlation Significance Matrix'
+) -> go.Figure:
+    """
+    Generates a heatmap of correlation coefficients annotated with significance stars.
+
+    Cells show the coefficient followed by *, ** or *** when the (adjusted) p-value is
+    below alpha, alpha/5 or alpha/50; the tooltip adds the p-value and, if given, the
+    confidence interval.
+
+    Parameters:
+        corr_matrix (pd.DataFrame): Correlation coefficients.
+        p_values (pd.DataFrame): P-values with the same shape, typically adjusted.
+        ci_low (pd.DataFrame, optional): Lower confidence bounds.
+        ci_high (pd.DataFrame, optional): Upper confidence bounds.
+        alpha (float, optional): Significance level. Default is 0.05.
+        title (str, optional): Figure title.
+
+    Returns:
+        plotly.graph_objects.Figure: Heatmap figure.
+    """
+    r = corr_matrix.to_numpy()
+    p = p_values.reindex_like(corr_matrix).to_numpy()
+    stars = np.select([p < alpha / 50, p < alpha / 5, p < alpha], ['***', '**', '*'], default='')
+    np.fill_diagonal(stars, '')
+    text = np.char.add(np.char.mod('%.2f', r), stars)
+
+    customdata = [p]
+    hovertemplate = '%{y} × %{x}<br>r = %{z:.3f}<br>p = %{customdata[0]:.2e}'
+    if ci_low is not None and ci_high is not None:
+        customdata += [ci_low.reindex_like(corr_matrix).to_numpy(), ci_high.reindex_like(corr_matrix).to_numpy()]
+        hovertemplate += '<br>CI: [%{customdata[1]:.3f}, %{customdata[2]:.3f}]'
+
+    fig = go.Figure(go.Heatmap(
+        z=r,
+        x=list(corr_matrix.columns),
+        y=list(corr_matrix.index),
+        zmin=-1,
+        zmax=1,
+        colorscale='RdBu_r',
+        text=text,
+        texttemplate='%{text}',
+        customdata=np.stack(customdata, axis=-1),
+        hovertemplate=hovertemplate + '<extra></extra>'
+    ))
+    fig.update_layout(title=title, template='plotly_white', yaxis_autorange='reversed')
+    return fig
+
+
 def plot_scatter_ranking(
     comparativo: pd.DataFrame,
     x: str,
@@ -318,3 +489,230 @@ def plot_scatter_ranking(
     )
     fig.update_layout(template='plotly_white')
     return fig
+
+
+# Interactive (Plotly) equivalents of the matplotlib/seaborn charts. The KDE, the
+# regression band and the histogram bins are computed here with NumPy, once per call,
+# so pages can cache the resulting figures; rendering happens in the browser.
+
+MAX_SCATTER_POINTS = 5000
+
+
+def _gaussian_kde(values: np.ndarray, grid: np.ndarray, chunk_size: int = 2048) -> np.ndarray:
+    """Gaussian KDE with Scott's bandwidth (as seaborn/scipy), evaluated on the grid in chunks."""
+    n = values.size
+    std = values.std(ddof=1) if n > 1 else 0.0
+    bandwidth = std * n ** (-1 / 5) if std > 0 else 1.0
+    density = np.zeros_like(grid, dtype=float)
+    for start in range(0, n, chunk_size):
+        z = (grid[:, None] - values[None, start:start + chunk_size]) / bandwidth
+        density += np.exp(-0.5 * z ** 2).sum(axis=1)
+    return density / (n * bandwidth * np.sqrt(2 * np.pi))
+
+
+def _regression_band(x: np.ndarray, y: np.ndarray, grid: np.ndarray, confidence: float = 0.95):
+    """OLS fit on the grid with the analytic confidence band of the mean response."""
+    from scipy.stats import t as t_dist
+
+    n = x.size
+    x_mean = x.mean()
+    sxx = ((x - x_mean) ** 2).sum()
+    slope = ((x - x_mean) * (y - y.mean())).sum() / sxx
+    intercept = y.mean() - slope * x_mean
+    fit = intercept + slope * grid
+    if n <= 2:
+        return fit, fit, fit
+    s = np.sqrt(((y - intercept - slope * x) ** 2).sum() / (n - 2))
+    half = t_dist.ppf(0.5 + confidence / 2, n - 2) * s * np.sqrt(1 / n + (grid - x_mean) ** 2 / sxx)
+    return fit, fit - half, fit + half
+
+
+def _downsample(n: int, max_points: int, seed: int = 0) -> np.ndarray:
+    """Sorted random subset of row positions, or all rows when n <= max_points."""
+    if n <= max_points:
+        return np.arange(n)
+    return np.sort(np.random.default_rng(seed).choice(n, max_points, replace=False))
+
+
+def plot_histogram_plotly(df: pd.DataFrame, indicator: str, bins: Union[int, str] = 'auto') -> go.Figure:
+    """
+    Interactive histogram with a KDE curve for an LPI indicator.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame with LPI data.
+        indicator (str): Indicator for the histogram.
+        bins (int | str, optional): Number of bins or a NumPy binning rule. Default is 'auto'.
+
+    Returns:
+        plotly.graph_objects.Figure: Histogram figure.
+    """
+    values = df[indicator].dropna().to_numpy(dtype=float)
+    counts, edges = np.histogram(values, bins=bins)
+    widths = np.diff(edges)
+
+    fig = go.Figure(go.Bar(
+        x=edges[:-1] + widths / 2,
+        y=counts,
+        width=widths,
+        marker_color='skyblue',
+        marker_line=dict(color='white', width=1),
+        name='Frequency'
+    ))
+    if values.size > 1:
+        grid = np.linspace(edges[0], edges[-1], 200)
+        # Scale the density to counts, as seaborn does with kde=True
+        fig.add_trace(go.Scatter(
+            x=grid, y=_gaussian_kde(values, grid) * values.size * widths.mean(),
+            mode='lines', line=dict(color='steelblue', width=2), name='KDE'
+        ))
+    fig.update_layout(
+        title=f'Histogram of Indicator: {indicator}',
+        xaxis_title=indicator,
+        yaxis_title='Frequency',
+        bargap=0,
+        showlegend=False,
+        template='plotly_white'
+    )
+    return fig
+
+
+def plot_boxplot_by_year_plotly(df: pd.DataFrame, indicator: str) -> go.Figure:
+    """
+    Interactive boxplots of the indicator by year.
+
+    Quartiles and Tukey fences are precomputed for all years at once, so only the box
+    statistics and the outliers are sent to the browser.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame with LPI data.
+        indicator (str): Indicator for the boxplot.
+
+    Returns:
+        plotly.graph_objects.Figure: Boxplot figure.
+    """
+    data = df[["Year", indicator]].dropna()
+    quartiles = data.groupby("Year")[indicator].quantile([0.25, 0.5, 0.75]).unstack()
+    q1, median, q3 = (quartiles[q].to_numpy() for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    years = quartiles.index.to_numpy()
+
+    # Whiskers end at the most extreme observations inside the 1.5·IQR fences
+    pos = np.searchsorted(years, data["Year"].to_numpy())
+    values = data[indicator].to_numpy(dtype=float)
+    inside = (values >= (q1 - 1.5 * iqr)[pos]) & (values <= (q3 + 1.5 * iqr)[pos])
+    whiskers = pd.DataFrame({"pos": pos[inside], "v": values[inside]}).groupby("pos")["v"].agg(["min", "max"])
+    whiskers = whiskers.reindex(range(len(years)))
+
+    fig = go.Figure(go.Box(
+        x=years.astype(str),
+        q1=q1,
+        median=median,
+        q3=q3,
+        lowerfence=whiskers["min"].fillna(pd.Series(q1)).to_numpy(),
+        upperfence=whiskers["max"].fillna(pd.Series(q3)).to_numpy(),
+        name=indicator,
+        marker_color='steelblue'
+    ))
+    if (~inside).any():
+        fig.add_trace(go.Scattergl(
+            x=years[pos[~inside]].astype(str), y=values[~inside],
+            mode='markers', marker=dict(color='steelblue', symbol='diamond-open'), name='Outliers'
+        ))
+    fig.update_layout(
+        title=f'Boxplot of {indicator} by Year',
+        xaxis_title='Year',
+        yaxis_title=indicator,
+        showlegend=False,
+        template='plotly_white'
+    )
+    return fig
+
+
+def plot_scatter_regression_plotly(
+    df: pd.DataFrame,
+    x_indicator: str,
+    y_indicator: str,
+    max_points: int = MAX_SCATTER_POINTS
+) -> go.Figure:
+    """
+    Interactive WebGL scatterplot with an OLS regression line and 95% confidence band.
+
+    The fit uses every row; only the markers are downsampled above `max_points`.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame with LPI data.
+        x_indicator (str): Indicator for X-axis.
+        y_indicator (str): Indicator for Y-axis.
+        max_points (int, optional): Maximum number of markers drawn.
+
+    Returns:
+        plotly.graph_objects.Figure: Scatterplot figure with regression.
+    """
+    data = df[[x_indicator, y_indicator] + (["Country"] if "Country" in df.columns else [])].dropna()
+    x = data[x_indicator].to_numpy(dtype=float)
+    y = data[y_indicator].to_numpy(dtype=float)
+    shown = _downsample(x.size, max_points)
+
+    fig = go.Figure(go.Scattergl(
+        x=x[shown], y=y[shown], mode='markers',
+        marker=dict(color='steelblue', opacity=0.6),
+        text=data["Country"].to_numpy()[shown] if "Country" in data.columns else None,
+        name='Observations'
+    ))
+    if x.size > 1 and np.ptp(x) > 0:
+        grid = np.linspace(x.min(), x.max(), 100)
+        fit, low, high = _regression_band(x, y, grid)
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([grid, grid[::-1]]), y=np.concatenate([high, low[::-1]]),
+            fill='toself', fillcolor='rgba(70,130,180,0.2)', line=dict(width=0),
+            hoverinfo='skip', name='95% CI'
+        ))
+        fig.add_trace(go.Scatter(x=grid, y=fit, mode='lines', line=dict(color='steelblue'), name='OLS fit'))
+    title = f'Regression between {x_indicator} and {y_indicator}'
+    if shown.size < x.size:
+        title += f' ({shown.size:,} of {x.size:,} points shown)'
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_indicator,
+        yaxis_title=y_indicator,
+        showlegend=False,
+        template='plotly_white'
+    )
+    return fig
+
+
+def plot_comparative_indicator_plotly(
+    df: Union[pd.DataFrame, LPIPanel],
+    countries: list[str],
+    indicator: str
+) -> go.Figure:
+    """
+    Interactive time evolution of an LPI indicator for multiple countries.
+
+    Parameters:
+        df (pd.DataFrame | LPIPanel): DataFrame or panel containing LPI data.
+        countries (list[str]): List of countries for comparison.
+        indicator (str): Name of the LPI indicator to be plotted.
+
+    Returns:
+        plotly.graph_objects.Figure: Line chart figure.
+    """
+    fig = go.Figure()
+    for country in countries:
+        if isinstance(df, LPIPanel):
+            series = df.country(country)[:, df.indicator_index[indicator]]
+            present = ~np.isnan(series)
+            years, values = df.years[present], series[present]
+        else:
+            country_data = df[df["Country"] == country]
+            years, values = country_data["Year"], country_data[indicator]
+        fig.add_trace(go.Scattergl(x=years, y=values, mode='lines+markers', name=country))
+
+    fig.update_layout(
+        title=f'Evolution of Indicator: {indicator}',
+        xaxis_title='Year',
+        yaxis_title=indicator,
+        legend_title='Country',
+        template='plotly_white'
+    )
+    return fig
@@ -0,0 +1,126 @@
+# src/utils/cache.py
+
+import os
+import streamlit as st
+from src.data import regions, shared_store, snapshots
+from src.data.panel import LPIPanel
+from src.models import weighting
+from src.utils import data_watcher
+from src.utils.jobs import RUNNING, JobExecutor
+from src.utils.prefetch import Prefetcher
+from src.utils.result_cache import ResultCache
+
+# Shared, process-wide caches used by the pages. Objects returned here are shared
+# between sessions and reruns and must be treated as read-only.
+
+def _store_root(source: str) -> str:
+    return os.path.join(shared_store.default_root(), source)
+
+def results_dir(source: str = "local") -> str:
+    """
+    Directory of the persisted result-cache entries (written by src/utils/warmup.py).
+
+    A dot directory, so it is never taken for a panel version of the store. The store is
+    per user and ResultCache only reads entries from here if no other user can write to it.
+    """
+    return os.path.join(_store_root(source), ".results")
+
+def get_panel(source: str = "local", region: str = None) -> LPIPanel:
+    """
+    Returns the LPI panel from the process-shared store.
+
+    The first worker to need the data publishes it; every worker then attaches to the
+    same memory-mapped files read-only. A refresh publishes a new version and the next
+    rerun of each session attaches to it. With a region (see src/data/regions.py) only
+    its members are kept; the store always holds the full panel of the source.
+    """
+    root = _store_root(source)
+    version = shared_store.current_version(root)
+    if version is None:
+        panel = LPIPanel.load(source)
+        if source != "remote":
+            # Remote loads are recorded by world_bank.load_lpi_data itself
+            snapshots.record(panel, source)
+        version = shared_store.publish(panel, root)
+    if region is None:
+        return _attach_panel(root, version)
+    return _region_panel(root, version, region)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _attach_panel(root: str, version: str) -> LPIPanel:
+    return shared_store.attach(version, root)
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _region_panel(root: str, version: str, region: str) -> LPIPanel:
+    return _attach_panel(root, version).for_region(region)
+
+def available_regions(panel: LPIPanel) -> list[str]:
+    """Regions with at least two countries in the panel, in registry order."""
+    registry = regions.get_registry()
+    return [name for name in registry.groups if sum(registry.contains(name, panel.countries)) >= 2]
+
+def selected_region() -> str:
+    """Region chosen in the sidebar (app.py), or the default region."""
+    return st.session_state.get("region", regions.DEFAULT_REGION)
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_objective_weights(_panel: LPIPanel, version: str, method: str, criteria: tuple):
+    """Objective criteria weights for every year, computed once per data version and method."""
+    return weighting.objective_weights(_panel, list(criteria), method)
+
+@st.cache_resource(show_spinner=False)
+def get_job_executor() -> JobExecutor:
+    """Background solver pool shared by all sessions (see src/utils/jobs.py)."""
+    return JobExecutor(max_workers=max(1, min(4, (os.cpu_count() or 1) - 1)))
+
+@st.cache_resource(show_spinner=False)
+def get_result_cache() -> ResultCache:
+    """Model results and figures shared by all sessions (see src/utils/result_cache.py)."""
+    return ResultCache(directory=results_dir())
+
+@st.cache_resource(show_spinner=False)
+def get_prefetcher() -> Prefetcher:
+    """
+    Speculative prefetcher filling the result cache (see src/utils/prefetch.py).
+
+    LPI_PREFETCH_BUDGET sets the fraction of one core it may use (default 0.25); 0
+    disables prefetching and returns None.
+    """
+    budget = float(os.environ.get("LPI_PREFETCH_BUDGET", 0.25))
+    if budget <= 0:
+        return None
+    executor = get_job_executor()
+    return Prefetcher(get_result_cache(), cpu_budget=budget, busy=lambda: executor.stats()[RUNNING] > 0)
+
+@st.cache_resource(show_spinner=False)
+def get_data_watcher() -> data_watcher.DataWatcher:
+    """Watches the local LPI file and adopts new data without a restart (see src/utils/data_watcher.py)."""
+    return data_watcher.DataWatcher(_store_root("local"), get_result_cache()).start()
+
+def prefetch(group: str, tasks) -> None:
+    """Schedules speculative work for the current page, if prefetching is enabled."""
+    prefetcher = get_prefetcher()
+    if prefetcher is not None:
+        prefetcher.schedule(group, tasks)
+
+def refresh_panel(source: str = "local") -> str:
+    """
+    Reloads the data, records it as a snapshot, publishes it as the current version and
+    prunes old versions. The result cache keeps every result whose year did not change;
+    for the local source the change goes through the data watcher, so it adopts the new
+    version too.
+    """
+    root = _store_root(source)
+    # Created before publishing, so the watcher still holds the previous version
+    watcher = get_data_watcher() if source == "local" else None
+    previous = shared_store.current_version(root)
+    panel = LPIPanel.load(source)
+    if source != "remote":
+        snapshots.record(panel, source)
+    version = shared_store.publish(panel, root)
+    if watcher is not None:
+        watcher.check()
+    elif previous is not None and previous != version:
+        data_watcher.apply_change(get_result_cache(), root, previous, version)
+    shared_store.prune(root)
+    return version
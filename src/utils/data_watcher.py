@@ -0,0 +1,194 @@
+# src/utils/data_watcher.py
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from src.data import shared_store, snapshots, world_bank
+from src.data.panel import LPIPanel, diff_panels
+from src.utils.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Tag of results computed from every year at once (pooled statistics, trends, ...)
+POOLED_TAG = "pooled"
+
+# Digest of the source file last published to the store, kept next to its CURRENT pointer
+SOURCE_FILE = "SOURCE"
+
+def stale_tags(diff) -> set[str]:
+    """Result-cache tags invalidated by a panel diff: the changed years plus pooled results."""
+    if diff.empty:
+        return set()
+    return {f"year:{int(year)}" for year in diff["Year"].unique()} | {POOLED_TAG}
+
+def apply_change(results: ResultCache, root: str, previous: str, current: str) -> dict:
+    """
+    Moves the result cache from data version `previous` to `current` using their diff.
+
+    Versions are content hashes shared with the snapshot IDs, so the diff is the same as
+    `snapshots.diff(previous, current)`; it is computed on the memory-mapped store, or
+    from the snapshot when the previous version was already pruned from the store.
+
+    Returns:
+        dict: Versions, changed cells and years, and entries kept and dropped.
+    """
+    try:
+        old = shared_store.attach(previous, root)
+    except FileNotFoundError:
+        try:
+            old = snapshots.load_panel(previous)
+        except (FileNotFoundError, ValueError):
+            # Neither the store nor the snapshots hold the previous version
+            results.invalidate()
+            return {"old_version": previous, "new_version": current, "changed_cells": None, "changed_years": None}
+    diff = diff_panels(old, shared_store.attach(current, root))
+
+    counts = results.rebase(previous, current, stale_tags(diff))
+    years = sorted(int(y) for y in diff["Year"].unique())
+    logger.info(f"LPI data changed ({previous} -> {current}); years {years}; cache {counts}.")
+    return {
+        "old_version": previous,
+        "new_version": current,
+        "changed_cells": len(diff),
+        "changed_years": years,
+        **counts
+    }
+
+class DataWatcher:
+    """
+    Watches the local LPI file and moves the app to new data without a restart.
+
+    Every `interval` seconds it checks the file's size and modification time; when they
+    change, the panel is reloaded, recorded as a snapshot and published to the shared
+    store (a no-op if the content, and hence the version, is unchanged). Whenever the
+    current version of the store differs from the one this process last saw, whoever
+    published it, the old and new panels are diffed by (Country, Year) and the result
+    cache keeps every per-year result whose year did not change; the changed years and
+    pooled results are dropped.
+
+    Caches keyed by the data version (st.cache_resource) need no invalidation: the next
+    rerun attaches to the new version and computes what it uses.
+
+    The store outlives the app, so on creation the file's content digest is compared
+    with the one recorded at the last publication (SOURCE, next to CURRENT); a file
+    replaced while no watcher was running is published right away.
+
+    Args:
+        root (str): Shared-store directory of the source.
+        results (ResultCache): Result cache of this process.
+        path (str): Watched file (default: world_bank.LOCAL_PATH).
+        source (str): Data source passed to `LPIPanel.load` (default 'local').
+        interval (float): Seconds between checks (default 2).
+    """
+
+    def __init__(
+        self,
+        root: str,
+        results: ResultCache,
+        path: str = world_bank.LOCAL_PATH,
+        source: str = "local",
+        interval: float = 2.0
+    ):
+        self.root = root
+        self.results = results
+        self.path = path
+        self.source = source
+        self.interval = interval
+        self.version = shared_store.current_version(root)
+        self.last_change = None
+        self._signature = self._stat()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        if self.version is not None:
+            shared_store.mark_reader(self.version, root)
+        self._thread = None
+        if not self._source_published():
+            self._signature = None
+            self.check()
+
+    def start(self) -> "DataWatcher":
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._work, name="lpi-data-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def check(self) -> dict:
+        """
+        One polling step; returns a summary of the change adopted, or None.
+
+        The summary holds the old and new versions, the changed cells, the changed years
+        and the result-cache entries kept and dropped.
+        """
+        with self._lock:
+            return self._check()
+
+    def _check(self) -> dict:
+        signature = self._stat()
+        if signature != self._signature:
+            if signature is not None:
+                panel = LPIPanel.load(self.source)
+                snapshots.record(panel, self.source)
+                shared_store.publish(panel, self.root)
+                self._record_source()
+            # Only after a successful load, so a half-written file is read again
+            self._signature = signature
+
+        current = shared_store.current_version(self.root)
+        if current is None or current == self.version:
+            return None
+
+        previous, self.version = self.version, current
+        if previous is None:
+            shared_store.mark_reader(current, self.root)
+            return None
+        self.last_change = apply_change(self.results, self.root, previous, current)
+        # Released only now, so no process prunes a version this one still has to diff
+        shared_store.mark_reader(current, self.root)
+        shared_store.prune(self.root)
+        return self.last_change
+
+    def _digest(self) -> str:
+        digest = hashlib.sha1()
+        with open(self.path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _source_published(self) -> bool:
+        """True when the current version was published from the file as it is now, or there is no file."""
+        if self._stat() is None:
+            return True
+        try:
+            with open(os.path.join(self.root, SOURCE_FILE), encoding="utf-8") as f:
+                recorded = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        current = shared_store.current_version(self.root)
+        return recorded.get("sha1") == self._digest() and recorded.get("version") == current
+
+    def _record_source(self) -> None:
+        record = {"path": self.path, "sha1": self._digest(), "version": shared_store.current_version(self.root)}
+        tmp = os.path.join(self.root, f".{SOURCE_FILE}.{os.getpid()}")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp, os.path.join(self.root, SOURCE_FILE))
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _work(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Data watcher check failed.")
@@ -1,46 +1,19 @@
 # src/utils/helpers.py
 
-from typing import List, Dict
+from typing import List, Dict, Iterable
+import time
+import numpy as np
 import requests
 import pandas as pd
 
+from src.data import regions
+
 def map_country_codes(codes: List[str]) -> Dict[str, str]:
-    mapping = {
-        'AT': 'Austria',
-        'BE': 'Belgium',
-        'BG': 'Bulgaria',
-        'HR': 'Croatia',
-        'CY': 'Cyprus',
-        'CZ': 'Czechia',
-        'DK': 'Denmark',
-        'EE': 'Estonia',
-        'FI': 'Finland',
-        'FR': 'France',
-        'DE': 'Germany',
-        'GR': 'Greece',
-        'HU': 'Hungary',
-        'IE': 'Ireland',
-        'IT': 'Italy',
-        'LV': 'Latvia',
-        'LT': 'Lithuania',
-        'LU': 'Luxembourg',
-        'MT': 'Malta',
-        'NL': 'Netherlands',
-        'PL': 'Poland',
-        'PT': 'Portugal',
-        'RO': 'Romania',
-        'SK': 'Slovakia',
-        'SI': 'Slovenia',
-        'ES': 'Spain',
-        'SE': 'Sweden'
-    }
-    return {code: mapping.get(code, "Unknown") for code in codes}
-
-EU_COUNTRIES = [
-    'AT', 'BE', 'BG', 'HR', 'CY', 'CZ', 'DK', 'EE', 'FI', 'FR',
-    'DE', 'GR', 'HU', 'IE', 'IT', 'LV', 'LT', 'LU', 'MT', 'NL',
-    'PL', 'PT', 'RO', 'SK', 'SI', 'ES', 'SE'
-]
+    """World Bank names of ISO-2 codes, from the precomputed registry index (see src/data/regions.py)."""
+    by_iso2 = regions.get_registry().by_iso2
+    return {code: by_iso2[code].name if code in by_iso2 else "Unknown" for code in codes}
+
+EU_COUNTRIES = regions.iso2_codes("EU")
 
 LPI_INDICATORS = {
     "Customs": "LP.LPI.CUST.XQ",
@@ -52,48 +25,108 @@ LPI_INDICATORS = {
     "LPI Aggregate": "LP.LPI.OVRL.XQ"
 }
 
-def fetch_indicator_data(indicator_code: str, indicator_name: str) -> list:
-    records = []
+WB_API_URL = "http://api.worldbank.org/v2"
+API_YEARS = range(2007, 2024)
+API_PAGE_SIZE = 1000
+API_RETRIES = 3
+
+class IndicatorBuffer:
+    """
+    Preallocated (country x year x indicator) float buffer filled straight from API pages.
+
+    Observations are written in place at their integer position, so no per-record
+    objects, long table or pivot are built; `to_frame` returns the wide frame.
+    """
+
+    def __init__(self, country_codes: Iterable[str], indicators: Iterable[str], years: range = API_YEARS):
+        self.codes = list(country_codes)
+        self.code_index = {code: i for i, code in enumerate(self.codes)}
+        self.years = np.arange(years.start, years.stop)
+        self.indicators = list(indicators)
+        self.indicator_index = {name: k for k, name in enumerate(self.indicators)}
+        self.values = np.full((len(self.codes), len(self.years), len(self.indicators)), np.nan)
+        self.names = [None] * len(self.codes)
+
+    def add_page(self, entries: list, indicator_name: str) -> int:
+        """Writes one page of API entries for an indicator; returns the values stored."""
+        k = self.indicator_index[indicator_name]
+        first_year = int(self.years[0])
+        stored = 0
+        for entry in entries:
+            value = entry.get("value")
+            country = entry.get("country") or {}
+            i = self.code_index.get(country.get("id"))
+            if value is None or i is None:
+                continue
+            t = int(entry["date"]) - first_year
+            if 0 <= t < len(self.years):
+                self.values[i, t, k] = value
+                stored += 1
+                if self.names[i] is None:
+                    self.names[i] = country.get("value")
+        return stored
+
+    def to_frame(self) -> pd.DataFrame:
+        """Wide frame (Country, Year, indicators in alphabetical order) of the filled cells."""
+        fallback = map_country_codes(self.codes)
+        names = np.array([name or fallback[code] for code, name in zip(self.codes, self.names)], dtype=object)
+        order = np.argsort(names, kind="stable")
+
+        present = ~np.isnan(self.values[order]).all(axis=2)
+        c_idx, y_idx = np.nonzero(present)
+        rows = order[c_idx]
 
-    for country_code in EU_COUNTRIES:
-        url = f"http://api.worldbank.org/v2/country/{country_code}/indicator/{indicator_code}?format=json&date=2007:2023&per_page=1000"
+        df = pd.DataFrame({"Country": names[rows], "Year": self.years[y_idx]})
+        for name in sorted(self.indicators):
+            df[name] = self.values[rows, y_idx, self.indicator_index[name]]
+        return df
+
+def fetch_indicator_data(indicator_code: str, indicator_name: str, buffer: IndicatorBuffer) -> int:
+    """
+    Downloads one indicator for all the buffer's countries, page by page, into `buffer`.
+
+    All countries go in a single paginated request; each page is parsed and written to
+    the buffer before the next one is requested. Returns the number of values stored.
+
+    A page is requested up to API_RETRIES times. Since one request covers every country,
+    a page that still fails, or comes back without data, raises RuntimeError rather than
+    leaving the indicator missing for all of them.
+    """
+    countries = ";".join(buffer.codes)
+    stored = 0
+    page, pages = 1, 1
+    while page <= pages:
+        url = (f"{WB_API_URL}/country/{countries}/indicator/{indicator_code}?format=json"
+               f"&date={buffer.years[0]}:{buffer.years[-1]}&per_page={API_PAGE_SIZE}&page={page}")
+        data = _get_page(url, f"{indicator_code} (página {page})")
+        if len(data) < 2 or data[1] is None:
+            raise RuntimeError(f"Resposta sem dados para {indicator_code} (página {page}): {data[0] if data else data}")
+        pages = int(data[0].get("pages", 1))
+        stored += buffer.add_page(data[1], indicator_name)
+        page += 1
+
+    return stored
+
+def _get_page(url: str, label: str) -> list:
+    """JSON payload of one API page, retrying with exponential backoff."""
+    for attempt in range(API_RETRIES):
         try:
             response = requests.get(url)
             response.raise_for_status()
-            data = response.json()
-
-            if len(data) > 1 and data[1] is not None:
-                for entry in data[1]:
-                    if entry.get("value") is not None:
-                        records.append({
-                            "Country": entry.get("country", {}).get("value"),
-                            "Year": int(entry.get("date")),
-                            "Indicator": indicator_code,
-                            "Indicator Name": indicator_name,
-                            "Value": entry.get("value")
-                        })
+            return response.json()
         except (requests.RequestException, ValueError) as e:
-            print(f"⚠️ Erro ao baixar dados {indicator_code} para {country_code}: {e}")
+            print(f"⚠️ Erro ao baixar dados {label}, tentativa {attempt + 1}/{API_RETRIES}: {e}")
+            if attempt + 1 == API_RETRIES:
+                raise RuntimeError(f"Erro ao baixar dados {label}: {e}") from e
+            time.sleep(2 ** attempt)
 
-    return records
-
-def load_remote_lpi_data() -> pd.DataFrame:
-    all_records = []
+def load_remote_lpi_data(region: str = regions.DEFAULT_REGION) -> pd.DataFrame:
+    """Downloads every LPI indicator for the economies of `region` (None: all of them)."""
+    buffer = IndicatorBuffer(regions.iso2_codes(region), LPI_INDICATORS)
     for name, code in LPI_INDICATORS.items():
         print(f"🔄 Baixando dados para: {name}")
-        data = fetch_indicator_data(code, name)
-        all_records.extend(data)
-
-    df = pd.DataFrame(all_records)
-    df = df.dropna(subset=["Value"])
-
-    df_pivot = df.pivot_table(
-        index=["Country", "Year"],
-        columns="Indicator Name",
-        values="Value"
-    ).reset_index()
-
-    return df_pivot
+        fetch_indicator_data(code, name, buffer)
+    return buffer.to_frame()
 
 SUBINDICATORS = [
     "Customs",
@@ -0,0 +1,26 @@
+# src/utils/instrumentation.py
+
+import threading
+from collections import Counter
+
+# Process-wide counters of expensive computations. Cached page functions record a
+# computation only when they actually run (a cache miss), so the counters show what
+# each interaction recomputed; see tests/test_rerun_audit.py.
+
+_counts = Counter()
+_lock = threading.Lock()
+
+def record(name: str) -> None:
+    """Counts one execution of the named computation."""
+    with _lock:
+        _counts[name] += 1
+
+def counts() -> dict:
+    """Snapshot of the counters."""
+    with _lock:
+        return dict(_counts)
+
+def reset() -> None:
+    """Clears all counters."""
+    with _lock:
+        _counts.clear()
@@ -0,0 +1,174 @@
+# src/utils/jobs.py
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+def fingerprint(kind: str, *arrays, **params) -> str:
+    """Key of a job: its kind, the bytes of its input arrays and its parameters."""
+    digest = hashlib.sha1(kind.encode("utf-8"))
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str(array.shape).encode("utf-8"))
+        digest.update(array.tobytes() if array.dtype != object else json.dumps(array.tolist()).encode("utf-8"))
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:20]
+
+class Job:
+    """
+    A background computation that produces its results item by item.
+
+    `results` grows while the job runs, so readers can render partial results; it is
+    only appended to, and `snapshot()` returns a consistent copy.
+    """
+
+    def __init__(self, key: str, total: int = None):
+        self.key = key
+        self.total = total
+        self.status = RUNNING
+        self.error = None
+        self.results = []
+        self.owners = set()
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status != RUNNING
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """Asks the job to stop before its next item."""
+        self._cancel.set()
+
+    def snapshot(self) -> tuple[str, list]:
+        """Current status and a copy of the results produced so far."""
+        with self._lock:
+            return self.status, list(self.results)
+
+    def progress(self) -> float:
+        if self.status == DONE:
+            return 1.0
+        return len(self.results) / self.total if self.total else 0.0
+
+    def _append(self, item) -> None:
+        with self._lock:
+            self.results.append(item)
+
+    def _finish(self, status: str, error: Exception = None) -> None:
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.elapsed = time.perf_counter() - self.started
+
+class JobExecutor:
+    """
+    Thread pool for solver jobs shared by every session of the process.
+
+    Jobs are keyed by the fingerprint of their inputs: submitting a key that is already
+    running or finished returns the existing job, so identical requests from different
+    sessions share one computation. Each session registers as an owner of the jobs it
+    watches; when it moves on (`release`) and no other session is watching, a running
+    job is cancelled between items. Finished jobs, failed ones included, are kept in an
+    LRU of `keep_finished` entries and serve as a result cache; only cancelled jobs are
+    started again.
+
+    Args:
+        max_workers (int): Worker threads (default 2).
+        keep_finished (int): Finished jobs kept for reuse (default 64).
+    """
+
+    def __init__(self, max_workers: int = 2, keep_finished: int = 64):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lpi-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.keep_finished = keep_finished
+
+    def submit(self, key: str, work: Callable[[], Iterable], owner: str, total: int = None) -> Job:
+        """
+        Starts the job `key` unless an equivalent one is running or finished.
+
+        Args:
+            key (str): Input fingerprint (see `fingerprint`).
+            work (Callable): Returns an iterator over the job's items; it is only called
+                when a new job actually starts.
+            owner (str): Identifier of the watching session.
+            total (int, optional): Expected number of items, for progress reporting.
+
+        Returns:
+            Job: The new or existing job.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            # Cancelled jobs are restarted (one may still be winding down); a failed job
+            # would fail again on the same inputs, so it is returned like a done one
+            if job is not None and (job.status == CANCELLED or (job.cancelled and not job.finished)):
+                job = None
+            if job is None:
+                job = Job(key, total)
+                self._jobs[key] = job
+                self._pool.submit(self._run, job, work)
+                self._evict()
+            self._jobs.move_to_end(key)
+            job.owners.add(owner)
+            return job
+
+    def get(self, key: str) -> Job:
+        with self._lock:
+            return self._jobs.get(key)
+
+    def release(self, key: str, owner: str) -> None:
+        """The owner stops watching the job; an unwatched running job is cancelled."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return
+            job.owners.discard(owner)
+            if not job.owners and not job.finished:
+                job.cancel()
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in (RUNNING, DONE, CANCELLED, FAILED)}
+
+    def _run(self, job: Job, work: Callable[[], Iterable]) -> None:
+        try:
+            if job.cancelled:
+                job._finish(CANCELLED)
+                return
+            iterator: Iterator = iter(work())
+            for item in iterator:
+                job._append(item)
+                if job.cancelled:
+                    job._finish(CANCELLED)
+                    logger.info(f"Job {job.key} cancelled after {len(job.results)} items.")
+                    return
+            job._finish(DONE)
+        except Exception as e:
+            logger.exception(f"Job {job.key} failed.")
+            job._finish(FAILED, e)
+
+    def _evict(self) -> None:
+        finished = [key for key, job in self._jobs.items() if job.finished]
+        for key in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[key]
@@ -0,0 +1,250 @@
+# src/utils/load_test.py
+
+"""
+Concurrent-session load test of the Streamlit app, run entirely locally.
+
+Each of `workers` processes plays one server worker and runs `sessions` simultaneous
+sessions on threads; every session is an AppTest instance of app.py replaying
+SESSION_SCRIPT (open each of the eight pages through the sidebar and perform its usual
+interactions). The sessions of a worker share its process state as on a server:
+st.cache_resource, the result cache, the DEA job executor (and its deduplication of
+identical jobs) and the prefetcher. Workers share the data and persisted results
+through the shared store.
+
+The latency of every step is one full script run, as the server would do for that
+widget event; steps that start a background DEA job also wait for the job to finish
+and for the rerun that renders it. Latencies are summarized per page and interaction
+as p50/p95/p99, and each worker process reports its peak resident memory.
+
+Usage:
+    python -m src.utils.load_test --sessions 8 --repeat 3 [--workers 2]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, NamedTuple, Optional
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.util import patch_config_options
+
+from src.utils import cache
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "app.py")
+PERCENTILES = (50, 95, 99)
+
+def _widget(at: AppTest, kind: str, label: str):
+    matches = [w for w in getattr(at, kind) if w.label == label]
+    if not matches:
+        raise LookupError(f"No {kind} labelled '{label}' on the page.")
+    return matches[0]
+
+def _select(kind: str, label: str, value) -> Callable[[AppTest], None]:
+    return lambda at: _widget(at, kind, label).set_value(value)
+
+def _pick_other(kind: str, label: str) -> Callable[[AppTest], None]:
+    def action(at: AppTest) -> None:
+        widget = _widget(at, kind, label)
+        widget.set_value(next(o for o in widget.options if str(o) != str(widget.value)))
+    return action
+
+class Step(NamedTuple):
+    page: str
+    interaction: str
+    action: Callable[[AppTest], None]
+    waits_for_job: bool = False
+
+def _open(page: str, waits_for_job: bool = False) -> Step:
+    return Step(page, "open", _select("radio", "Go to", page), waits_for_job)
+
+SESSION_SCRIPT = [
+    _open("Home Page"),
+    _open("Statistical Analysis"),
+    Step("Statistical Analysis", "change X indicator", _select("selectbox", "Indicator for X-axis", "Customs")),
+    Step("Statistical Analysis", "change correction", _select("selectbox", "Multiple-testing correction", "Bonferroni")),
+    _open("Sub-indicators by Country"),
+    Step("Sub-indicators by Country", "change country", _pick_other("selectbox", "Select a country")),
+    _open("Country Analysis"),
+    Step("Country Analysis", "robust trends", _select("radio", "Trend estimator", "Robust (Huber)")),
+    _open("Interactive Map"),
+    Step("Interactive Map", "change year", _pick_other("selectbox", "Select year")),
+    Step("Interactive Map", "change indicator", _select("selectbox", "Select indicator for map", "Customs")),
+    _open("Data Envelopment Analysis (DEA)", waits_for_job=True),
+    Step("Data Envelopment Analysis (DEA)", "change year", _pick_other("selectbox", "Select a year for BoD analysis"),
+         waits_for_job=True),
+    _open("TOPSIS"),
+    Step("TOPSIS", "change year", _pick_other("selectbox", "Select the year for TOPSIS analysis")),
+    Step("TOPSIS", "CRITIC weights", _select("radio", "Weighting scheme", "CRITIC")),
+    _open("Methods Comparison"),
+    Step("Methods Comparison", "change year", _pick_other("selectbox", "Select year for analysis")),
+]
+
+def run_session(script: list[Step] = SESSION_SCRIPT, timeout: float = 300) -> list[dict]:
+    """Replays one session and returns the latency (and error, if any) of every step."""
+    samples = []
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    inicio = time.perf_counter()
+    at.run()
+    samples.append({"page": "Home Page", "interaction": "load", "seconds": time.perf_counter() - inicio,
+                    "error": _error(at)})
+    for step in script:
+        error = None
+        inicio = time.perf_counter()
+        try:
+            step.action(at)
+            at.run()
+            if step.waits_for_job:
+                _wait_for_job(at, timeout)
+            error = _error(at)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        samples.append({"page": step.page, "interaction": step.interaction,
+                        "seconds": time.perf_counter() - inicio, "error": error})
+    return samples
+
+def _wait_for_job(at: AppTest, timeout: float) -> None:
+    """Waits for the session's DEA job, if one is running, and reruns to render its result."""
+    key = at.session_state["bod_job"] if "bod_job" in at.session_state else None
+    job = cache.get_job_executor().get(key) if key is not None else None
+    if job is None or job.finished:
+        return
+    deadline = time.perf_counter() + timeout
+    while not job.finished:
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"DEA job {key} did not finish in {timeout} s")
+        time.sleep(0.02)
+    # The rerun the polling fragment triggers once the job is done
+    at.run()
+
+def _error(at: AppTest) -> Optional[str]:
+    if at.exception:
+        return str(at.exception[0].value)
+    errors = [e.value for e in at.error if "error occurred" in e.value]
+    return errors[0] if errors else None
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB (None where `resource` is unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+@contextmanager
+def _concurrent_sessions():
+    """
+    Lets AppTest sessions run on concurrent threads of one process.
+
+    AppTest sets two process globals for each script run and resets them when it ends:
+    the runtime singleton and the "global.appTest" option. A session finishing would
+    reset them under the sessions still running, so while this is active the option
+    stays set and the runtime of the latest run stays registered. AppTest also compiles
+    the script on every run, and the parser is not thread-safe; sessions share one
+    script cache instead, as they do on a server.
+    """
+    latest = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            latest[:] = [cls._instance]
+        if not latest:
+            raise RuntimeError("Runtime hasn't been created!")
+        return latest[0]
+
+    with patch_config_options({"global.appTest": True}), \
+            patch.object(Runtime, "instance", classmethod(instance)), \
+            patch.object(Runtime, "exists", classmethod(lambda cls: cls._instance is not None or bool(latest))), \
+            patch("streamlit.testing.v1.app_test.ScriptCache", return_value=ScriptCache()):
+        yield
+
+def _sessions(sessions: int, repeat: int, timeout: float) -> list[dict]:
+    """Runs `sessions` simultaneous sessions, each replayed `repeat` times, on threads."""
+    def replay(_):
+        return [sample for _ in range(repeat) for sample in run_session(timeout=timeout)]
+
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        return [sample for samples in pool.map(replay, range(sessions)) for sample in samples]
+
+def _worker(sessions: int, repeat: int, warmup: int, timeout: float) -> dict:
+    with _concurrent_sessions():
+        if warmup:
+            _sessions(sessions, warmup, timeout)
+        inicio = time.perf_counter()
+        samples = _sessions(sessions, repeat, timeout)
+    return {"pid": os.getpid(), "samples": samples, "elapsed": time.perf_counter() - inicio,
+            "peak_memory_mb": peak_memory_mb()}
+
+def summarize(samples: pd.DataFrame) -> pd.DataFrame:
+    """Count, errors and latency percentiles (ms) per page and interaction, in script order."""
+    ordem = {key: i for i, key in enumerate(dict.fromkeys(zip(samples["page"], samples["interaction"])))}
+    linhas = []
+    for (page, interaction), grupo in samples.groupby(["page", "interaction"], sort=False):
+        ms = grupo["seconds"].to_numpy() * 1000
+        linha = {"Page": page, "Interaction": interaction, "Runs": len(grupo),
+                 "Errors": int(grupo["error"].notna().sum())}
+        linha.update({f"p{q}": np.percentile(ms, q) for q in PERCENTILES})
+        linha["Max"] = ms.max()
+        linhas.append((ordem[(page, interaction)], linha))
+    return pd.DataFrame([linha for _, linha in sorted(linhas, key=lambda item: item[0])])
+
+def run_load_test(
+    sessions: int = 4, repeat: int = 1, warmup: int = 1, timeout: float = 300, workers: int = 1
+) -> dict:
+    """
+    Runs `sessions` simultaneous sessions in each of `workers` worker processes.
+
+    Returns:
+        dict: "summary" (per page and interaction), "workers" (pid, concurrent sessions,
+        elapsed time and peak memory of each worker process) and "samples" (every step).
+    """
+    # Fresh interpreters, so each worker's memory is that of a server worker alone
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(_worker, sessions, repeat, warmup, timeout) for _ in range(workers)]
+        resultados = [future.result() for future in futures]
+
+    samples = pd.DataFrame([sample for r in resultados for sample in r["samples"]])
+    workers_df = pd.DataFrame([
+        {"Worker": r["pid"], "Sessions": sessions, "Elapsed (s)": r["elapsed"],
+         "Peak memory (MB)": r["peak_memory_mb"]}
+        for r in resultados
+    ])
+    return {"summary": summarize(samples), "workers": workers_df, "samples": samples}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent-session load test of the LPI app.")
+    parser.add_argument("--sessions", type=int, default=4, help="simultaneous sessions per worker (default 4)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1)")
+    parser.add_argument("--repeat", type=int, default=1, help="times each session replays the script (default 1)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed replays per session first (default 1)")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per script run")
+    parser.add_argument("--csv", help="also write every sample to this CSV file")
+    args = parser.parse_args()
+
+    result = run_load_test(args.sessions, args.repeat, args.warmup, args.timeout, args.workers)
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.float_format", "{:.1f}".format):
+        print("Latency per page and interaction (ms):")
+        print(result["summary"].to_string(index=False))
+        print()
+        print(result["workers"].to_string(index=False))
+    if args.csv:
+        result["samples"].to_csv(args.csv, index=False)
+
+    errors = int(result["summary"]["Errors"].sum())
+    if errors:
+        print(f"{errors} steps failed.")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# src/utils/prefetch.py
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Hashable, Iterable, NamedTuple, Sequence
+
+from src.utils.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+class PrefetchTask(NamedTuple):
+    key: Hashable
+    compute: Callable[[], object]
+    tags: tuple = ()
+
+def neighbours(values: Sequence, current, radius: int = 2) -> list:
+    """
+    Values around `current` in `values`, nearest first (the next one before the previous).
+
+    Example: neighbours([2007, 2010, 2012, 2014], 2012) -> [2014, 2010, 2007].
+    """
+    ordered = sorted(values)
+    if current not in ordered:
+        return []
+    i = ordered.index(current)
+    result = []
+    for step in range(1, radius + 1):
+        for j in (i + step, i - step):
+            if 0 <= j < len(ordered):
+                result.append(ordered[j])
+    return result
+
+class Prefetcher:
+    """
+    Background thread that precomputes likely next results into the `ResultCache`.
+
+    Pages call `schedule` after serving a selection with the tasks for the neighbouring
+    selections; a new call for the same group replaces that group's pending tasks, so
+    the queue always follows the user's latest position. The worker only runs while
+    `busy()` is False (idle capacity) and keeps its duty cycle under `cpu_budget`: after
+    a task that took t seconds it sleeps t·(1 - budget)/budget.
+
+    Args:
+        results (ResultCache): Cache that receives the results.
+        cpu_budget (float): Fraction of one core the prefetcher may use (default 0.25).
+        busy (Callable, optional): Returns True while user work is running.
+    """
+
+    def __init__(self, results: ResultCache, cpu_budget: float = 0.25, busy: Callable[[], bool] = None):
+        if not 0 < cpu_budget <= 1:
+            raise ValueError("cpu_budget must be in (0, 1].")
+        self.results = results
+        self.cpu_budget = cpu_budget
+        self.busy = busy or (lambda: False)
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stats = {"scheduled": 0, "computed": 0, "skipped": 0, "failed": 0, "busy_seconds": 0.0}
+
+    def schedule(self, group: str, tasks: Iterable[PrefetchTask]) -> None:
+        """Replaces the pending tasks of `group` with `tasks`, in priority order."""
+        tasks = [task for task in tasks if task.key not in self.results]
+        with self._cond:
+            self._queue = deque(item for item in self._queue if item[0] != group)
+            self._queue.extend((group, task) for task in tasks)
+            self._stats["scheduled"] += len(tasks)
+            self._ensure_worker()
+            self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return dict(self._stats, pending=len(self._queue))
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._work, name="lpi-prefetch", daemon=True)
+            self._thread.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                _, task = self._queue.popleft()
+
+            if task.key in self.results:
+                with self._cond:
+                    self._stats["skipped"] += 1
+                continue
+            while self.busy():
+                time.sleep(0.1)
+
+            start = time.perf_counter()
+            try:
+                self.results.get_or_compute(task.key, task.compute, task.tags, prefetch=True)
+                outcome = "computed"
+            except Exception:
+                logger.exception(f"Prefetch of {task.key!r} failed.")
+                outcome = "failed"
+            elapsed = time.perf_counter() - start
+
+            with self._cond:
+                self._stats[outcome] += 1
+                self._stats["busy_seconds"] += elapsed
+            time.sleep(elapsed * (1 - self.cpu_budget) / self.cpu_budget)
@@ -0,0 +1,343 @@
+# src/utils/result_cache.py
+
+import hashlib
+import logging
+import os
+import pickle
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+def _private_directory(path: str) -> bool:
+    """
+    Creates `path` (mode 0700) if needed and tells whether only the current user can change it.
+
+    Persisted entries are pickles, so they are read only from a directory owned by the
+    current user and not writable by others, whose parents are owned by the user or root
+    and are either not writable by others or sticky (such as /tmp and /dev/shm).
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        # Windows: the temporary directory is already per user
+        return True
+    uid = os.getuid()
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != uid or info.st_mode & 0o077:
+        return False
+    parent = os.path.dirname(os.path.realpath(path))
+    while True:
+        info = os.stat(parent)
+        if info.st_uid not in (0, uid) or (info.st_mode & 0o022 and not info.st_mode & stat.S_ISVTX):
+            return False
+        if os.path.dirname(parent) == parent:
+            return True
+        parent = os.path.dirname(parent)
+
+class _Entry:
+    __slots__ = ("value", "tags", "prefetched")
+
+    def __init__(self, value, tags: frozenset, prefetched: bool):
+        self.value = value
+        self.tags = tags
+        self.prefetched = prefetched
+
+class ResultCache:
+    """
+    Process-wide LRU of computed results (model outputs, figures) shared by all sessions.
+
+    Keys must include the data version (or be content fingerprints) and have a stable
+    repr. Each entry carries tags describing what it depends on (e.g. "year:2022",
+    "pooled"), so that entries can be invalidated selectively. Concurrent requests for
+    the same key wait for the single computation in flight, whether it was started by a
+    page or by the prefetcher.
+
+    With a `directory`, entries stored with `persist=True` are also pickled to disk
+    (header with key and tags, then the value) and a memory miss falls back to them, so
+    results written by the warm-up command are shared by every server worker. The
+    directory is created with mode 0700 and is only used if no other user can write to
+    it (see `_private_directory`); otherwise the cache works in memory only.
+
+    Hit-rate metrics count page requests only: a request answered by an entry (or an
+    in-flight computation) started by the prefetcher is a prefetch hit.
+
+    Args:
+        max_entries (int): Maximum number of entries kept in memory (default 512).
+        directory (str, optional): Directory of the persisted entries.
+    """
+
+    def __init__(self, max_entries: int = 512, directory: str = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "prefetch_hits": 0, "prefetched": 0, "invalidated": 0}
+        self._private = None
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable, default=None):
+        """
+        Returns the cached value for `key`, or `default` (counted as a miss).
+
+        If the key is being computed (e.g. by the prefetcher), waits for the result.
+        """
+        with self._lock:
+            pending = self._inflight.get(key)
+        if pending is not None:
+            pending.wait()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return self._hit(key, entry)
+        value = self._load(key)
+        with self._lock:
+            self._stats["misses" if value is _MISSING else "hits"] += 1
+        return default if value is _MISSING else value
+
+    def put(
+        self,
+        key: Hashable,
+        value,
+        tags: Iterable[str] = (),
+        prefetched: bool = False,
+        persist: bool = False
+    ) -> None:
+        """Stores `value` under `key` with the given dependency tags, evicting the oldest entries."""
+        tags = frozenset(tags)
+        if persist and self._disk():
+            self._write(key, tags, value)
+        with self._lock:
+            self._entries[key] = _Entry(value, tags, prefetched)
+            self._entries.move_to_end(key)
+            if prefetched:
+                self._stats["prefetched"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], object],
+        tags: Iterable[str] = (),
+        prefetch: bool = False
+    ):
+        """
+        Returns the cached value for `key`, computing and storing it if needed.
+
+        Args:
+            key (Hashable): Cache key (including the data version).
+            compute (Callable): Produces the value; runs at most once per key at a time.
+            tags (Iterable[str]): Dependencies of the value, for `invalidate`.
+            prefetch (bool): True when called by the prefetcher (not counted as a request).
+
+        Returns:
+            The cached or computed value.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    return entry.value if prefetch else self._hit(key, entry)
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = self._inflight[key] = threading.Event()
+                    break
+            # Another thread is computing this key: wait and read the stored value
+            pending.wait()
+
+        try:
+            value = self._load(key)
+            if value is not _MISSING:
+                if not prefetch:
+                    with self._lock:
+                        self._stats["hits"] += 1
+                return value
+            if not prefetch:
+                with self._lock:
+                    self._stats["misses"] += 1
+            value = compute()
+            self.put(key, value, tags, prefetched=prefetch)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set()
+
+    def invalidate(self, tags: Iterable[str] = None, predicate: Callable[[Hashable], bool] = None) -> int:
+        """
+        Drops the entries carrying any of `tags` or whose key satisfies `predicate`.
+
+        With neither argument, drops everything. Persisted entries are removed too.
+        Returns the number of entries removed from memory.
+        """
+        tags = None if tags is None else set(tags)
+
+        def doomed(key, entry_tags) -> bool:
+            return ((tags is None and predicate is None)
+                    or (tags is not None and bool(entry_tags & tags))
+                    or (predicate is not None and predicate(key)))
+
+        with self._lock:
+            removed = [key for key, entry in self._entries.items() if doomed(key, entry.tags)]
+            for key in removed:
+                del self._entries[key]
+            self._stats["invalidated"] += len(removed)
+        self.purge_disk(lambda key, entry_tags: not doomed(key, entry_tags))
+        return len(removed)
+
+    def rebase(self, old_version: str, new_version: str, stale_tags: Iterable[str]) -> dict:
+        """
+        Carries the entries of one data version over to the next, except the stale ones.
+
+        Applies to tuple keys of the form (name, version, ...), including the regional
+        versions "<version>@<region>" of `LPIPanel.for_region`. An entry is carried over
+        (re-keyed with `new_version`) when it has at least one "year:" tag and none of
+        `stale_tags`; otherwise its dependencies changed or are unknown and it is dropped.
+        Persisted entries are re-keyed the same way.
+
+        Returns:
+            dict: Number of entries "kept" and "dropped" (memory and disk).
+        """
+        stale = frozenset(stale_tags)
+
+        def rekey(key):
+            if not (isinstance(key, tuple) and len(key) > 1 and isinstance(key[1], str)):
+                return None
+            version, _, region = key[1].partition("@")
+            if version != old_version:
+                return None
+            return (key[0], f"{new_version}@{region}" if region else new_version) + key[2:]
+
+        def carried(tags: frozenset) -> bool:
+            return any(tag.startswith("year:") for tag in tags) and not tags & stale
+
+        counts = {"kept": 0, "dropped": 0}
+        with self._lock:
+            for key in list(self._entries):
+                new_key = rekey(key)
+                if new_key is None:
+                    continue
+                entry = self._entries.pop(key)
+                if carried(entry.tags):
+                    entry.prefetched = False
+                    self._entries[new_key] = entry
+                    counts["kept"] += 1
+                else:
+                    counts["dropped"] += 1
+            self._stats["invalidated"] += counts["dropped"]
+
+        if self._disk():
+            for name in os.listdir(self.directory):
+                if not name.endswith(".pkl"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    with open(path, "rb") as f:
+                        key, tags = pickle.load(f)
+                        new_key = rekey(key)
+                        value = pickle.load(f) if new_key is not None and carried(tags) else None
+                    if new_key is None:
+                        continue
+                    if value is not None:
+                        self._write(new_key, tags, value)
+                    os.remove(path)
+                    counts["kept" if value is not None else "dropped"] += 1
+                except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+                    # Another worker rebased or removed it first
+                    continue
+        return counts
+
+    def purge_disk(self, keep: Callable[[Hashable, frozenset], bool]) -> int:
+        """Deletes the persisted entries for which `keep(key, tags)` is False; returns how many."""
+        if not self._disk():
+            return 0
+        removed = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "rb") as f:
+                    key, tags = pickle.load(f)
+                if keep(key, tags):
+                    continue
+                os.remove(path)
+                removed += 1
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+                continue
+        return removed
+
+    def stats(self) -> dict:
+        """Counters plus the hit rate of page requests (hits and prefetch hits over requests)."""
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries))
+        requests = stats["hits"] + stats["prefetch_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["prefetch_hits"]) / requests if requests else 0.0
+        stats["prefetch_hit_rate"] = stats["prefetch_hits"] / requests if requests else 0.0
+        return stats
+
+    def _hit(self, key: Hashable, entry: _Entry):
+        # Called with the lock held
+        self._entries.move_to_end(key)
+        self._stats["prefetch_hits" if entry.prefetched else "hits"] += 1
+        entry.prefetched = False
+        return entry.value
+
+    def _disk(self) -> bool:
+        """Whether the persisted entries can be used (checked once per cache)."""
+        if not self.directory:
+            return False
+        if self._private is None:
+            try:
+                self._private = _private_directory(self.directory)
+            except OSError:
+                logger.exception(f"Cannot create the results directory {self.directory}.")
+                self._private = False
+            else:
+                if not self._private:
+                    logger.warning(f"{self.directory} can be written by other users; persisted results are disabled.")
+        return self._private
+
+    def _path(self, key: Hashable) -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.directory, f"{digest}.pkl")
+
+    def _load(self, key: Hashable):
+        """Reads a persisted entry into memory; _MISSING if there is none."""
+        if not self._disk():
+            return _MISSING
+        try:
+            with open(self._path(key), "rb") as f:
+                stored_key, tags = pickle.load(f)
+                if stored_key != key:
+                    return _MISSING
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return _MISSING
+        except Exception:
+            logger.exception(f"Unreadable persisted result for {key!r}; recomputing.")
+            return _MISSING
+        self.put(key, value, tags)
+        return value
+
+    def _write(self, key: Hashable, tags: frozenset, value) -> None:
+        # Written to a temporary file and renamed, so readers never see a partial entry
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((key, tags), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
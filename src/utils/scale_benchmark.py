@@ -0,0 +1,225 @@
+# src/utils/scale_benchmark.py
+
+"""
+Scaling benchmark of every pipeline layer, from the EU-27 to a global-sized panel.
+
+A synthetic LPI panel with the shape of the real data (same editions and indicators,
+about 5% missing cells) is generated for the EU members (1x) and for the first
+`scale` x 27 economies of the region registry (src/data/regions.py). Each layer runs
+on both sizes and its best-of-`repeat` time gives an empirical scaling exponent
+log(t_large / t_small) / log(scale), which is checked against the layer's expected
+complexity in the number of countries n:
+
+    Ingestion     IndicatorBuffer filled from paginated API entries     O(n)
+    Panel         LPIPanel.from_frame and region subset                 O(n)
+    Diff          diff_panels against a one-cell change                 O(n)
+    DEA           BoD model of the latest year (n LPs of n rows)        O(n^2)
+    TOPSIS        evaluator build and ranking of every year             O(n log n)
+    PROMETHEE     pairwise preference flows of the latest year          O(n^2)
+    Consensus     Borda, Copeland and Kemeny of three rankings          O(n^3)
+    Statistics    correlation significance of every indicator pair      O(n)
+    Trends        batched OLS trends of every series                    O(n)
+    Peers         PeerIndex build and k-NN query of every country       O(n log n)
+    Map           choropleth figure of the region                       O(n)
+
+A layer fails when its exponent exceeds the expected one by more than `tolerance`.
+
+Usage:
+    python -m src.utils.scale_benchmark [--scale 6] [--repeat 3] [--csv out.csv]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from src.data import regions
+from src.data.panel import LPIPanel, diff_panels
+from src.utils.helpers import API_PAGE_SIZE, LPI_INDICATORS, SUBINDICATORS, IndicatorBuffer
+
+YEARS = (2007, 2010, 2012, 2014, 2016, 2018, 2023)
+MISSING_RATE = 0.05
+
+class Layer(NamedTuple):
+    name: str
+    expected: float
+    run: Callable[[dict], object]
+
+def synthetic_frame(countries: list[str], seed: int = 0) -> pd.DataFrame:
+    """Long LPI-like frame (Country, Year, indicators) for the given countries."""
+    rng = np.random.default_rng(seed)
+    n, t = len(countries), len(YEARS)
+    nivel = rng.uniform(2.0, 4.2, size=(n, 1, 1))
+    sub = np.clip(nivel + rng.normal(0, 0.25, size=(n, t, len(SUBINDICATORS))), 1.0, 5.0)
+    sub[rng.random(sub.shape) < MISSING_RATE] = np.nan
+    df = pd.DataFrame({"Country": np.repeat(countries, t), "Year": np.tile(YEARS, n)})
+    df[SUBINDICATORS] = sub.reshape(n * t, -1)
+    df["LPI Aggregate"] = np.nanmean(sub, axis=2).ravel()
+    return df[["Country", "Year"] + sorted(LPI_INDICATORS)]
+
+def _api_pages(df: pd.DataFrame) -> dict:
+    """World Bank API entries of the frame, split in pages per indicator."""
+    by_name = regions.get_registry().by_name
+    pages = {}
+    for name in LPI_INDICATORS:
+        valid = df[df[name].notna()]
+        entries = [
+            {"country": {"id": by_name[c].iso2, "value": c}, "date": str(y), "value": float(v)}
+            for c, y, v in zip(valid["Country"], valid["Year"], valid[name])
+        ]
+        pages[name] = [entries[i:i + API_PAGE_SIZE] for i in range(0, len(entries), API_PAGE_SIZE)]
+    return pages
+
+def prepare(countries: list[str], region: str) -> dict:
+    """Inputs shared by the layers for one panel size (built outside the timings)."""
+    df = synthetic_frame(countries)
+    panel = LPIPanel.from_frame(df)
+    panel.version = "benchmark"
+    alterado = df.copy()
+    alterado.loc[0, "Customs"] = 1.0 if alterado.loc[0, "Customs"] != 1.0 else 2.0
+    latest = max(panel.available_years(SUBINDICATORS))
+    return {
+        "countries": countries,
+        "region": region,
+        "frame": df,
+        "pages": _api_pages(df),
+        "codes": [e.iso2 for e in map(regions.get_registry().lookup, countries)],
+        "panel": panel,
+        "changed": LPIPanel.from_frame(alterado),
+        "latest": latest,
+        "slice": panel.slice_year(latest, SUBINDICATORS)
+    }
+
+def _ingest(ctx: dict) -> pd.DataFrame:
+    buffer = IndicatorBuffer(ctx["codes"], LPI_INDICATORS, range(YEARS[0], YEARS[-1] + 1))
+    for name, pages in ctx["pages"].items():
+        for page in pages:
+            buffer.add_page(page, name)
+    return buffer.to_frame()
+
+def _panel(ctx: dict) -> LPIPanel:
+    return LPIPanel.from_frame(ctx["frame"]).for_region(ctx["region"])
+
+def _dea(ctx: dict):
+    from src.models import dea
+    return dea.bod_model(ctx["slice"])
+
+def _topsis(ctx: dict):
+    from src.models import topsis
+    evaluator = topsis.TopsisIncremental.from_panel(ctx["panel"], SUBINDICATORS)
+    pesos = [1.0] * len(SUBINDICATORS)
+    return [evaluator.ranking(ano, pesos) for ano in evaluator.anos]
+
+def _promethee(ctx: dict):
+    from src.models.promethee import promethee
+    return promethee(ctx["slice"], SUBINDICATORS, [1.0] * len(SUBINDICATORS))
+
+def _consensus(ctx: dict):
+    from src.models.rank_aggregation import consensus_rankings
+    df = ctx["panel"].frame().dropna(subset=SUBINDICATORS).copy()
+    for i, col in enumerate(SUBINDICATORS[:3]):
+        df[f"R{i}"] = df.groupby("Year")[col].rank(ascending=False, method="min")
+    return consensus_rankings(df, ["R0", "R1", "R2"])
+
+def _statistics(ctx: dict):
+    from src.analysis.stat_analysis import correlation_significance
+    return correlation_significance(ctx["frame"], sorted(LPI_INDICATORS))
+
+def _trends(ctx: dict):
+    from src.analysis.trends import fit_trends
+    return fit_trends(ctx["panel"])
+
+def _peers(ctx: dict):
+    from src.analysis.similarity import PeerIndex
+    index = PeerIndex(ctx["panel"])
+    ano = ctx["latest"]
+    presentes = set(index.countries[index.years == ano])
+    return [index.peers(c, ano) for c in ctx["countries"] if c in presentes]
+
+def _map(ctx: dict):
+    from src.pages.mapa_interativo import build_map_figure
+    return build_map_figure(ctx["panel"], (ctx["latest"],), "LPI Aggregate", (), None, ctx["region"])
+
+LAYERS = (
+    Layer("Ingestion", 1.0, _ingest),
+    Layer("Panel", 1.0, _panel),
+    Layer("Diff", 1.0, lambda ctx: diff_panels(ctx["panel"], ctx["changed"])),
+    Layer("DEA", 2.0, _dea),
+    Layer("TOPSIS", 1.0, _topsis),
+    Layer("PROMETHEE", 2.0, _promethee),
+    Layer("Consensus", 3.0, _consensus),
+    Layer("Statistics", 1.0, _statistics),
+    Layer("Trends", 1.0, _trends),
+    Layer("Peers", 1.0, _peers),
+    Layer("Map", 1.0, _map)
+)
+
+def _best_time(run: Callable[[dict], object], ctx: dict, repeat: int) -> float:
+    tempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        run(ctx)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+def run_benchmark(scale: int = 6, repeat: int = 3, tolerance: float = 0.35) -> pd.DataFrame:
+    """
+    Times every layer at the EU size and at `scale` times it.
+
+    Returns:
+        pd.DataFrame: Per layer, the times (ms), their ratio, the empirical and expected
+        exponents and whether the layer is within the tolerance.
+    """
+    registry = regions.get_registry()
+    base = registry.countries("EU")
+    world = registry.countries(regions.WORLD)
+    if scale * len(base) > len(world):
+        raise ValueError(f"The registry has {len(world)} economies; the largest scale is {len(world) // len(base)}.")
+    # Spread the sample over the whole registry rather than its first letters
+    grande = [world[i] for i in np.linspace(0, len(world) - 1, scale * len(base)).round().astype(int)]
+
+    pequeno_ctx = prepare(base, "EU")
+    grande_ctx = prepare(grande, regions.WORLD)
+    rows = []
+    for layer in LAYERS:
+        layer.run(pequeno_ctx)  # untimed: imports and first-call caches
+        t_small = _best_time(layer.run, pequeno_ctx, repeat)
+        t_large = _best_time(layer.run, grande_ctx, repeat)
+        expoente = np.log(t_large / t_small) / np.log(scale)
+        rows.append({
+            "Layer": layer.name,
+            f"{len(base)} countries (ms)": 1000 * t_small,
+            f"{len(grande)} countries (ms)": 1000 * t_large,
+            "Ratio": t_large / t_small,
+            "Exponent": expoente,
+            "Expected": layer.expected,
+            "Status": "ok" if expoente <= layer.expected + tolerance else "FAIL"
+        })
+    return pd.DataFrame(rows)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the LPI pipeline layers.")
+    parser.add_argument("--scale", type=int, default=6, help="size of the large panel in EU-27 multiples (default 6)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per layer and size; the best is kept")
+    parser.add_argument("--tolerance", type=float, default=0.35, help="allowed excess over the expected exponent")
+    parser.add_argument("--csv", help="also write the report to this CSV file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    report = run_benchmark(args.scale, args.repeat, args.tolerance)
+    with pd.option_context("display.width", 200, "display.float_format", "{:.2f}".format):
+        print(report.to_string(index=False))
+    if args.csv:
+        report.to_csv(args.csv, index=False)
+    falhas = report.loc[report["Status"] != "ok", "Layer"].tolist()
+    if falhas:
+        print(f"Layers scaling worse than expected: {falhas}")
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
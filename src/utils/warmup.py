@@ -0,0 +1,292 @@
+# src/utils/warmup.py
+
+"""
+Cache warm-up: precomputes every page's reachable results before the app serves users.
+
+Publishes the panel to the shared store (so no worker parses the CSV), then computes in
+parallel, for every year, indicator and the default country set, the results the pages
+read from the shared result cache:
+
+    DEA         BoD scores under the default weight restrictions (and, with --sweep-cube,
+                the precomputed alpha/beta sweep cube)
+    TOPSIS      ranking and chart for each weighting scheme (Custom = the default sliders)
+    Map         single-year maps of every indicator and the default two-year comparison
+    Comparison  DEA and TOPSIS rankings, consensus and rank agreement for each scheme
+
+The other pages compute their results per session (not in the result cache), so they
+cannot be warmed; the report lists them with coverage 0.
+
+Results are persisted (pickled, figures included) to the result-cache directory, where
+every server worker finds them on its first request. Entries from earlier runs that
+are no longer reachable are removed. Coverage and time are reported per page and a
+readiness marker is written for the current data version.
+
+Results are computed for one region of src/data/regions.py (default: the app's default
+region), since region subsets have their own data version.
+
+Usage:
+    python -m src.utils.warmup [--workers N] [--sweep-cube] [--region NAME]
+    python -m src.utils.warmup --check      # exit status 0 when the app is warm
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import NamedTuple
+
+import pandas as pd
+
+from src.data import regions, shared_store
+from src.data.panel import LPIPanel
+from src.utils import cache
+from src.utils.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+READY_FILE = "READY"
+# Every page of the app (app.py), in menu order, as named in the report
+PAGES = ("Home", "Statistics", "Sub-indicators", "Country Analysis", "Map", "DEA", "TOPSIS", "Comparison")
+
+class WarmTask(NamedTuple):
+    page: str
+    kind: str
+    args: tuple
+
+# Per-process state of the pool workers (see _init_worker)
+_worker_panel = None
+_worker_results = None
+_worker_evaluator = None
+_worker_region = None
+_MISSING = object()
+
+def plan(panel: LPIPanel, sweep_cube: bool = False) -> list[WarmTask]:
+    """Every (page, parameters) combination reachable with the default country set."""
+    from src.pages import analise_envoltoria, avaliacao_topsis, comparacao_metodos, mapa_interativo
+    from src.utils.helpers import SUBINDICATORS
+
+    anos = sorted(panel.years.tolist(), reverse=True)
+    tasks = [WarmTask("DEA", "bod", (ano,)) for ano in panel.available_years(analise_envoltoria.OUTPUTS)]
+    if sweep_cube:
+        tasks.append(WarmTask("DEA", "sweep_cube", ()))
+    # Objective weights exist only for years with two complete countries (as on the page)
+    tasks += [
+        WarmTask("TOPSIS", "topsis", (ano, metodo))
+        for ano in panel.available_years(analise_envoltoria.OUTPUTS)
+        for metodo in avaliacao_topsis.WEIGHTING_OPTIONS.values()
+        if metodo is None or ano in _objective_weights(metodo, panel).index
+    ]
+    for indicador in mapa_interativo.INDICATORS:
+        for ano in anos:
+            tasks.append(WarmTask("Map", "map", ((ano,), indicador)))
+            segundo = next((outro for outro in anos if outro != ano), None)
+            if segundo is not None:
+                tasks.append(WarmTask("Map", "map", ((ano, segundo), indicador)))
+    tasks += [
+        WarmTask("Comparison", "comparison", (ano, metodo))
+        for ano in panel.available_years(["LPI Aggregate"] + SUBINDICATORS)
+        for metodo in comparacao_metodos.WEIGHTING_SCHEMES.values()
+    ]
+    return tasks
+
+def _init_worker(root: str, version: str, directory: str, region: str) -> None:
+    global _worker_panel, _worker_results, _worker_region
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    _worker_region = region
+    _worker_panel = shared_store.attach(version, root).for_region(region)
+    _worker_results = ResultCache(directory=directory)
+
+@lru_cache(maxsize=None)
+def _objective_weights(metodo: str, panel: LPIPanel = None) -> pd.DataFrame:
+    from src.models import weighting
+    from src.utils.helpers import SUBINDICATORS
+    return weighting.objective_weights(panel if panel is not None else _worker_panel, SUBINDICATORS, metodo)
+
+def _build(task: WarmTask):
+    """The page's own result-cache task for the parameters (same key and computation)."""
+    global _worker_evaluator
+    from src.pages import analise_envoltoria, avaliacao_topsis, mapa_interativo
+    from src.models import topsis
+    from src.utils.helpers import SUBINDICATORS
+
+    panel = _worker_panel
+    if task.kind == "bod":
+        (ano,) = task.args
+        return analise_envoltoria.bod_task(
+            panel.slice_year(ano, analise_envoltoria.OUTPUTS), ano, analise_envoltoria.DEFAULT_RESTRICTIONS
+        )
+    if task.kind == "topsis":
+        ano, metodo = task.args
+        if _worker_evaluator is None:
+            _worker_evaluator = topsis.TopsisIncremental.from_panel(panel, SUBINDICATORS)
+        if metodo is None:
+            pesos = avaliacao_topsis.default_custom_weights(SUBINDICATORS)
+        else:
+            pesos = _objective_weights(metodo).loc[ano].tolist()
+        return avaliacao_topsis.topsis_task(_worker_evaluator, panel.version, ano, pesos)
+    if task.kind == "map":
+        anos, indicador = task.args
+        geojson = mapa_interativo._geojson_for(475 if len(anos) == 2 else 950, _worker_region, panel.countries)
+        return mapa_interativo.map_task(panel, anos, indicador, tuple(sorted(panel.countries)), geojson, _worker_region)
+    raise ValueError(f"Unknown warm-up task: {task.kind}")
+
+def _store(prepared):
+    """Value of a result-cache task, computed and persisted unless this worker already holds it."""
+    value = _worker_results.get(prepared.key, _MISSING)
+    if value is _MISSING:
+        value = prepared.compute()
+        _worker_results.put(prepared.key, value, prepared.tags, persist=True)
+    return value
+
+def _comparison(ano: int, metodo: str) -> list:
+    """Persists the Methods Comparison results of a year and scheme; returns their keys."""
+    from src.pages import comparacao_metodos
+    panel = _worker_panel
+    pesos_anos = None if metodo is None else _objective_weights(metodo)
+    tasks = [
+        comparacao_metodos.dea_task(panel, panel.version, ano),
+        comparacao_metodos.topsis_task(panel, panel.version, ano, metodo, pesos_anos)
+    ]
+    # The consensus and the agreement are computed from the two rankings (as on the page)
+    comparativo = comparacao_metodos.merge_rankings(*(_store(prepared) for prepared in tasks))
+    tasks.append(comparacao_metodos.consensus_task(comparativo, panel.version, ano, metodo))
+    if comparacao_metodos.has_rank_agreement(comparativo):
+        tasks.append(comparacao_metodos.rank_agreement_task(comparativo, panel.version, ano, metodo))
+    for prepared in tasks[2:]:
+        _store(prepared)
+    return [prepared.key for prepared in tasks]
+
+def _run(task: WarmTask) -> dict:
+    inicio = time.perf_counter()
+    try:
+        if task.kind == "sweep_cube":
+            from src.models import dea_sweep
+            from src.pages import analise_envoltoria
+            dea_sweep.load_or_build(_worker_panel.frame(), analise_envoltoria.OUTPUTS)
+            keys = []
+        elif task.kind == "comparison":
+            keys = _comparison(*task.args)
+        else:
+            prepared = _build(task)
+            keys = [prepared.key]
+            _worker_results.put(prepared.key, prepared.compute(), prepared.tags, persist=True)
+        error = None
+    except Exception as e:
+        logger.exception(f"Warm-up task {task} failed.")
+        keys, error = [], f"{type(e).__name__}: {e}"
+    return {"page": task.page, "keys": keys, "seconds": time.perf_counter() - inicio, "error": error}
+
+def warm_up(
+    workers: int = None, sweep_cube: bool = False, source: str = "local", region: str = regions.DEFAULT_REGION
+) -> pd.DataFrame:
+    """
+    Publishes the data, computes and persists every reachable result in parallel and
+    writes the readiness marker.
+
+    Returns:
+        pd.DataFrame: Tasks, completed, failed, coverage and times per page (every page
+        of the app, with no tasks and coverage 0 for those that cannot be warmed).
+    """
+    root = cache._store_root(source)
+    directory = cache.results_dir(source)
+    report = []
+
+    inicio = time.perf_counter()
+    version = shared_store.current_version(root)
+    if version is None:
+        version = shared_store.publish(LPIPanel.load(source), root)
+    panel = shared_store.attach(version, root).for_region(region)
+    report.append({"Page": "Data", "Tasks": 1, "Completed": 1, "Failed": 0,
+                   "CPU time (s)": time.perf_counter() - inicio, "Ready after (s)": time.perf_counter() - inicio})
+
+    tasks = plan(panel, sweep_cube)
+    workers = workers or max(1, (os.cpu_count() or 1) - 1)
+    context = multiprocessing.get_context("spawn")
+    resultados = []
+    ultimo = {}
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                             initargs=(root, version, directory, region)) as pool:
+        inicio = time.perf_counter()
+        futures = [pool.submit(_run, task) for task in tasks]
+        for future in as_completed(futures):
+            resultado = future.result()
+            resultados.append(resultado)
+            ultimo[resultado["page"]] = time.perf_counter() - inicio
+
+    escritos = {key for r in resultados for key in r["keys"]}
+    removidos = ResultCache(directory=directory).purge_disk(lambda key, tags: key in escritos)
+    logger.info(f"{len(escritos)} results persisted; {removidos} stale entries removed.")
+
+    df = pd.DataFrame(resultados, columns=["page", "keys", "seconds", "error"])
+    for page in PAGES:
+        grupo = df[df["page"] == page]
+        report.append({
+            "Page": page,
+            "Tasks": len(grupo),
+            "Completed": int(grupo["error"].isna().sum()),
+            "Failed": int(grupo["error"].notna().sum()),
+            "CPU time (s)": grupo["seconds"].sum(),
+            "Ready after (s)": ultimo.get(page, 0.0)
+        })
+    report = pd.DataFrame(report)
+    report["Coverage"] = (report["Completed"] / report["Tasks"].where(report["Tasks"] > 0)).fillna(0.0)
+
+    _write_marker(root, version, report)
+    return report
+
+def _write_marker(root: str, version: str, report: pd.DataFrame) -> None:
+    marker = {
+        "version": version,
+        "completed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "coverage": {row["Page"]: row["Coverage"] for _, row in report.iterrows()}
+    }
+    tmp = os.path.join(root, f".{READY_FILE}.{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(marker, f, indent=2)
+    os.replace(tmp, os.path.join(root, READY_FILE))
+
+def readiness(source: str = "local") -> dict:
+    """The readiness marker if the warm-up completed for the current data version, else None."""
+    root = cache._store_root(source)
+    try:
+        with open(os.path.join(root, READY_FILE), encoding="utf-8") as f:
+            marker = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return marker if marker.get("version") == shared_store.current_version(root) else None
+
+def is_ready(source: str = "local") -> bool:
+    """True when the warm-up completed for the data version currently published."""
+    return readiness(source) is not None
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Precompute and persist every page's results.")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPUs - 1)")
+    parser.add_argument("--sweep-cube", action="store_true", help="also build the DEA alpha/beta sweep cube")
+    parser.add_argument("--region", default=regions.DEFAULT_REGION, help="region to warm up (default: %(default)s)")
+    parser.add_argument("--check", action="store_true", help="only check the readiness marker")
+    args = parser.parse_args()
+
+    if args.check:
+        marker = readiness()
+        if marker is None:
+            print("not ready")
+            return 1
+        # Pages that cannot be warmed are listed with coverage 0
+        print("ready; coverage: " + ", ".join(f"{page} {share:.2f}" for page, share in marker["coverage"].items()))
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    report = warm_up(args.workers, args.sweep_cube, region=args.region)
+    with pd.option_context("display.width", 200, "display.float_format", "{:.2f}".format):
+        print(report.to_string(index=False))
+    return 1 if report["Failed"].sum() else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import shutil
+
+import numpy as np
+
+from src.data import shared_store, snapshots, world_bank
+from src.data.panel import LPIPanel
+from src.utils import data_watcher
+from src.utils.result_cache import ResultCache
+
+
+def _panel(aggregate_2022: float) -> LPIPanel:
+    values = np.array([[[3.0], [aggregate_2022]], [[3.5], [3.6]]])
+    return LPIPanel(values, np.array(["Austria", "Belgium"], dtype=object), [2018, 2022], ["LPI Aggregate"])
+
+
+def test_watcher_rebases_from_snapshot_after_prune(tmp_path, monkeypatch):
+    monkeypatch.setenv("LPI_SNAPSHOTS", str(tmp_path / "snapshots"))
+    root = str(tmp_path / "store")
+    results = ResultCache(directory=str(tmp_path / "store" / ".results"))
+
+    old = _panel(3.1)
+    snapshots.record(old, "local")
+    v1 = shared_store.publish(old, root)
+    watcher = data_watcher.DataWatcher(root, results, path=str(tmp_path / "missing.csv"))
+    results.put(("map", v1, (2018,)), "2018", ("year:2018",), persist=True)
+    results.put(("map", v1, (2022,)), "2022", ("year:2022",), persist=True)
+
+    new = _panel(3.3)
+    snapshots.record(new, "local")
+    v2 = shared_store.publish(new, root)
+    # The watcher has not rebased yet: its version must survive pruning
+    assert shared_store.prune(root, keep=1) == []
+
+    # Even if the store lost it, the snapshot gives the diff
+    shutil.rmtree(f"{root}/{v1}")
+    change = watcher.check()
+    assert change["changed_years"] == [2022]
+    assert results.get(("map", v2, (2018,))) == "2018"
+    assert results.get(("map", v2, (2022,))) is None
+
+
+def test_watcher_publishes_file_replaced_while_down(tmp_path, monkeypatch):
+    monkeypatch.setenv("LPI_SNAPSHOTS", str(tmp_path / "snapshots"))
+    path = tmp_path / "lpi.csv"
+    monkeypatch.setattr(world_bank, "LOCAL_PATH", str(path))
+    root = str(tmp_path / "store")
+    path.write_text("Country,Year,LPI Aggregate\nAustria,2018,3.0\nBelgium,2018,3.5\n")
+
+    data_watcher.DataWatcher(root, ResultCache(), path=str(path))
+    stale = shared_store.current_version(root)
+    assert stale is not None
+
+    path.write_text("Country,Year,LPI Aggregate\nAustria,2018,3.2\nBelgium,2018,3.5\n")
+    watcher = data_watcher.DataWatcher(root, ResultCache(), path=str(path))
+    assert shared_store.current_version(root) not in (None, stale)
+    assert watcher.version == shared_store.current_version(root)
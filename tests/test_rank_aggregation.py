@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from src.models import rank_aggregation
+
+
+def test_copeland_ignores_items_with_missing_ranks():
+    # C has no second rank: only the A-B duel, a tie, may count
+    ranks = np.array([[1.0, 3.0, 2.0], [2.0, 1.0, np.nan]])
+
+    consenso = rank_aggregation.copeland(ranks)
+
+    np.testing.assert_array_equal(consenso, [1.0, 1.0, np.nan])
+    np.testing.assert_array_equal(consenso[:2], rank_aggregation.copeland(ranks[:, :2]))
+
+
+def test_consensus_leaves_countries_with_missing_ranks_without_position():
+    df = pd.DataFrame({
+        "Country": ["A", "B", "C"],
+        "WB Rank": [1, 3, 2],
+        "DEA Rank": [2, 1, None]
+    })
+
+    resultado = rank_aggregation.consensus_rankings(df, ["WB Rank", "DEA Rank"])
+
+    for coluna in ["Borda Rank", "Copeland Rank", "Kemeny Rank"]:
+        assert resultado[coluna].isna().tolist() == [False, False, True]
+    assert resultado["Copeland Rank"].tolist()[:2] == [1, 1]
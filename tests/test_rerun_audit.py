@@ -0,0 +1,76 @@
+from typing import Callable, NamedTuple
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from src.utils import instrumentation
+from src.utils.load_test import _pick_other, _select, _widget
+
+# Each scenario opens a page with AppTest, performs one widget interaction and checks
+# the computations recorded by src.utils.instrumentation (cache misses of the page's
+# cached functions). AppTest reruns the whole script on every interaction, so this
+# checks the data dependencies of each block; in the browser the fragments additionally
+# limit the rerun to the block that owns the widget.
+
+
+class Scenario(NamedTuple):
+    page: str
+    interaction: str
+    action: Callable[[AppTest], None]
+    expected: frozenset
+
+
+SCENARIOS = [
+    Scenario("analises_estatisticas", "change X indicator",
+             _select("selectbox", "Indicator for X-axis", "Customs"),
+             frozenset({"figure:plot_scatter_regression_plotly", "pair_inference"})),
+    Scenario("analises_estatisticas", "change multiple-testing correction",
+             _select("selectbox", "Multiple-testing correction", "Bonferroni"),
+             frozenset({"correlation_significance"})),
+    Scenario("analises_estatisticas", "switch to Spearman",
+             _select("radio", "Coefficient", "Spearman"),
+             frozenset()),
+    Scenario("comparacao_metodos", "change TOPSIS weighting scheme",
+             _select("selectbox", "TOPSIS weighting scheme", "CRITIC"),
+             frozenset({"topsis", "consensus", "rank_agreement"})),
+    Scenario("comparacao_metodos", "change year",
+             _pick_other("selectbox", "Select year for analysis"),
+             frozenset({"dea", "topsis", "consensus", "rank_agreement"})),
+    Scenario("mapa_interativo", "change map indicator",
+             _select("selectbox", "Select indicator for map", "Customs"),
+             frozenset({"map"})),
+    Scenario("mapa_interativo", "compare two years",
+             lambda at: _widget(at, "checkbox", "Compare two years?").check(),
+             frozenset({"map"})),
+]
+
+
+@pytest.fixture
+def cold_app(tmp_path, monkeypatch):
+    # Speculative prefetching would make the recorded computations depend on timing,
+    # and so would results persisted by the warm-up, hence a private shared store
+    monkeypatch.setenv("LPI_PREFETCH_BUDGET", "0")
+    monkeypatch.setenv("LPI_SHARED_STORE", str(tmp_path))
+    st.cache_resource.clear()
+    instrumentation.reset()
+    yield
+    st.cache_resource.clear()
+    instrumentation.reset()
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: f"{s.page}: {s.interaction}")
+def test_interaction_recomputes_only_its_dependencies(scenario, cold_app):
+    at = AppTest.from_string(
+        f"from src.pages import {scenario.page}\n{scenario.page}.render()",
+        default_timeout=300
+    )
+    at.run()
+    assert not at.exception
+
+    instrumentation.reset()
+    scenario.action(at)
+    at.run()
+
+    assert not at.exception
+    assert set(instrumentation.counts()) == scenario.expected
@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+from src.utils.result_cache import ResultCache
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_persisted_entries_need_a_private_directory(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    os.chmod(shared, 0o777)
+    results = ResultCache(directory=str(shared / ".results"))
+    results.put(("map", "v1"), "figure", ("year:2018",), persist=True)
+    assert ResultCache(directory=str(shared / ".results")).get(("map", "v1")) is None
+
+    private = tmp_path / "private" / ".results"
+    ResultCache(directory=str(private)).put(("map", "v1"), "figure", ("year:2018",), persist=True)
+    assert os.stat(private).st_mode & 0o777 == 0o700
+    assert ResultCache(directory=str(private)).get(("map", "v1")) == "figure"
@@ -0,0 +1,39 @@
+import numpy as np
+
+from src.data import shared_store
+from src.data.panel import LPIPanel
+from src.utils import cache
+from src.utils.result_cache import ResultCache
+
+
+def _panel(value: float) -> LPIPanel:
+    values = np.full((2, 1, 1), value)
+    return LPIPanel(values, np.array(["Austria", "Belgium"], dtype=object), [2018], ["LPI Aggregate"])
+
+
+def test_prune_keeps_persisted_results(tmp_path, monkeypatch):
+    monkeypatch.setenv("LPI_SHARED_STORE", str(tmp_path))
+    root = cache._store_root("local")
+
+    v1 = shared_store.publish(_panel(1.0), root)
+    results = ResultCache(directory=cache.results_dir())
+    results.put(("map", v1, (2018,)), "figure", ("year:2018",), persist=True)
+    v2 = shared_store.publish(_panel(2.0), root)
+
+    assert shared_store.prune(root) == []
+    assert shared_store.attach(v1, root).values[0, 0, 0] == 1.0
+
+    v3 = shared_store.publish(_panel(3.0), root)
+    assert shared_store.prune(root) == [v1]
+    assert sorted(shared_store.prune(root, keep=1)) == [v2]
+    assert shared_store.current_version(root) == v3
+    assert ResultCache(directory=cache.results_dir()).get(("map", v1, (2018,))) == "figure"
+
+
+def test_prune_ignores_directories_without_metadata(tmp_path):
+    root = str(tmp_path)
+    shared_store.publish(_panel(1.0), root)
+    (tmp_path / "other").mkdir()
+
+    assert shared_store.prune(root, keep=1) == []
+    assert (tmp_path / "other").is_dir()
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis import stat_analysis
+
+
+INDICATORS = ["LPI Aggregate", "Customs"]
+
+
+def _frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "Country": np.repeat(["Austria", "Belgium", "Croatia"], 4),
+        "Year": np.tile([2012, 2014, 2016, 2018], 3),
+        "LPI Aggregate": rng.uniform(2, 4, 12),
+        "Customs": rng.uniform(2, 4, 12)
+    })
+
+
+def test_frames_give_the_exact_pandas_statistics():
+    df = _frame()
+    stats = stat_analysis.grouped_descriptive_stats(df, INDICATORS)
+
+    pd.testing.assert_frame_equal(stats.describe(), df[INDICATORS].describe())
+    pd.testing.assert_frame_equal(stats.describe("Year"), df.groupby("Year")[INDICATORS].describe())
+    pd.testing.assert_frame_equal(stats.means("Country"), df.groupby("Country")[INDICATORS].mean())
+
+
+def test_chunks_without_group_labels_are_skipped():
+    df = _frame()
+    unlabelled = df.assign(Year=np.nan)
+    stats = stat_analysis.grouped_descriptive_stats([df, unlabelled], INDICATORS)
+
+    by_year = stats.describe("Year")
+    assert by_year[("Customs", "count")].tolist() == [3.0] * 4
+    assert stats.describe().loc["count", "Customs"] == 24